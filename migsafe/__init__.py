@@ -1,8 +1,31 @@
 """Migsafe - safe migration analysis via AST."""
 
-from .analyzer import analyze_migration
-from .models import Issue, IssueSeverity, IssueType, MigrationOp
+from typing import TYPE_CHECKING, Any
 
 __version__ = "0.4.0"
 
 __all__ = ["analyze_migration", "MigrationOp", "Issue", "IssueSeverity", "IssueType", "__version__"]
+
+if TYPE_CHECKING:
+    from .analyzer import analyze_migration
+    from .models import Issue, IssueSeverity, IssueType, MigrationOp
+
+# Public names are imported on first access, so `migsafe --version` doesn't load pydantic models
+_LAZY_EXPORTS = {
+    "analyze_migration": ".analyzer",
+    "MigrationOp": ".models",
+    "Issue": ".models",
+    "IssueSeverity": ".models",
+    "IssueType": ".models",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,21 @@
+"""Entry point for `python -m migsafe`."""
+
+import sys
+
+from . import __version__
+
+
+def main():
+    """Runs the CLI, answering a bare --version without importing it."""
+    if sys.argv[1:] == ["--version"]:
+        # Same output as click.version_option(), without loading Click and the command tree
+        print(f"migsafe, version {__version__}")
+        return
+
+    from .cli import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
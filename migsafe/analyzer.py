@@ -35,8 +35,8 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
         except SyntaxError:
             return []
 
-        # Find upgrade() function
-        for node in ast.walk(tree):
+        # Find upgrade() function, it is always a top-level function of Alembic migration
+        for node in tree.body:
             if isinstance(node, ast.FunctionDef) and node.name == "upgrade":
                 self.visit_upgrade(node)
                 break
@@ -168,7 +168,16 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
             # Look for nullable in keyword arguments
             nullable = extract_keyword_arg(column_node, "nullable", self.context)
 
-        self.operations.append(MigrationOp(type="add_column", table=table, column=column_name, nullable=nullable))
+        self.operations.append(
+            MigrationOp(
+                type="add_column",
+                table=table,
+                column=column_name,
+                nullable=nullable,
+                lineno=call.lineno,
+                col_offset=call.col_offset,
+            )
+        )
 
     def _extract_drop_column(self, call: ast.Call, table: Optional[str] = None):
         """Extract drop_column operation."""
@@ -189,7 +198,9 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
                 return
             column = extract_positional_arg(call, 0, self.context)
 
-        self.operations.append(MigrationOp(type="drop_column", table=table, column=column))
+        self.operations.append(
+            MigrationOp(type="drop_column", table=table, column=column, lineno=call.lineno, col_offset=call.col_offset)
+        )
 
     def _extract_create_index(self, call: ast.Call):
         """Extract create_index operation."""
@@ -199,7 +210,16 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
         # Extract concurrently from postgresql_concurrently
         concurrently = extract_keyword_arg(call, "postgresql_concurrently", self.context)
 
-        self.operations.append(MigrationOp(type="create_index", index=index_name, table=table, concurrently=concurrently))
+        self.operations.append(
+            MigrationOp(
+                type="create_index",
+                index=index_name,
+                table=table,
+                concurrently=concurrently,
+                lineno=call.lineno,
+                col_offset=call.col_offset,
+            )
+        )
 
     def _extract_drop_index(self, call: ast.Call):
         """Extract drop_index operation."""
@@ -209,7 +229,16 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
         # Extract concurrently from postgresql_concurrently
         concurrently = extract_keyword_arg(call, "postgresql_concurrently", self.context)
 
-        self.operations.append(MigrationOp(type="drop_index", index=index_name, table=table, concurrently=concurrently))
+        self.operations.append(
+            MigrationOp(
+                type="drop_index",
+                index=index_name,
+                table=table,
+                concurrently=concurrently,
+                lineno=call.lineno,
+                col_offset=call.col_offset,
+            )
+        )
 
     def _extract_alter_column(self, call: ast.Call, table: Optional[str] = None):
         """Extract alter_column operation.
@@ -257,7 +286,15 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
         nullable = extract_keyword_arg(call, "nullable", self.context)
 
         self.operations.append(
-            MigrationOp(type="alter_column", table=table, column=column, nullable=nullable, column_type=column_type)
+            MigrationOp(
+                type="alter_column",
+                table=table,
+                column=column,
+                nullable=nullable,
+                column_type=column_type,
+                lineno=call.lineno,
+                col_offset=call.col_offset,
+            )
         )
 
     def _extract_execute(self, call: ast.Call):
@@ -267,7 +304,7 @@ class AlembicASTAnalyzer(ast.NodeVisitor):
         if sql is None:
             sql = "<dynamic>"
 
-        self.operations.append(MigrationOp(type="execute", raw_sql=sql))
+        self.operations.append(MigrationOp(type="execute", raw_sql=sql, lineno=call.lineno, col_offset=call.col_offset))
 
 
 def analyze_migration(source: str) -> list[MigrationOp]:
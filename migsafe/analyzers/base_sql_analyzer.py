@@ -5,6 +5,7 @@ providing common functionality for validation, normalization and analysis.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from re import Pattern
 
 from ..models import Issue
@@ -36,11 +37,12 @@ class BaseSqlAnalyzer(ABC):
         self._patterns = self._compile_patterns()
 
     @abstractmethod
-    def _compile_patterns(self) -> dict[str, Pattern]:
+    def _compile_patterns(self) -> Mapping[str, Pattern]:
         """Compile regular expressions for pattern matching.
 
         Returns:
-            Dictionary with compiled regular expressions
+            Mapping with compiled regular expressions (may be shared between
+            instances, so it must not be modified)
         """
         pass
 
@@ -1,12 +1,72 @@
 """JOIN operations analyzer for SQL queries."""
 
-import re
+from collections.abc import Mapping
 from re import Pattern
 
 from ..models import Issue, IssueSeverity, IssueType
 from .base_sql_analyzer import BaseSqlAnalyzer
 from .sql_patterns import get_sql_join_patterns
 
+# Recommendations are shared by all issues of the same type
+_UPDATE_WITH_JOIN_RECOMMENDATION = (
+    "UPDATE with JOIN may lock multiple tables and be slow.\n"
+    "Recommendations:\n"
+    "1) Use batching via subqueries with LIMIT\n"
+    "2) Consider using temporary tables\n"
+    "3) Check indexes on tables in JOIN\n"
+    "4) Execute operation during low load period"
+)
+
+_UPDATE_FROM_RECOMMENDATION = _UPDATE_WITH_JOIN_RECOMMENDATION + (
+    "\nExample of safe code:\n"
+    "  batch_size = 1000\n"
+    "  offset = 0\n"
+    "  while True:\n"
+    "      result = op.execute(f'''\n"
+    "          UPDATE users u\n"
+    "          SET status = 'active'\n"
+    "          FROM (\n"
+    "              SELECT u.id\n"
+    "              FROM users u\n"
+    "              JOIN orders o ON u.id = o.user_id\n"
+    "              WHERE o.created_at > '2024-01-01'\n"
+    "              LIMIT {batch_size} OFFSET {offset}\n"
+    "          ) batch\n"
+    "          WHERE u.id = batch.id\n"
+    "      ''')\n"
+    "      if result.rowcount == 0:\n"
+    "          break\n"
+    "      offset += batch_size"
+)
+
+_DELETE_WITH_JOIN_RECOMMENDATION = (
+    "DELETE with JOIN may lock multiple tables and be slow.\n"
+    "Recommendations:\n"
+    "1) Use batching via subqueries with LIMIT\n"
+    "2) Consider using temporary tables\n"
+    "3) Check indexes on tables in JOIN\n"
+    "4) Execute operation during low load period"
+)
+
+_DELETE_USING_RECOMMENDATION = _DELETE_WITH_JOIN_RECOMMENDATION + (
+    "\nExample of safe code:\n"
+    "  batch_size = 1000\n"
+    "  while True:\n"
+    "      deleted = op.execute(f'''\n"
+    "          DELETE FROM users u\n"
+    "          USING (\n"
+    "              SELECT u.id\n"
+    "              FROM users u\n"
+    "              JOIN orders o ON u.id = o.user_id\n"
+    "              WHERE o.status = 'cancelled'\n"
+    "              LIMIT {batch_size}\n"
+    "          ) batch\n"
+    "          WHERE u.id = batch.id\n"
+    "      ''').rowcount\n"
+    "      if deleted == 0:\n"
+    "          break"
+)
+
 
 class SqlJoinAnalyzer(BaseSqlAnalyzer):
     """JOIN operations analyzer for SQL.
@@ -24,7 +84,7 @@ class SqlJoinAnalyzer(BaseSqlAnalyzer):
         <IssueType.SQL_UPDATE_WITH_JOIN: 'sql_update_with_join'>
     """
 
-    def _compile_patterns(self) -> dict[str, Pattern]:
+    def _compile_patterns(self) -> Mapping[str, Pattern]:
         """Compile regular expressions for pattern matching."""
         # Use common patterns from sql_patterns
         return get_sql_join_patterns()
@@ -63,33 +123,7 @@ class SqlJoinAnalyzer(BaseSqlAnalyzer):
                     type=IssueType.SQL_UPDATE_WITH_JOIN,
                     message=f"UPDATE {table1} with JOIN via FROM {table2} may lock both tables",
                     operation_index=operation_index,
-                    recommendation=(
-                        "UPDATE with JOIN may lock multiple tables and be slow.\n"
-                        "Recommendations:\n"
-                        "1) Use batching via subqueries with LIMIT\n"
-                        "2) Consider using temporary tables\n"
-                        "3) Check indexes on tables in JOIN\n"
-                        "4) Execute operation during low load period\n"
-                        "Example of safe code:\n"
-                        "  batch_size = 1000\n"
-                        "  offset = 0\n"
-                        "  while True:\n"
-                        "      result = op.execute(f'''\n"
-                        "          UPDATE users u\n"
-                        "          SET status = 'active'\n"
-                        "          FROM (\n"
-                        "              SELECT u.id\n"
-                        "              FROM users u\n"
-                        "              JOIN orders o ON u.id = o.user_id\n"
-                        "              WHERE o.created_at > '2024-01-01'\n"
-                        "              LIMIT {batch_size} OFFSET {offset}\n"
-                        "          ) batch\n"
-                        "          WHERE u.id = batch.id\n"
-                        "      ''')\n"
-                        "      if result.rowcount == 0:\n"
-                        "          break\n"
-                        "      offset += batch_size"
-                    ),
+                    recommendation=_UPDATE_FROM_RECOMMENDATION,
                     table=table1,
                 )
             )
@@ -104,22 +138,15 @@ class SqlJoinAnalyzer(BaseSqlAnalyzer):
 
             # Check that this is really UPDATE with JOIN (not just UPDATE with SET)
             # Search for JOIN presence in query
-            update_part = match.group(0)
-            if re.search(r"\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\b", update_part, re.IGNORECASE) and table2:
+            # (search within match bounds instead of copying matched text)
+            if table2 and self._patterns["join_keyword"].search(sql, match.start(), match.end()):
                 issues.append(
                     Issue(
                         severity=IssueSeverity.WARNING,
                         type=IssueType.SQL_UPDATE_WITH_JOIN,
                         message=f"UPDATE {table1} with JOIN {table2} may lock both tables",
                         operation_index=operation_index,
-                        recommendation=(
-                            "UPDATE with JOIN may lock multiple tables and be slow.\n"
-                            "Recommendations:\n"
-                            "1) Use batching via subqueries with LIMIT\n"
-                            "2) Consider using temporary tables\n"
-                            "3) Check indexes on tables in JOIN\n"
-                            "4) Execute operation during low load period"
-                        ),
+                        recommendation=_UPDATE_WITH_JOIN_RECOMMENDATION,
                         table=table1,
                     )
                 )
@@ -142,30 +169,7 @@ class SqlJoinAnalyzer(BaseSqlAnalyzer):
                     type=IssueType.SQL_DELETE_WITH_JOIN,
                     message=f"DELETE FROM {table1} with JOIN via USING {table2} may lock both tables",
                     operation_index=operation_index,
-                    recommendation=(
-                        "DELETE with JOIN may lock multiple tables and be slow.\n"
-                        "Recommendations:\n"
-                        "1) Use batching via subqueries with LIMIT\n"
-                        "2) Consider using temporary tables\n"
-                        "3) Check indexes on tables in JOIN\n"
-                        "4) Execute operation during low load period\n"
-                        "Example of safe code:\n"
-                        "  batch_size = 1000\n"
-                        "  while True:\n"
-                        "      deleted = op.execute(f'''\n"
-                        "          DELETE FROM users u\n"
-                        "          USING (\n"
-                        "              SELECT u.id\n"
-                        "              FROM users u\n"
-                        "              JOIN orders o ON u.id = o.user_id\n"
-                        "              WHERE o.status = 'cancelled'\n"
-                        "              LIMIT {batch_size}\n"
-                        "          ) batch\n"
-                        "          WHERE u.id = batch.id\n"
-                        "      ''').rowcount\n"
-                        "      if deleted == 0:\n"
-                        "          break"
-                    ),
+                    recommendation=_DELETE_USING_RECOMMENDATION,
                     table=table1,
                 )
             )
@@ -182,14 +186,7 @@ class SqlJoinAnalyzer(BaseSqlAnalyzer):
                     type=IssueType.SQL_DELETE_WITH_JOIN,
                     message=f"DELETE FROM {table1} with JOIN {table2} may lock both tables",
                     operation_index=operation_index,
-                    recommendation=(
-                        "DELETE with JOIN may lock multiple tables and be slow.\n"
-                        "Recommendations:\n"
-                        "1) Use batching via subqueries with LIMIT\n"
-                        "2) Consider using temporary tables\n"
-                        "3) Check indexes on tables in JOIN\n"
-                        "4) Execute operation during low load period"
-                    ),
+                    recommendation=_DELETE_WITH_JOIN_RECOMMENDATION,
                     table=table1,
                 )
             )
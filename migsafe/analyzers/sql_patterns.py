@@ -5,7 +5,31 @@ by various SQL analyzers to avoid code duplication.
 """
 
 import re
+import sys
+from collections.abc import Mapping
 from re import Pattern
+from types import MappingProxyType
+
+# Atomic groups (?>...) are supported by re since Python 3.11. On older versions
+# a plain group is used: it matches the same text, but may backtrack more on failure.
+_ATOMIC_GROUP_START = "(?>" if sys.version_info >= (3, 11) else "(?:"
+
+
+def _atomic(pattern: str) -> str:
+    """Wrap pattern into atomic group.
+
+    Used for "skip to the first keyword" parts that are followed by another
+    lazy part: once the first keyword is found, retrying later occurrences
+    cannot produce a different match, so backtracking into the group is useless.
+
+    Args:
+        pattern: Regular expression pattern
+
+    Returns:
+        Pattern wrapped into atomic group (non-capturing group on Python < 3.11)
+    """
+    return f"{_ATOMIC_GROUP_START}{pattern})"
+
 
 # Basic patterns for SQL operations
 SQL_OPERATIONS = {
@@ -27,37 +51,52 @@ SQL_OPERATIONS = {
 }
 
 # Patterns for JOIN operations
+# Analyzers receive normalized SQL (no newlines), so DOTALL is not needed here;
+# [^;]*? keeps each match inside a single statement and avoids backtracking across ';'
 SQL_JOIN_PATTERNS = {
     # UPDATE with FROM (PostgreSQL syntax)
-    "update_from": re.compile(r"\bUPDATE\s+(\w+)\s+\w+\s+SET\s+.*?\bFROM\s+(\w+)", re.IGNORECASE | re.DOTALL),
+    "update_from": re.compile(r"\bUPDATE\s+(\w+)\s+\w+\s+SET\s+[^;]*?\bFROM\s+(\w+)", re.IGNORECASE),
     # UPDATE with JOIN (standard SQL syntax)
     "update_join": re.compile(
-        r"\bUPDATE\s+(\w+)(?:\s+\w+)?\s+(?:(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\s+(\w+)(?:\s+\w+)?\s+.*?\bSET\s+|SET\s+.*?\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\s+(\w+)(?:\s+\w+)?)",
-        re.IGNORECASE | re.DOTALL,
+        r"\bUPDATE\s+(\w+)(?:\s+\w+)?\s+(?:(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\s+(\w+)(?:\s+\w+)?\s+[^;]*?\bSET\s+|SET\s+[^;]*?\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\s+(\w+)(?:\s+\w+)?)",
+        re.IGNORECASE,
     ),
     # DELETE with USING (PostgreSQL syntax)
-    "delete_using": re.compile(r"\bDELETE\s+FROM\s+(\w+)\s+.*?\bUSING\s+(\w+)", re.IGNORECASE | re.DOTALL),
+    "delete_using": re.compile(r"\bDELETE\s+FROM\s+(\w+)\s+[^;]*?\bUSING\s+(\w+)", re.IGNORECASE),
     # DELETE with JOIN (standard SQL syntax)
     "delete_join": re.compile(
-        r"\bDELETE\s+FROM\s+(\w+)\s+.*?\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\s+(\w+)", re.IGNORECASE | re.DOTALL
+        r"\bDELETE\s+FROM\s+(\w+)\s+[^;]*?\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\s+(\w+)", re.IGNORECASE
     ),
+    # JOIN keyword (to confirm that matched UPDATE really contains JOIN)
+    "join_keyword": re.compile(r"\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\b", re.IGNORECASE),
     # Any JOIN in UPDATE/DELETE (for more accurate detection)
     "join_in_update_delete": re.compile(
-        r"\b(?:UPDATE|DELETE)\s+.*?\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\b", re.IGNORECASE | re.DOTALL
+        r"\b(?:UPDATE|DELETE)\s+[^;]*?\b(?:INNER|LEFT|RIGHT|FULL|CROSS)?\s+JOIN\b", re.IGNORECASE
     ),
 }
 
 # Patterns for subqueries
 SQL_SUBQUERY_PATTERNS = {
     # Subquery in UPDATE SET
-    "subquery_in_update_set": re.compile(r"\bUPDATE\s+(\w+)\s+SET\s+.*?=\s*\(\s*SELECT\s+", re.IGNORECASE | re.DOTALL),
+    "subquery_in_update_set": re.compile(r"\bUPDATE\s+(\w+)\s+SET\s+[^;]*?=\s*\(\s*SELECT\s+", re.IGNORECASE),
     # Subquery in UPDATE WHERE
     "subquery_in_update_where": re.compile(
-        r"\bUPDATE\s+(\w+)\s+SET\s+.*?\bWHERE\s+.*?(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+", re.IGNORECASE | re.DOTALL
+        r"\bUPDATE\s+(\w+)\s+SET\s+" + _atomic(r"[^;]*?\bWHERE\s+") + r"[^;]*?(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+",
+        re.IGNORECASE,
     ),
     # Subquery in DELETE WHERE
     "subquery_in_delete_where": re.compile(
-        r"\bDELETE\s+FROM\s+(\w+)\s+.*?\bWHERE\s+.*?(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+", re.IGNORECASE | re.DOTALL
+        r"\bDELETE\s+FROM\s+(\w+)\s+" + _atomic(r"[^;]*?\bWHERE\s+") + r"[^;]*?(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+",
+        re.IGNORECASE,
+    ),
+    # UPDATE with any subquery after SET
+    "update_set_subquery": re.compile(r"\bUPDATE\s+" + _atomic(r"[^;]*?\bSET\s+") + r"[^;]*?\(\s*SELECT\b", re.IGNORECASE),
+    # UPDATE [alias] with subquery in SET (candidate for correlated subquery)
+    "correlated_update_set": re.compile(r"\bUPDATE\s+(\w+)(?:\s+(\w+))?\s+SET\s+[^;]*?=\s*\(\s*SELECT\s+", re.IGNORECASE),
+    # Any UPDATE/DELETE with subquery in WHERE (IN/EXISTS)
+    "subquery_in_where": re.compile(
+        r"\b(?:UPDATE|DELETE)\s+" + _atomic(r"[^;]*?\bWHERE\s+") + r"[^;]*?(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+.*?\)",
+        re.IGNORECASE,
     ),
     # Correlated subquery (subquery references outer table)
     "correlated_subquery": re.compile(r"\(\s*SELECT\s+.*?\bWHERE\s+.*?\b(\w+)\.(\w+)\s*=.*?\1\.(\w+)", re.IGNORECASE | re.DOTALL),
@@ -67,44 +106,62 @@ SQL_SUBQUERY_PATTERNS = {
 SQL_HELPER_PATTERNS = {
     # WHERE condition
     "where": re.compile(r"\bWHERE\s+", re.IGNORECASE),
+    # Subquery start: opening bracket followed by SELECT
+    "subquery_start": re.compile(r"\(\s*SELECT", re.IGNORECASE),
+    # Opening or closing bracket
+    "bracket": re.compile(r"[()]"),
+    # WHERE condition inside subquery (up to the first closing bracket)
+    "subquery_where": re.compile(r"\bWHERE\s+(.*?)\)", re.IGNORECASE),
     # LIMIT
     "limit": re.compile(r"\bLIMIT\s+\d+", re.IGNORECASE),
     # IN/EXISTS/NOT EXISTS
-    "in_exists": re.compile(r"(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+", re.IGNORECASE | re.DOTALL),
+    "in_exists": re.compile(r"(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+", re.IGNORECASE),
+    # Subquery content after IN/EXISTS/NOT EXISTS
+    "in_exists_subquery": re.compile(r"(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+(.*?)\)", re.IGNORECASE),
+    # Target table of UPDATE/DELETE
+    "update_delete_table": re.compile(r"\b(?:UPDATE|DELETE\s+FROM)\s+(\w+)", re.IGNORECASE),
 }
 
 
-def get_sql_operation_patterns() -> dict[str, Pattern]:
-    """Return dictionary with basic SQL operation patterns.
+# Read-only views returned by getters: patterns are never modified by analyzers,
+# so there is no need to copy dictionaries for every analyzer instance
+_SQL_OPERATIONS_VIEW = MappingProxyType(SQL_OPERATIONS)
+_SQL_JOIN_PATTERNS_VIEW = MappingProxyType(SQL_JOIN_PATTERNS)
+_SQL_SUBQUERY_PATTERNS_VIEW = MappingProxyType(SQL_SUBQUERY_PATTERNS)
+_SQL_HELPER_PATTERNS_VIEW = MappingProxyType(SQL_HELPER_PATTERNS)
+
+
+def get_sql_operation_patterns() -> Mapping[str, Pattern]:
+    """Return read-only mapping with basic SQL operation patterns.
 
     Returns:
-        Dictionary with compiled regular expressions for UPDATE, DELETE, INSERT ... SELECT
+        Mapping with compiled regular expressions for UPDATE, DELETE, INSERT ... SELECT
     """
-    return SQL_OPERATIONS.copy()
+    return _SQL_OPERATIONS_VIEW
 
 
-def get_sql_join_patterns() -> dict[str, Pattern]:
-    """Return dictionary with patterns for JOIN operations.
+def get_sql_join_patterns() -> Mapping[str, Pattern]:
+    """Return read-only mapping with patterns for JOIN operations.
 
     Returns:
-        Dictionary with compiled regular expressions for various types of JOIN
+        Mapping with compiled regular expressions for various types of JOIN
     """
-    return SQL_JOIN_PATTERNS.copy()
+    return _SQL_JOIN_PATTERNS_VIEW
 
 
-def get_sql_subquery_patterns() -> dict[str, Pattern]:
-    """Return dictionary with patterns for subqueries.
+def get_sql_subquery_patterns() -> Mapping[str, Pattern]:
+    """Return read-only mapping with patterns for subqueries.
 
     Returns:
-        Dictionary with compiled regular expressions for subqueries
+        Mapping with compiled regular expressions for subqueries
     """
-    return SQL_SUBQUERY_PATTERNS.copy()
+    return _SQL_SUBQUERY_PATTERNS_VIEW
 
 
-def get_sql_helper_patterns() -> dict[str, Pattern]:
-    """Return dictionary with helper patterns.
+def get_sql_helper_patterns() -> Mapping[str, Pattern]:
+    """Return read-only mapping with helper patterns.
 
     Returns:
-        Dictionary with compiled regular expressions for WHERE, LIMIT, IN/EXISTS
+        Mapping with compiled regular expressions for WHERE, LIMIT, IN/EXISTS
     """
-    return SQL_HELPER_PATTERNS.copy()
+    return _SQL_HELPER_PATTERNS_VIEW
@@ -1,11 +1,187 @@
 """Subquery analyzer for SQL queries."""
 
-import re
+from collections.abc import Mapping
 from re import Pattern
+from types import MappingProxyType
 
 from ..models import Issue, IssueSeverity, IssueType
 from .base_sql_analyzer import BaseSqlAnalyzer
 from .sql_patterns import get_sql_helper_patterns, get_sql_subquery_patterns
+from .sql_utils import SQLPARSE_AVAILABLE, parse_sql
+
+if SQLPARSE_AVAILABLE:
+    from sqlparse import sql as sqlparse_sql
+    from sqlparse import tokens as sqlparse_tokens
+
+# Recommendations are shared by all issues of the same type
+_CORRELATED_SUBQUERY_RECOMMENDATION = (
+    "Correlated subqueries may be very slow, "
+    "as they are executed for each row.\n"
+    "Recommendations:\n"
+    "1) Rewrite to JOIN if possible\n"
+    "2) Use window functions instead of correlated subqueries\n"
+    "3) Add indexes for optimization\n"
+    "Example of safe code:\n"
+    "  op.execute('''\n"
+    "      UPDATE users u\n"
+    "      SET last_order_date = o.max_date\n"
+    "      FROM (\n"
+    "          SELECT user_id, MAX(created_at) as max_date\n"
+    "          FROM orders\n"
+    "          GROUP BY user_id\n"
+    "      ) o\n"
+    "      WHERE u.id = o.user_id\n"
+    "  ''')"
+)
+
+_SUBQUERY_IN_UPDATE_RECOMMENDATION = (
+    "Subqueries in UPDATE without LIMIT may update many rows and lock the table.\n"
+    "Recommendations:\n"
+    "1) Use batching with LIMIT in subquery\n"
+    "2) Process data in batches (e.g., 1000 rows at a time)\n"
+    "Example of safe code:\n"
+    "  batch_size = 1000\n"
+    "  while True:\n"
+    "      deleted = op.execute(f'''\n"
+    "          DELETE FROM users\n"
+    "          WHERE id IN (\n"
+    "              SELECT user_id FROM orders \n"
+    "              WHERE status = 'cancelled'\n"
+    "              LIMIT {batch_size}\n"
+    "          )\n"
+    "      ''').rowcount\n"
+    "      if deleted == 0:\n"
+    "          break\n"
+    "  ''')"
+)
+
+_SUBQUERY_IN_DELETE_RECOMMENDATION = (
+    "Subqueries in DELETE without LIMIT may delete many rows and lock the table.\n"
+    "Recommendations:\n"
+    "1) Use batching with LIMIT in subquery\n"
+    "2) Process data in batches (e.g., 1000 rows at a time)\n"
+    "Example of safe code:\n"
+    "  batch_size = 1000\n"
+    "  while True:\n"
+    "      deleted = op.execute(f'''\n"
+    "          DELETE FROM users\n"
+    "          WHERE id IN (\n"
+    "              SELECT user_id FROM orders \n"
+    "              WHERE status = 'cancelled'\n"
+    "              LIMIT {batch_size}\n"
+    "          )\n"
+    "      ''').rowcount\n"
+    "      if deleted == 0:\n"
+    "          break"
+)
+
+_SUBQUERY_WITHOUT_LIMIT_RECOMMENDATION = (
+    "Subqueries without LIMIT may return large number of rows and be slow.\n"
+    "Recommendations:\n"
+    "1) Add LIMIT to subquery if possible\n"
+    "2) Use batching to process data in batches\n"
+    "3) Check performance on test data"
+)
+
+
+def _is_word_char(char: str) -> bool:
+    """Check that character may be part of SQL identifier (same as regex \\w)."""
+    return char.isalnum() or char == "_"
+
+
+def _has_qualified_reference(sql: str, name: str) -> bool:
+    """Check if SQL contains qualified column reference ``name.column``.
+
+    Plain substring search is used instead of a regular expression built
+    from the name, so no pattern is compiled per call.
+
+    Args:
+        sql: SQL fragment (lowercase)
+        name: Table name or alias (lowercase)
+
+    Returns:
+        True if reference is found
+    """
+    prefix = f"{name}."
+    start = sql.find(prefix)
+    while start != -1:
+        end = start + len(prefix)
+        if (start == 0 or not _is_word_char(sql[start - 1])) and end < len(sql) and _is_word_char(sql[end]):
+            return True
+        start = sql.find(prefix, start + 1)
+    return False
+
+
+def _is_select_subquery(token) -> bool:
+    """Check that sqlparse token is a bracketed SELECT subquery."""
+    if not isinstance(token, sqlparse_sql.Parenthesis):
+        return False
+    _, first = token.token_next(0)
+    return first is not None and first.ttype in sqlparse_tokens.DML and first.normalized == "SELECT"
+
+
+def _iter_select_subqueries(token):
+    """Yield all SELECT subqueries nested in sqlparse token (including token itself)."""
+    if _is_select_subquery(token):
+        yield token
+    if token.is_group:
+        for child in token.tokens:
+            yield from _iter_select_subqueries(child)
+
+
+def _get_qualifiers(token) -> set[str]:
+    """Return lowercase qualifiers of column references (``u`` for ``u.id``) in sqlparse token."""
+    qualifiers = set()
+    previous = None
+    for leaf in token.flatten():
+        is_dot = leaf.ttype in sqlparse_tokens.Punctuation and leaf.value == "."
+        if is_dot and previous is not None and previous.ttype in sqlparse_tokens.Name:
+            qualifiers.add(previous.value.strip('"').lower())
+        if not leaf.is_whitespace:
+            previous = leaf
+    return qualifiers
+
+
+def _find_correlated_updates(statements: tuple) -> list[str]:
+    """Find UPDATE statements with correlated subquery in SET using sqlparse token tree.
+
+    Args:
+        statements: Statements parsed by sqlparse
+
+    Returns:
+        List of updated table names (one per UPDATE with correlated subquery)
+    """
+    tables = []
+    for statement in statements:
+        if statement.get_type() != "UPDATE":
+            continue
+
+        table = None
+        outer_names: set[str] = set()
+        in_set_clause = False
+        is_correlated = False
+        for token in statement.tokens:
+            if isinstance(token, sqlparse_sql.Where):
+                break
+            if table is None:
+                if isinstance(token, sqlparse_sql.Identifier):
+                    table = token.get_real_name()
+                    outer_names = {name.lower() for name in (table, token.get_alias()) if name}
+                continue
+            if token.ttype in sqlparse_tokens.Keyword and token.normalized == "SET":
+                in_set_clause = True
+                continue
+            if in_set_clause:
+                for subquery in _iter_select_subqueries(token):
+                    for where in subquery.tokens:
+                        if isinstance(where, sqlparse_sql.Where) and _get_qualifiers(where) & outer_names:
+                            is_correlated = True
+            if is_correlated:
+                break
+
+        if table and is_correlated:
+            tables.append(table)
+    return tables
 
 
 class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
@@ -24,14 +200,13 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
         <IssueType.SQL_CORRELATED_SUBQUERY: 'sql_correlated_subquery'>
     """
 
-    def _compile_patterns(self) -> dict[str, Pattern]:
+    # Common patterns from sql_patterns with helper patterns for internal use,
+    # merged once for all instances
+    _PATTERNS = MappingProxyType({**get_sql_subquery_patterns(), **get_sql_helper_patterns()})
+
+    def _compile_patterns(self) -> Mapping[str, Pattern]:
         """Compile regular expressions for pattern matching."""
-        # Use common patterns from sql_patterns
-        patterns = get_sql_subquery_patterns()
-        # Add helper patterns for internal use
-        helper_patterns = get_sql_helper_patterns()
-        patterns.update(helper_patterns)
-        return patterns
+        return self._PATTERNS
 
     def _analyze_normalized(self, sql: str, operation_index: int) -> list[Issue]:
         """Analyze subqueries in normalized SQL query.
@@ -43,7 +218,12 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
         Returns:
             List of found issues (Issue)
         """
-        issues = []
+        issues: list[Issue] = []
+
+        # All checks look for "(SELECT ...", cheap substring probes let us skip
+        # regular expressions for queries without subqueries
+        if "(" not in sql or "select" not in sql.lower():
+            return issues
 
         # Check each pattern (use normalized SQL for all checks)
         issues.extend(self._check_correlated_subqueries(sql, operation_index))
@@ -56,11 +236,20 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
     def _check_correlated_subqueries(self, sql: str, operation_index: int) -> list[Issue]:
         """Check correlated subqueries.
 
-        Note: Uses simplified approach based on regular expressions.
-        For complex cases (nested subqueries, complex expressions) false positives
-        or misses are possible. For more accurate analysis, it is recommended
-        to use sqlparse library (optional dependency).
+        If sqlparse library (optional dependency) is installed, the query is
+        tokenized by sqlparse for this check and its token tree is walked.
+        Otherwise (or if sqlparse cannot parse the query) simplified
+        approach based on regular expressions is used: for complex cases
+        (nested subqueries, complex expressions) false positives or misses are possible.
         """
+        # Tokenizing is expensive, skip it when there is no UPDATE with subquery in SET
+        if not self._patterns["update_set_subquery"].search(sql):
+            return []
+
+        statements = parse_sql(sql)
+        if statements is not None:
+            return [self._correlated_subquery_issue(table, operation_index) for table in _find_correlated_updates(statements)]
+
         issues = []
 
         # Search for correlated subqueries
@@ -68,87 +257,57 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
         # Pattern: UPDATE table [alias] SET ... = (SELECT ... WHERE ... alias.column or table.column ...)
 
         # Search for UPDATE with subquery in SET
-        update_pattern = re.compile(r"\bUPDATE\s+(\w+)(?:\s+(\w+))?\s+SET\s+.*?=\s*\(\s*SELECT\s+", re.IGNORECASE | re.DOTALL)
-        matches = update_pattern.finditer(sql)
+        matches = self._patterns["correlated_update_set"].finditer(sql)
         for match in matches:
             table = match.group(1)
             alias = match.group(2)
 
-            # Search for closing bracket of subquery in normalized SQL
-            match_start = match.start()
-
-            # Search for closing bracket of subquery (account for spaces after normalization)
-            bracket_count = 0
             # Search for subquery start: ( SELECT or (SELECT
-            subquery_start = -1
-            for i in range(match_start, len(sql)):
-                if sql[i] == "(":
-                    # Check that SELECT follows
-                    remaining = sql[i + 1 :].strip()
-                    if remaining.upper().startswith("SELECT"):
-                        subquery_start = i
-                        break
-
-            if subquery_start != -1:
-                # Search for closing bracket (simplified approach)
+            # (single scan in regex engine instead of checking characters one by one)
+            start_match = self._patterns["subquery_start"].search(sql, match.start())
+
+            if start_match:
+                subquery_start = start_match.start()
+                # Search for closing bracket (simplified approach), jumping between brackets only
                 subquery_end = subquery_start
-                for i in range(subquery_start, len(sql)):
-                    if sql[i] == "(":
+                bracket_count = 0
+                for bracket in self._patterns["bracket"].finditer(sql, subquery_start):
+                    if bracket.group(0) == "(":
                         bracket_count += 1
-                    elif sql[i] == ")":
+                    else:
                         bracket_count -= 1
                         if bracket_count == 0:
-                            subquery_end = i + 1
+                            subquery_end = bracket.end()
                             break
 
                 if subquery_end > subquery_start:
-                    subquery_content = sql[subquery_start:subquery_end]
                     # Check if subquery references outer table or alias
                     # Search for WHERE in subquery
-                    where_match = re.search(r"\bWHERE\s+(.*?)\)", subquery_content, re.IGNORECASE | re.DOTALL)
+                    where_match = self._patterns["subquery_where"].search(sql, subquery_start, subquery_end)
                     if where_match:
-                        where_part = where_match.group(1)
+                        where_part = where_match.group(1).lower()
                         # Check if there's a reference to outer table or alias
-                        is_correlated = False
-                        if alias and re.search(rf"\b{alias}\.\w+", where_part, re.IGNORECASE):
-                            # Search for alias reference (e.g., u.id)
-                            is_correlated = True
-                        # Search for table name reference (e.g., users.id)
-                        if re.search(rf"\b{table}\.\w+", where_part, re.IGNORECASE):
-                            is_correlated = True
+                        # (e.g., u.id or users.id)
+                        is_correlated = _has_qualified_reference(where_part, table.lower())
+                        if alias and not is_correlated:
+                            is_correlated = _has_qualified_reference(where_part, alias.lower())
 
                         if is_correlated:
-                            issues.append(
-                                Issue(
-                                    severity=IssueSeverity.WARNING,
-                                    type=IssueType.SQL_CORRELATED_SUBQUERY,
-                                    message=f"Correlated subquery in UPDATE {table} may be very slow",
-                                    operation_index=operation_index,
-                                    recommendation=(
-                                        "Correlated subqueries may be very slow, "
-                                        "as they are executed for each row.\n"
-                                        "Recommendations:\n"
-                                        "1) Rewrite to JOIN if possible\n"
-                                        "2) Use window functions instead of correlated subqueries\n"
-                                        "3) Add indexes for optimization\n"
-                                        "Example of safe code:\n"
-                                        "  op.execute('''\n"
-                                        "      UPDATE users u\n"
-                                        "      SET last_order_date = o.max_date\n"
-                                        "      FROM (\n"
-                                        "          SELECT user_id, MAX(created_at) as max_date\n"
-                                        "          FROM orders\n"
-                                        "          GROUP BY user_id\n"
-                                        "      ) o\n"
-                                        "      WHERE u.id = o.user_id\n"
-                                        "  ''')"
-                                    ),
-                                    table=table,
-                                )
-                            )
+                            issues.append(self._correlated_subquery_issue(table, operation_index))
 
         return issues
 
+    def _correlated_subquery_issue(self, table: str, operation_index: int) -> Issue:
+        """Create issue for correlated subquery in UPDATE."""
+        return Issue(
+            severity=IssueSeverity.WARNING,
+            type=IssueType.SQL_CORRELATED_SUBQUERY,
+            message=f"Correlated subquery in UPDATE {table} may be very slow",
+            operation_index=operation_index,
+            recommendation=_CORRELATED_SUBQUERY_RECOMMENDATION,
+            table=table,
+        )
+
     def _check_subquery_in_update(self, sql: str, operation_index: int) -> list[Issue]:
         """Check subqueries in UPDATE."""
         issues = []
@@ -159,44 +318,20 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
             table = match.group(1)
 
             # Check if subquery has LIMIT
-            update_part = match.group(0)
             # Search for subquery in brackets after IN/EXISTS (use common pattern as basis)
-            subquery_match = re.search(
-                r"(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+(.*?)\)", update_part, re.IGNORECASE | re.DOTALL
-            )
-            if subquery_match:
-                subquery_content = subquery_match.group(1)
-                # Check if subquery has LIMIT (use common pattern)
-                if not self._patterns["limit"].search(subquery_content):
-                    issues.append(
-                        Issue(
-                            severity=IssueSeverity.WARNING,
-                            type=IssueType.SQL_SUBQUERY_IN_UPDATE,
-                            message=f"Subquery in UPDATE {table} without LIMIT may update many rows",
-                            operation_index=operation_index,
-                            recommendation=(
-                                "Subqueries in UPDATE without LIMIT may update many rows and lock the table.\n"
-                                "Recommendations:\n"
-                                "1) Use batching with LIMIT in subquery\n"
-                                "2) Process data in batches (e.g., 1000 rows at a time)\n"
-                                "Example of safe code:\n"
-                                "  batch_size = 1000\n"
-                                "  while True:\n"
-                                "      deleted = op.execute(f'''\n"
-                                "          DELETE FROM users\n"
-                                "          WHERE id IN (\n"
-                                "              SELECT user_id FROM orders \n"
-                                "              WHERE status = 'cancelled'\n"
-                                "              LIMIT {batch_size}\n"
-                                "          )\n"
-                                "      ''').rowcount\n"
-                                "      if deleted == 0:\n"
-                                "          break\n"
-                                "  ''')"
-                            ),
-                            table=table,
-                        )
+            # pos/endpos arguments are used instead of copying matched text
+            subquery_match = self._patterns["in_exists_subquery"].search(sql, match.start(), match.end())
+            if subquery_match and not self._patterns["limit"].search(sql, subquery_match.start(1), subquery_match.end(1)):
+                issues.append(
+                    Issue(
+                        severity=IssueSeverity.WARNING,
+                        type=IssueType.SQL_SUBQUERY_IN_UPDATE,
+                        message=f"Subquery in UPDATE {table} without LIMIT may update many rows",
+                        operation_index=operation_index,
+                        recommendation=_SUBQUERY_IN_UPDATE_RECOMMENDATION,
+                        table=table,
                     )
+                )
 
         return issues
 
@@ -210,65 +345,40 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
             table = match.group(1)
 
             # Check if subquery has LIMIT
-            delete_part = match.group(0)
             # Search for subquery in brackets after IN/EXISTS (use common pattern as basis)
-            subquery_match = re.search(
-                r"(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+(.*?)\)", delete_part, re.IGNORECASE | re.DOTALL
-            )
-            if subquery_match:
-                subquery_content = subquery_match.group(1)
-                # Check if subquery has LIMIT (use common pattern)
-                if not self._patterns["limit"].search(subquery_content):
-                    issues.append(
-                        Issue(
-                            severity=IssueSeverity.WARNING,
-                            type=IssueType.SQL_SUBQUERY_IN_DELETE,
-                            message=f"Subquery in DELETE FROM {table} without LIMIT may delete many rows",
-                            operation_index=operation_index,
-                            recommendation=(
-                                "Subqueries in DELETE without LIMIT may delete many rows and lock the table.\n"
-                                "Recommendations:\n"
-                                "1) Use batching with LIMIT in subquery\n"
-                                "2) Process data in batches (e.g., 1000 rows at a time)\n"
-                                "Example of safe code:\n"
-                                "  batch_size = 1000\n"
-                                "  while True:\n"
-                                "      deleted = op.execute(f'''\n"
-                                "          DELETE FROM users\n"
-                                "          WHERE id IN (\n"
-                                "              SELECT user_id FROM orders \n"
-                                "              WHERE status = 'cancelled'\n"
-                                "              LIMIT {batch_size}\n"
-                                "          )\n"
-                                "      ''').rowcount\n"
-                                "      if deleted == 0:\n"
-                                "          break"
-                            ),
-                            table=table,
-                        )
+            # pos/endpos arguments are used instead of copying matched text
+            subquery_match = self._patterns["in_exists_subquery"].search(sql, match.start(), match.end())
+            if subquery_match and not self._patterns["limit"].search(sql, subquery_match.start(1), subquery_match.end(1)):
+                issues.append(
+                    Issue(
+                        severity=IssueSeverity.WARNING,
+                        type=IssueType.SQL_SUBQUERY_IN_DELETE,
+                        message=f"Subquery in DELETE FROM {table} without LIMIT may delete many rows",
+                        operation_index=operation_index,
+                        recommendation=_SUBQUERY_IN_DELETE_RECOMMENDATION,
+                        table=table,
                     )
+                )
 
         return issues
 
     def _check_subquery_without_limit(self, sql: str, operation_index: int) -> list[Issue]:
         """Check subqueries without LIMIT in migrations."""
-        issues = []
+        issues: list[Issue] = []
+
+        # Subquery in WHERE is impossible without WHERE keyword
+        if "where" not in sql.lower():
+            return issues
 
         # Search for subqueries in WHERE with IN/EXISTS without LIMIT
         # This is a general check for all subqueries in WHERE
-        subquery_pattern = re.compile(
-            r"\b(?:UPDATE|DELETE)\s+.*?\bWHERE\s+.*?(?:IN|EXISTS|NOT\s+EXISTS)\s*\(\s*SELECT\s+.*?\)",
-            re.IGNORECASE | re.DOTALL,
-        )
-        matches = subquery_pattern.finditer(sql)
+        matches = self._patterns["subquery_in_where"].finditer(sql)
 
         for match in matches:
-            query_part = match.group(0)
-
             # Check if subquery has LIMIT (use common pattern)
-            if not self._patterns["limit"].search(query_part):
+            if not self._patterns["limit"].search(sql, match.start(), match.end()):
                 # Extract table name from UPDATE/DELETE
-                table_match = re.search(r"\b(?:UPDATE|DELETE\s+FROM)\s+(\w+)", query_part, re.IGNORECASE)
+                table_match = self._patterns["update_delete_table"].search(sql, match.start(), match.end())
                 if table_match:
                     table = table_match.group(1)
 
@@ -276,15 +386,9 @@ class SqlSubqueryAnalyzer(BaseSqlAnalyzer):
                         Issue(
                             severity=IssueSeverity.WARNING,
                             type=IssueType.SQL_SUBQUERY_WITHOUT_LIMIT,
-                            message=f"Subquery in {query_part[:30]}... without LIMIT may be slow",
+                            message=f"Subquery in {sql[match.start() : match.start() + 30]}... without LIMIT may be slow",
                             operation_index=operation_index,
-                            recommendation=(
-                                "Subqueries without LIMIT may return large number of rows and be slow.\n"
-                                "Recommendations:\n"
-                                "1) Add LIMIT to subquery if possible\n"
-                                "2) Use batching to process data in batches\n"
-                                "3) Check performance on test data"
-                            ),
+                            recommendation=_SUBQUERY_WITHOUT_LIMIT_RECOMMENDATION,
                             table=table,
                         )
                     )
@@ -1,6 +1,22 @@
 """Utilities for working with SQL queries."""
 
 import re
+from typing import Optional
+
+try:
+    import sqlparse
+
+    SQLPARSE_AVAILABLE = True
+except ImportError:
+    SQLPARSE_AVAILABLE = False
+
+# Shared result of successful validation
+_VALID_SQL_INPUT = (True, "")
+
+# Maximum length of SQL that is tokenized by sqlparse. Tokenizing is much slower
+# than regular expression scans (about 1.5 s for 50 KB of SQL), so longer queries
+# are analyzed with regular expressions only.
+SQLPARSE_MAX_SQL_LENGTH = 16 * 1024
 
 
 def normalize_sql(sql: str) -> str:
@@ -41,6 +57,10 @@ def validate_sql_input(sql: str, operation_index: int) -> tuple[bool, str]:
         Tuple (is_valid, error_message), where is_valid - True if data is valid,
         error_message - error message (empty string if valid)
     """
+    # Fast path for the common case: exact types and non-empty static SQL
+    if sql.__class__ is str and operation_index.__class__ is int and sql and sql != "<dynamic>":
+        return _VALID_SQL_INPUT
+
     if not isinstance(sql, str):
         return False, f"sql must be a string, got {type(sql).__name__}"
 
@@ -50,4 +70,24 @@ def validate_sql_input(sql: str, operation_index: int) -> tuple[bool, str]:
     if not sql or sql == "<dynamic>":
         return False, "SQL query is empty or dynamic"
 
-    return True, ""
+    return _VALID_SQL_INPUT
+
+
+def parse_sql(sql: str) -> Optional[tuple]:
+    """
+    Parse normalized SQL into sqlparse statements.
+
+    Args:
+        sql: Normalized SQL query
+
+    Returns:
+        Tuple of sqlparse statements or None if sqlparse is not installed,
+        query is longer than SQLPARSE_MAX_SQL_LENGTH or could not be parsed
+        (e.g., query exceeds sqlparse token limit)
+    """
+    if not SQLPARSE_AVAILABLE or len(sql) > SQLPARSE_MAX_SQL_LENGTH:
+        return None
+    try:
+        return tuple(sqlparse.parse(sql))
+    except sqlparse.exceptions.SQLParseError:
+        return None
@@ -1,10 +1,110 @@
 """Utilities for safe evaluation of AST values without code execution."""
 
 import ast
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
+# Shared default context. Functions below only read the context, never change it
+_EMPTY_CTX: dict[str, Any] = {}
 
-def safe_eval_string(node: ast.AST, context: Optional[dict[str, Any]] = None) -> Optional[str]:
+
+def _str_constant(node: ast.Constant, context: dict[str, Any]) -> Optional[str]:
+    """Extracts string constant: "a"."""
+    value = node.value
+    return value if isinstance(value, str) else None
+
+
+def _str_name(node: ast.Name, context: dict[str, Any]) -> Optional[str]:
+    """Looks up string variable in context."""
+    value = context.get(node.id)
+    return value if isinstance(value, str) else None
+
+
+def _str_list(node: ast.List, context: dict[str, Any]) -> Optional[str]:
+    """Extracts list of strings ["a", "b"] joined with spaces."""
+    parts = []
+    for elt in node.elts:
+        part = safe_eval_string(elt, context)
+        if part is None:
+            return None
+        parts.append(part)
+    return " ".join(parts) if parts else None
+
+
+def _str_binop(node: ast.BinOp, context: dict[str, Any]) -> Optional[str]:
+    """Extracts string concatenation: "a" + "b"."""
+    # Concatenation chains ("a" + "b" + ...) are walked with an explicit stack
+    # instead of recursion: parts are collected left to right and joined once
+    parts: list[str] = []
+    stack: list[ast.AST] = [node]
+    while stack:
+        current = stack.pop()
+
+        if type(current) is ast.BinOp:
+            if type(current.op) is not ast.Add:
+                return None
+            stack.append(current.right)
+            stack.append(current.left)
+            continue
+
+        handler = _STR_HANDLERS.get(type(current))
+        part = handler(current, context) if handler is not None else None
+        if part is None:
+            return None
+        parts.append(part)
+
+    return "".join(parts)
+
+
+# String extractors by AST node type
+_STR_HANDLERS: dict[type, Callable[[Any, dict[str, Any]], Optional[str]]] = {
+    ast.Constant: _str_constant,
+    ast.Name: _str_name,
+    ast.List: _str_list,
+    ast.BinOp: _str_binop,
+}
+
+
+def _bool_constant(node: ast.Constant, context: dict[str, Any]) -> Optional[bool]:
+    """Extracts boolean constant: True/False."""
+    value = node.value
+    return value if isinstance(value, bool) else None
+
+
+def _bool_name(node: ast.Name, context: dict[str, Any]) -> Optional[bool]:
+    """Looks up boolean variable in context."""
+    value = context.get(node.id)
+    return value if isinstance(value, bool) else None
+
+
+# Boolean extractors by AST node type
+_BOOL_HANDLERS: dict[type, Callable[[Any, dict[str, Any]], Optional[bool]]] = {
+    ast.Constant: _bool_constant,
+    ast.Name: _bool_name,
+}
+
+
+def _keyword_constant(node: ast.Constant, context: dict[str, Any]) -> Optional[Any]:
+    """Extracts string or boolean constant."""
+    value = node.value
+    return value if isinstance(value, (str, bool)) else None
+
+
+def _keyword_name(node: ast.Name, context: dict[str, Any]) -> Optional[Any]:
+    """Looks up string or boolean variable in context."""
+    value = context.get(node.id)
+    return value if isinstance(value, (str, bool)) else None
+
+
+# Keyword argument extractors by AST node type
+_KEYWORD_HANDLERS: dict[type, Callable[[Any, dict[str, Any]], Optional[Any]]] = {
+    ast.Constant: _keyword_constant,
+    ast.Name: _keyword_name,
+    ast.List: _str_list,
+    ast.BinOp: _str_binop,
+}
+
+
+def safe_eval_string(node: ast.AST, context: dict[str, Any] = _EMPTY_CTX) -> Optional[str]:
     """
     Safely extracts a string value from an AST node.
 
@@ -16,81 +116,23 @@ def safe_eval_string(node: ast.AST, context: Optional[dict[str, Any]] = None) ->
 
     Returns None if the value cannot be safely extracted.
     """
-    if context is None:
-        context = {}
-
-    if isinstance(node, ast.Constant):
-        if isinstance(node.value, str):
-            return node.value
-        return None
-
-    if isinstance(node, ast.Str):  # Python < 3.8
-        if isinstance(node.s, str):
-            return node.s
-        return None
-
-    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add):
-        # String concatenation: "a" + "b"
-        left = safe_eval_string(node.left, context)
-        right = safe_eval_string(node.right, context)
-        if left is not None and right is not None:
-            return left + right
-        return None
-
-    if isinstance(node, ast.List):
-        # List of strings: ["a", "b"]
-        parts = []
-        for elt in node.elts:
-            part = safe_eval_string(elt, context)
-            if part is None:
-                return None
-            parts.append(part)
-        return " ".join(parts) if parts else None
+    handler = _STR_HANDLERS.get(type(node))
+    return handler(node, context) if handler is not None else None
 
-    if isinstance(node, ast.Name):
-        # Variable lookup in context
-        if node.id in context:
-            value = context[node.id]
-            if isinstance(value, str):
-                return value
-        return None
 
-    return None
-
-
-def safe_eval_bool(node: ast.AST, context: Optional[dict[str, Any]] = None) -> Optional[bool]:
+def safe_eval_bool(node: ast.AST, context: dict[str, Any] = _EMPTY_CTX) -> Optional[bool]:
     """
     Safely extracts a boolean value from an AST node.
 
     Supports:
     - ast.Constant (bool)
-    - ast.NameConstant (Python < 3.8)
     - Variable lookup in context
     """
-    if context is None:
-        context = {}
-
-    if isinstance(node, ast.Constant):
-        if isinstance(node.value, bool):
-            return node.value
-        return None
-
-    if isinstance(node, ast.NameConstant):  # Python < 3.8
-        if isinstance(node.value, bool):
-            return node.value
-        return None
-
-    if isinstance(node, ast.Name):
-        if node.id in context:
-            value = context[node.id]
-            if isinstance(value, bool):
-                return value
-        return None
-
-    return None
+    handler = _BOOL_HANDLERS.get(type(node))
+    return handler(node, context) if handler is not None else None
 
 
-def extract_keyword_arg(call: ast.Call, name: str, context: Optional[dict[str, Any]] = None) -> Optional[Any]:
+def extract_keyword_arg(call: ast.Call, name: str, context: dict[str, Any] = _EMPTY_CTX) -> Optional[Any]:
     """
     Extracts the value of a keyword argument from a function call.
 
@@ -99,36 +141,21 @@ def extract_keyword_arg(call: ast.Call, name: str, context: Optional[dict[str, A
     - bool for boolean arguments
     - None if the argument is not found or cannot be safely extracted
     """
-    if context is None:
-        context = {}
-
     for keyword in call.keywords:
         if keyword.arg == name:
-            # Try to extract as string
-            str_value = safe_eval_string(keyword.value, context)
-            if str_value is not None:
-                return str_value
-
-            # Try to extract as bool
-            bool_value = safe_eval_bool(keyword.value, context)
-            if bool_value is not None:
-                return bool_value
-
-            # For other types, return None
-            return None
+            # Pick extractor by node type, so bool keywords skip string evaluation
+            handler = _KEYWORD_HANDLERS.get(type(keyword.value))
+            return handler(keyword.value, context) if handler is not None else None
 
     return None
 
 
-def extract_positional_arg(call: ast.Call, index: int, context: Optional[dict[str, Any]] = None) -> Optional[str]:
+def extract_positional_arg(call: ast.Call, index: int, context: dict[str, Any] = _EMPTY_CTX) -> Optional[str]:
     """
     Extracts a positional argument from a function call by index.
 
     Returns a string or None.
     """
-    if context is None:
-        context = {}
-
     if index < len(call.args):
         return safe_eval_string(call.args[index], context)
 
@@ -3,7 +3,7 @@
 from .add_column_not_null_fix import AddColumnNotNullFix
 from .autofix_engine import AutofixEngine
 from .base import Autofix
-from .base_finder import BaseOperationFinder
+from .base_finder import BaseOperationFinder, find_all_operations, find_operation
 from .create_index_fix import CreateIndexFix
 from .drop_index_fix import DropIndexFix
 
@@ -14,4 +14,6 @@ __all__ = [
     "CreateIndexFix",
     "DropIndexFix",
     "BaseOperationFinder",
+    "find_all_operations",
+    "find_operation",
 ]
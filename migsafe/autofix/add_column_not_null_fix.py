@@ -2,15 +2,42 @@
 
 import ast
 import logging
+from functools import lru_cache
 from typing import Optional
 
 from ..models import Issue, IssueType
-from .ast_utils import unparse_ast
 from .base import Autofix
-from .base_finder import BaseOperationFinder
+from .base_finder import BaseOperationFinder, is_operation_call
 
 logger = logging.getLogger(__name__)
 
+# Callee nodes of generated op.execute(...) and op.alter_column(...) calls.
+# They are never modified after creation, so all generated statements share them.
+_OP_EXECUTE_FUNC = ast.Attribute(value=ast.Name(id="op", ctx=ast.Load()), attr="execute", ctx=ast.Load())
+_OP_ALTER_COLUMN_FUNC = ast.Attribute(value=ast.Name(id="op", ctx=ast.Load()), attr="alter_column", ctx=ast.Load())
+
+
+@lru_cache(maxsize=256)
+def _render_backfill_sql(table_name: str, column_name: str) -> str:
+    """Renders SQL template for batched backfill of the column.
+
+    Result is cached per (table, column) pair.
+    """
+    # Generate SQL for backfill in batches
+    # IMPORTANT: This is a template that requires manual refinement!
+    # - Replace 'default_value' with actual value
+    # - Adapt WHERE condition to table structure
+    # - Ensure table has primary key for batching
+    return (
+        f"-- TODO: Replace 'default_value' with actual value for column {column_name}\n"
+        f"-- TODO: Adapt WHERE condition to table {table_name} structure\n"
+        f"-- TODO: Ensure table has primary key for batching\n"
+        f"UPDATE {table_name} SET {column_name} = 'default_value' "
+        f"WHERE {column_name} IS NULL AND id IN ("
+        f"SELECT id FROM {table_name} WHERE {column_name} IS NULL LIMIT 1000"
+        f")"
+    )
+
 
 class AddColumnNotNullFix(Autofix):
     """Fix for generating safe ADD COLUMN NOT NULL pattern.
@@ -21,88 +48,60 @@ class AddColumnNotNullFix(Autofix):
     3. Set NOT NULL
     """
 
+    HANDLES = (IssueType.ADD_COLUMN_NOT_NULL,)
+    SOURCE_MARKER = "add_column"
+
     def can_fix(self, issue: Issue) -> bool:
         """Checks if can fix ADD_COLUMN_NOT_NULL issue."""
-        return issue.type == IssueType.ADD_COLUMN_NOT_NULL
+        return issue.type in self.HANDLES
 
-    def apply_fix(self, source_code: str, issue: Issue, ast_tree: Optional[ast.Module] = None) -> tuple[str, bool]:
+    def fix_ast(self, ast_tree: ast.Module, issue: Issue) -> bool:
         """
         Generates safe pattern for ADD COLUMN NOT NULL.
 
         Args:
-            source_code: Migration source code
+            ast_tree: Module AST tree, changed in place
             issue: Issue with operation information
-            ast_tree: Parsed AST tree
 
         Returns:
-            Tuple (fixed_code, successfully_applied)
+            True if the fix was applied
         """
         # Validate issue
         if not self._validate_issue(issue):
             logger.warning(f"Invalid operation_index: {issue.operation_index}")
-            return source_code, False
-
-        if ast_tree is None:
-            try:
-                ast_tree = ast.parse(source_code)
-            except SyntaxError:
-                return source_code, False
-
-        # Validate AST tree
-        if not self._validate_ast_tree(ast_tree):
-            logger.warning("AST tree is invalid or upgrade() function not found")
-            return source_code, False
+            return False
 
         # Find upgrade() function
-        upgrade_func = self._find_upgrade_function(ast_tree)
+        upgrade_func = self._get_upgrade_function(ast_tree)
         if upgrade_func is None:
             logger.warning("upgrade() function not found in migration")
-            return source_code, False
+            return False
 
-        # Find op.add_column call by operation index
-        finder = AddColumnFinder(issue.operation_index)
-        finder.visit(upgrade_func)
+        # Find op.add_column call of the issue
+        add_column_call, stmt_index = self._find_operation(upgrade_func, issue, _is_add_column)
 
-        if finder.found_call is None or finder.found_stmt_index is None:
-            return source_code, False
+        if add_column_call is None or stmt_index is None:
+            return False
 
         # Extract column information
         table_name = issue.table or "unknown"
         column_name = issue.column or "unknown"
 
         # Change nullable to True in add_column call
-        self._change_nullable_to_true(finder.found_call)
+        self._change_nullable_to_true(add_column_call)
 
         # Create backfill operation
         backfill_stmt = self._create_backfill_statement(table_name, column_name)
 
         # Create alter_column operation to set NOT NULL
-        alter_column_stmt = self._create_alter_column_statement(table_name, column_name, finder.found_call)
-
-        # Insert new operations after add_column
-        # Insert in reverse order so indices don't shift:
-        # 1. First insert alter_column (it will be farther from add_column)
-        # 2. Then insert backfill at the same position (it will be closer to add_column)
-        # Result: add_column -> backfill -> alter_column
-        insert_index = finder.found_stmt_index + 1
-        upgrade_func.body.insert(insert_index, alter_column_stmt)
-        upgrade_func.body.insert(insert_index, backfill_stmt)
-
-        # Generate fixed code
-        try:
-            fixed_code = unparse_ast(ast_tree)
-            logger.debug(f"Successfully applied fix for {issue.type}")
-            return fixed_code, True
-        except RuntimeError as e:
-            # Special handling for unparse errors (e.g., missing astor)
-            logger.error(f"Failed to convert AST to code: {e}")
-            return source_code, False
-        except SyntaxError as e:
-            logger.warning(f"Syntax error when generating code: {e}")
-            return source_code, False
-        except Exception as e:
-            logger.error(f"Unexpected error in {self.__class__.__name__}: {e}", exc_info=True)
-            return source_code, False
+        alter_column_stmt = self._create_alter_column_statement(table_name, column_name, add_column_call)
+
+        # Insert new operations after add_column with one slice assignment,
+        # list order is the final order: add_column -> backfill -> alter_column
+        insert_index = stmt_index + 1
+        upgrade_func.body[insert_index:insert_index] = [backfill_stmt, alter_column_stmt]
+
+        return True
 
     def _change_nullable_to_true(self, add_column_call: ast.Call):
         """Changes nullable=False to nullable=True in add_column call."""
@@ -126,12 +125,12 @@ class AddColumnNotNullFix(Autofix):
         # If this is sa.Column call, look for nullable in keyword arguments
         if isinstance(column_arg, ast.Call):
             # Look for nullable keyword
-            for kw in column_arg.keywords:
-                if kw.arg == "nullable":
-                    # Replace with True
-                    kw.value = ast.Constant(value=True)
-                    logger.debug("Changed nullable=False to nullable=True")
-                    return
+            kw = self._find_keyword(column_arg, "nullable")
+            if kw is not None:
+                # Replace with True
+                kw.value = ast.Constant(value=True)
+                logger.debug("Changed nullable=False to nullable=True")
+                return
 
             # If nullable not found, add it
             column_arg.keywords.append(ast.keyword(arg="nullable", value=ast.Constant(value=True)))
@@ -144,24 +143,11 @@ class AddColumnNotNullFix(Autofix):
         User must replace 'default_value' with actual value
         and adapt SQL to their table structure.
         """
-        # Generate SQL for backfill in batches
-        # IMPORTANT: This is a template that requires manual refinement!
-        # - Replace 'default_value' with actual value
-        # - Adapt WHERE condition to table structure
-        # - Ensure table has primary key for batching
-        sql_template = (
-            f"-- TODO: Replace 'default_value' with actual value for column {column_name}\n"
-            f"-- TODO: Adapt WHERE condition to table {table_name} structure\n"
-            f"-- TODO: Ensure table has primary key for batching\n"
-            f"UPDATE {table_name} SET {column_name} = 'default_value' "
-            f"WHERE {column_name} IS NULL AND id IN ("
-            f"SELECT id FROM {table_name} WHERE {column_name} IS NULL LIMIT 1000"
-            f")"
-        )
+        sql_template = _render_backfill_sql(table_name, column_name)
 
         # Create op.execute call
         execute_call = ast.Call(
-            func=ast.Attribute(value=ast.Name(id="op", ctx=ast.Load()), attr="execute", ctx=ast.Load()),
+            func=_OP_EXECUTE_FUNC,
             args=[ast.Constant(value=sql_template)],
             keywords=[],
         )
@@ -184,7 +170,7 @@ class AddColumnNotNullFix(Autofix):
             keywords.append(ast.keyword(arg="schema", value=schema_node))
 
         alter_column_call = ast.Call(
-            func=ast.Attribute(value=ast.Name(id="op", ctx=ast.Load()), attr="alter_column", ctx=ast.Load()),
+            func=_OP_ALTER_COLUMN_FUNC,
             args=args,
             keywords=keywords,
         )
@@ -200,24 +186,13 @@ class AddColumnNotNullFix(Autofix):
         Returns:
             AST node for schema or None
         """
-        for kw in call.keywords:
-            if kw.arg == "schema":
-                return kw.value
-        return None
+        kw = self._find_keyword(call, "schema")
+        return kw.value if kw is not None else None
 
-    def _find_upgrade_function(self, ast_tree: ast.Module) -> Optional[ast.FunctionDef]:
-        """Finds upgrade() function in AST tree.
 
-        Args:
-            ast_tree: AST tree to search
-
-        Returns:
-            upgrade() function or None
-        """
-        for node in ast.walk(ast_tree):
-            if isinstance(node, ast.FunctionDef) and node.name == "upgrade":
-                return node
-        return None
+def _is_add_column(call: ast.Call, batch_context: dict[str, str]) -> bool:
+    """Checks if the call is op.add_column or any batch_op.add_column."""
+    return is_operation_call(call, "add_column", batch_context)
 
 
 class AddColumnFinder(BaseOperationFinder):
@@ -228,10 +203,4 @@ class AddColumnFinder(BaseOperationFinder):
 
     def _is_target_operation(self, node: ast.Call) -> bool:
         """Checks if the call is an add_column operation."""
-        if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
-            var_name = node.func.value.id
-            # Check op.add_column or any batch_op.add_column
-            return (var_name == "op" and node.func.attr == "add_column") or (
-                var_name in self.batch_context and node.func.attr == "add_column"
-            )
-        return False
+        return _is_add_column(node, self.batch_context)
@@ -1,21 +1,241 @@
 """Utilities for working with AST in autofix."""
 
 import ast
+import re
+import weakref
+from typing import Optional
+
+# upgrade() function and number of op.* operations in its body per module AST tree.
+# Weak keys let cached entries disappear together with the tree.
+_UPGRADE_INFO_CACHE: "weakref.WeakKeyDictionary[ast.Module, tuple[Optional[ast.FunctionDef], int]]" = weakref.WeakKeyDictionary()
 
 
 def unparse_ast(tree: ast.AST) -> str:
     """
-    Converts AST tree back to source code.
-
-    Uses ast.unparse for Python 3.9+, uses fallback for Python 3.8.
+    Converts AST tree back to source code with ast.unparse.
 
     Args:
         tree: AST tree to convert
 
     Returns:
         Source code
-
-    Raises:
-        RuntimeError: If AST conversion failed (Python 3.8 without astor)
     """
     return ast.unparse(tree)
+
+
+def unparse_with_source(ast_tree: ast.Module, source_code: str) -> str:
+    """
+    Converts changed AST tree back to source code, keeping unchanged code as is.
+
+    Nodes created by fixes have no source location: statements without location
+    are inserted into the source and statements containing such nodes are
+    regenerated with ast.unparse. The rest of the source, including comments
+    and formatting, is copied from source_code. Falls back to unparse_ast()
+    when a change cannot be placed into the source.
+
+    Args:
+        ast_tree: AST tree parsed from source_code and changed in place
+        source_code: Source code of the tree
+
+    Returns:
+        Source code
+    """
+    splicer = _SourceSplicer(source_code)
+    if splicer.collect(ast_tree.body):
+        return splicer.apply()
+    return unparse_ast(ast_tree)
+
+
+# Lines of source code the way Python tokenizer counts them (only \r\n, \r and \n end a line)
+_SOURCE_LINE_RE = re.compile(r"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+
+# Fields of compound statements holding nested blocks
+_BLOCK_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+
+class _SourceSplicer:
+    """Collects source code replacements for statements changed by fixes."""
+
+    def __init__(self, source_code: str):
+        self.source_code = source_code
+        self.lines = _SOURCE_LINE_RE.findall(source_code)
+        self.line_starts = [0]
+        for line in self.lines:
+            self.line_starts.append(self.line_starts[-1] + len(line))
+        self.newline = "\r\n" if self.lines and self.lines[0].endswith("\r\n") else "\n"
+        self.edits: list[tuple[int, int, str]] = []  # (start, end, text)
+
+    def collect(self, stmts: list[ast.stmt]) -> bool:
+        """Collects replacements for a block of statements, returns False if changes can't be spliced."""
+        inserted: list[ast.stmt] = []
+        prev: Optional[ast.stmt] = None
+        for stmt in stmts:
+            if getattr(stmt, "lineno", None) is None:
+                inserted.append(stmt)
+                continue
+            if inserted:
+                if not self._insert(inserted, prev, stmt):
+                    return False
+                inserted = []
+            if not self._collect_stmt(stmt):
+                return False
+            prev = stmt
+        return not inserted or self._insert(inserted, prev, None)
+
+    def apply(self) -> str:
+        """Returns source code with collected replacements."""
+        pieces = []
+        pos = 0
+        # Sort is stable: insertion before a statement stays before its replacement
+        for start, end, text in sorted(self.edits, key=lambda edit: edit[0]):
+            pieces.append(self.source_code[pos:start])
+            pieces.append(text)
+            pos = end
+        pieces.append(self.source_code[pos:])
+        return "".join(pieces)
+
+    def _collect_stmt(self, stmt: ast.stmt) -> bool:
+        """Collects replacements for a located statement."""
+        blocks = []
+        changed = _has_new_nodes(stmt, skip_blocks=True)
+        for field in _BLOCK_FIELDS:
+            value = getattr(stmt, field, None)
+            if not value:
+                continue
+            if field in ("handlers", "cases"):
+                # except/case clauses: header is checked here, bodies are separate blocks
+                for clause in value:
+                    changed = changed or _has_new_nodes(clause, skip_blocks=True)
+                    blocks.append(clause.body)
+            else:
+                blocks.append(value)
+
+        if changed:
+            return self._replace(stmt)
+        return all(self.collect(block) for block in blocks)
+
+    def _replace(self, stmt: ast.stmt) -> bool:
+        """Regenerates code of a changed statement."""
+        text = _render_stmt(stmt)
+        if text is None:
+            return False
+        start = self._offset(stmt.lineno, stmt.col_offset)
+        end = self._offset(stmt.end_lineno, stmt.end_col_offset)  # type: ignore[arg-type]
+        self.edits.append((start, end, text))
+        return True
+
+    def _insert(self, stmts: list[ast.stmt], prev: Optional[ast.stmt], next_stmt: Optional[ast.stmt]) -> bool:
+        """Inserts new statements between located statements prev and next_stmt."""
+        anchor = prev if prev is not None else next_stmt
+        if anchor is None:
+            return False
+        indent = self._indent(anchor)
+        if indent is None:
+            return False
+
+        texts = []
+        for stmt in stmts:
+            text = _render_stmt(stmt)
+            if text is None:
+                return False
+            texts.append(indent + text + self.newline)
+
+        if prev is None:
+            # Insert before the first statement of the block
+            pos = self.line_starts[anchor.lineno - 1]
+        else:
+            end_lineno: int = prev.end_lineno  # type: ignore[assignment]
+            if next_stmt is not None and next_stmt.lineno == end_lineno:
+                # Statements on one line (a(); b())
+                return False
+            pos = self.line_starts[end_lineno]
+            if end_lineno == len(self.lines) and not self.lines[-1].endswith(("\n", "\r")):
+                texts.insert(0, self.newline)
+        self.edits.append((pos, pos, "".join(texts)))
+        return True
+
+    def _offset(self, lineno: int, col_offset: int) -> int:
+        """Converts AST position (col_offset is in UTF-8 bytes) to source code offset."""
+        line = self.lines[lineno - 1]
+        if not line.isascii():
+            col_offset = len(line.encode("utf-8")[:col_offset].decode("utf-8", errors="ignore"))
+        return self.line_starts[lineno - 1] + col_offset
+
+    def _indent(self, stmt: ast.stmt) -> Optional[str]:
+        """Returns indentation of the statement or None if it doesn't start its line."""
+        line = self.lines[stmt.lineno - 1]
+        indent = line[: self._offset(stmt.lineno, stmt.col_offset) - self.line_starts[stmt.lineno - 1]]
+        return indent if not indent.strip() else None
+
+
+def _has_new_nodes(node: ast.AST, skip_blocks: bool = False) -> bool:
+    """Checks if the node or its children have no source location (were created by a fix)."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if "lineno" in current._attributes and getattr(current, "lineno", None) is None:
+            return True
+        for field, value in ast.iter_fields(current):
+            if skip_blocks and current is node and field in _BLOCK_FIELDS:
+                continue
+            if isinstance(value, ast.AST):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(item for item in value if isinstance(item, ast.AST))
+    return False
+
+
+def _render_stmt(stmt: ast.stmt) -> Optional[str]:
+    """Renders a simple statement to one line of code, None for multi-line code."""
+    text = ast.unparse(stmt)
+    return None if "\n" in text or "\r" in text else text
+
+
+def get_upgrade_info(ast_tree: ast.Module) -> tuple[Optional[ast.FunctionDef], int]:
+    """
+    Finds top-level upgrade() function and counts op.* operations in its body.
+
+    Result is cached per AST tree. After changing operations of the tree
+    call invalidate_upgrade_info().
+
+    Args:
+        ast_tree: Module AST tree
+
+    Returns:
+        Tuple (upgrade_function, operation_count), upgrade_function is None
+        and operation_count is 0 if upgrade() is not found
+    """
+    info = _UPGRADE_INFO_CACHE.get(ast_tree)
+    if info is not None:
+        return info
+
+    info = (None, 0)
+    # upgrade() is always a top-level function of Alembic migration
+    for node in ast_tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "upgrade":
+            # Count op.* calls in upgrade() function body
+            count = 0
+            for stmt in node.body:
+                if (
+                    isinstance(stmt, ast.Expr)
+                    and isinstance(stmt.value, ast.Call)
+                    and isinstance(stmt.value.func, ast.Attribute)
+                    and isinstance(stmt.value.func.value, ast.Name)
+                    and stmt.value.func.value.id == "op"
+                ):
+                    count += 1
+            info = (node, count)
+            break
+
+    _UPGRADE_INFO_CACHE[ast_tree] = info
+    return info
+
+
+def invalidate_upgrade_info(ast_tree: ast.Module) -> None:
+    """
+    Drops cached get_upgrade_info() result for the AST tree.
+
+    Args:
+        ast_tree: Module AST tree that was changed
+    """
+    _UPGRADE_INFO_CACHE.pop(ast_tree, None)
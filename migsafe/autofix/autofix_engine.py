@@ -4,8 +4,9 @@ import ast
 import logging
 from typing import Optional
 
-from ..models import Issue
+from ..models import Issue, IssueType
 from .add_column_not_null_fix import AddColumnNotNullFix
+from .ast_utils import get_upgrade_info, invalidate_upgrade_info, unparse_with_source
 from .base import Autofix
 from .create_index_fix import CreateIndexFix
 from .drop_index_fix import DropIndexFix
@@ -20,6 +21,10 @@ class AutofixEngine:
     - AddColumnNotNullFix: generates safe pattern for ADD COLUMN NOT NULL
     - CreateIndexFix: adds postgresql_concurrently=True
     - DropIndexFix: adds postgresql_concurrently=True
+
+    Migration source is parsed once per apply_fixes() call and all fixes
+    change the same AST tree (see Autofix.fix_ast()). Lookups on the tree,
+    such as upgrade() function and operation calls, are cached per tree.
     """
 
     def __init__(self, fixes: Optional[list[Autofix]] = None):
@@ -38,6 +43,14 @@ class AutofixEngine:
         else:
             self._fixes = fixes
 
+        # Fixes declaring HANDLES are looked up by issue type,
+        # others are checked with can_fix() for every issue
+        self._fixes_by_type: dict[IssueType, list[Autofix]] = {}
+        for fix in self._fixes:
+            for issue_type in fix.HANDLES:
+                self._fixes_by_type.setdefault(issue_type, []).append(fix)
+        self._has_dynamic_fixes = any(not fix.HANDLES for fix in self._fixes)
+
     @classmethod
     def with_default_fixes(cls) -> "AutofixEngine":
         """Creates engine with default fixes."""
@@ -53,7 +66,11 @@ class AutofixEngine:
         Returns:
             List of fixes that can handle the issue
         """
-        return [fix for fix in self._fixes if fix.can_fix(issue)]
+        typed_fixes = self._fixes_by_type.get(issue.type, [])
+        if not self._has_dynamic_fixes:
+            return list(typed_fixes)
+        # Keep order in which fixes were passed to the engine
+        return [fix for fix in self._fixes if fix in typed_fixes or (not fix.HANDLES and fix.can_fix(issue))]
 
     def apply_fixes(self, source_code: str, issues: list[Issue], dry_run: bool = False) -> tuple[str, list[Issue], list[Issue]]:
         """
@@ -78,6 +95,11 @@ class AutofixEngine:
             # If parsing failed, return original code
             return source_code, [], issues
 
+        # Fixes change ast_tree in place, code is generated once after all fixes.
+        # ast_tree is always parsed from fixed_code, tree_changed is True
+        # while ast_tree has changes not yet in fixed_code.
+        tree_changed = False
+
         # Apply fixes in order of issue appearance
         # Important: fixes are applied sequentially, as operation indices
         # may change after applying previous fixes
@@ -100,17 +122,29 @@ class AutofixEngine:
             if dry_run:
                 # In dry-run mode only check if fix can be applied
                 fixed_issues.append(issue)
-            else:
-                # Apply fix
-                logger.debug(f"Applying fix {fix.__class__.__name__} for issue {issue.type}")
-                new_code, success = fix.apply_fix(fixed_code, issue, ast_tree)
+                continue
 
+            # Apply fix
+            logger.debug(f"Applying fix {fix.__class__.__name__} for issue {issue.type}")
+            success = fix.fix_ast(ast_tree, issue)
+
+            if success is None:
+                # Fix works with source code only, generate code for previous fixes first
+                # and re-parse it, so the tree matches the code passed to the fix
+                if tree_changed:
+                    generated_code = self._generate_code(ast_tree, fixed_code)
+                    if generated_code is None:
+                        return source_code, [], issues
+                    fixed_code = generated_code
+                    ast_tree = ast.parse(fixed_code)
+                    tree_changed = False
+
+                new_code, success = fix.apply_fix(fixed_code, issue, ast_tree)
                 if success:
                     fixed_code = new_code
                     # Re-parse AST for next fixes
                     try:
                         ast_tree = ast.parse(fixed_code)
-                        logger.debug(f"Successfully applied fix for issue {issue.type}")
                     except SyntaxError as e:
                         # If re-parsing failed, stop applying fixes
                         logger.error(
@@ -120,13 +154,43 @@ class AutofixEngine:
                         # Add remaining issues to unfixed
                         unfixed_issues.extend(issues[issue_idx + 1 :])
                         break
-                    fixed_issues.append(issue)
-                else:
-                    logger.warning(f"Failed to apply fix {fix.__class__.__name__} for issue {issue.type}")
-                    unfixed_issues.append(issue)
+            elif success:
+                tree_changed = True
+                # Fix may have added or removed operations
+                invalidate_upgrade_info(ast_tree)
+
+            if success:
+                logger.debug(f"Successfully applied fix for issue {issue.type}")
+                fixed_issues.append(issue)
+            else:
+                logger.warning(f"Failed to apply fix {fix.__class__.__name__} for issue {issue.type}")
+                unfixed_issues.append(issue)
+
+        if tree_changed:
+            generated_code = self._generate_code(ast_tree, fixed_code)
+            if generated_code is None:
+                return source_code, [], issues
+            fixed_code = generated_code
 
         return fixed_code, fixed_issues, unfixed_issues
 
+    def _generate_code(self, ast_tree: ast.Module, source_code: str) -> Optional[str]:
+        """
+        Converts fixed AST tree back to code.
+
+        Args:
+            ast_tree: Fixed module AST tree
+            source_code: Source code the tree was parsed from
+
+        Returns:
+            Generated code or None if the tree could not be converted
+        """
+        try:
+            return unparse_with_source(ast_tree, source_code)
+        except Exception as e:
+            logger.error(f"Failed to convert AST to code: {e}", exc_info=True)
+            return None
+
     def can_fix_any(self, issues: list[Issue]) -> bool:
         """
         Checks if the engine can fix at least one issue.
@@ -139,7 +203,7 @@ class AutofixEngine:
         """
         return any(self.get_applicable_fixes(issue) for issue in issues)
 
-    def _validate_issue(self, issue: Issue, ast_tree: Optional[ast.AST] = None) -> bool:
+    def _validate_issue(self, issue: Issue, ast_tree: Optional[ast.Module] = None) -> bool:
         """
         Validates Issue before applying fix.
 
@@ -162,7 +226,7 @@ class AutofixEngine:
 
         return True
 
-    def _count_operations(self, ast_tree: ast.AST) -> int:
+    def _count_operations(self, ast_tree: ast.Module) -> int:
         """
         Counts the number of migration operations in the AST tree.
 
@@ -172,18 +236,4 @@ class AutofixEngine:
         Returns:
             Number of operations
         """
-        count = 0
-        for node in ast.walk(ast_tree):
-            if isinstance(node, ast.FunctionDef) and node.name == "upgrade":
-                # Count op.* calls in upgrade() function body
-                for stmt in node.body:
-                    if (
-                        isinstance(stmt, ast.Expr)
-                        and isinstance(stmt.value, ast.Call)
-                        and isinstance(stmt.value.func, ast.Attribute)
-                        and isinstance(stmt.value.func.value, ast.Name)
-                        and stmt.value.func.value.id == "op"
-                    ):
-                        count += 1
-                break
-        return count
+        return get_upgrade_info(ast_tree)[1]
@@ -1,19 +1,37 @@
 """Base class for automatic migration fixes."""
 
 import ast
+import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
 
-from ..models import Issue
+from ..models import Issue, IssueType
+from .ast_utils import get_upgrade_info, unparse_with_source
+from .base_finder import find_operation, find_operation_at_line, get_operation_calls, is_operation_call
+
+logger = logging.getLogger(__name__)
 
 
 class Autofix(ABC):
     """Abstract class for automatic fixes of migration issues.
 
-    Each fix should inherit from this class and implement
-    the can_fix() and apply_fix() methods.
+    Each fix should inherit from this class and implement the can_fix()
+    method and either fix_ast() (preferred, the fix changes the AST tree
+    in place) or apply_fix() (the fix works with source code).
+
+    Attributes:
+        HANDLES: Issue types handled by the fix. AutofixEngine selects fixes
+            with non-empty HANDLES by issue type without calling can_fix(),
+            so it must match can_fix(). Fixes that need other checks
+            leave it empty.
+        SOURCE_MARKER: Text that source code must contain for the fix to apply,
+            e.g. the operation name. apply_fix() skips parsing source code
+            without it. Empty by default, which disables the check.
     """
 
+    HANDLES: tuple[IssueType, ...] = ()
+    SOURCE_MARKER: str = ""
+
     @abstractmethod
     def can_fix(self, issue: Issue) -> bool:
         """
@@ -27,20 +45,71 @@ class Autofix(ABC):
         """
         pass
 
-    @abstractmethod
     def apply_fix(self, source_code: str, issue: Issue, ast_tree: Optional[ast.Module] = None) -> tuple[str, bool]:
         """
         Applies the fix to the migration source code.
 
+        Default implementation applies fix_ast() to the AST tree and
+        regenerates changed statements, other code is kept as is.
+
         Args:
             source_code: Migration source code
             issue: Issue to fix
-            ast_tree: Parsed AST tree of the module (optional, for optimization)
+            ast_tree: Parsed AST tree of the module (optional, for optimization).
+                The tree is changed in place when the fix is applied.
 
         Returns:
             Tuple (fixed_code, successfully_applied)
         """
-        pass
+        # Cheap text check before parsing and searching the tree
+        if self.SOURCE_MARKER not in source_code:
+            return source_code, False
+
+        if ast_tree is None:
+            # Not cached: the fix changes the tree in place, and copying a cached
+            # tree with copy.deepcopy() is slower than parsing the source again.
+            # Callers applying several fixes pass ast_tree (see AutofixEngine).
+            try:
+                ast_tree = ast.parse(source_code)
+            except SyntaxError:
+                return source_code, False
+
+        if not self.fix_ast(ast_tree, issue):
+            return source_code, False
+
+        # Generate fixed code
+        try:
+            fixed_code = unparse_with_source(ast_tree, source_code)
+            logger.debug(f"Successfully applied fix for {issue.type}")
+            return fixed_code, True
+        except RuntimeError as e:
+            logger.error(f"Failed to convert AST to code: {e}")
+            return source_code, False
+        except SyntaxError as e:
+            logger.warning(f"Syntax error when generating code: {e}")
+            return source_code, False
+        except Exception as e:
+            logger.error(f"Unexpected error in {self.__class__.__name__}: {e}", exc_info=True)
+            return source_code, False
+
+    def fix_ast(self, ast_tree: ast.Module, issue: Issue) -> Optional[bool]:
+        """
+        Applies the fix to the module AST tree in place.
+
+        Lets AutofixEngine apply several fixes to one tree and generate
+        code only once. The tree must stay unchanged if the fix cannot be applied.
+        Changed parts must be new nodes: statements containing nodes without
+        source location are regenerated, the rest of the source is kept.
+
+        Args:
+            ast_tree: Module AST tree
+            issue: Issue to fix
+
+        Returns:
+            True if the fix was applied, False if it could not be applied,
+            None if the fix works with source code only (see apply_fix())
+        """
+        return None
 
     def _validate_issue(self, issue: Issue) -> bool:
         """
@@ -64,10 +133,8 @@ class Autofix(ABC):
         Returns:
             True if the AST tree is valid
         """
-        if ast_tree is None:
-            return False
         # Check for upgrade() function presence
-        return self._has_upgrade_function(ast_tree)
+        return ast_tree is not None and self._get_upgrade_function(ast_tree) is not None
 
     def _has_upgrade_function(self, ast_tree: ast.Module) -> bool:
         """
@@ -79,4 +146,84 @@ class Autofix(ABC):
         Returns:
             True if upgrade() function is found
         """
-        return any(isinstance(node, ast.FunctionDef) and node.name == "upgrade" for node in ast.walk(ast_tree))
+        return self._get_upgrade_function(ast_tree) is not None
+
+    def _get_upgrade_function(self, ast_tree: ast.Module) -> Optional[ast.FunctionDef]:
+        """
+        Returns top-level upgrade() function of the module.
+
+        Args:
+            ast_tree: Module AST tree
+
+        Returns:
+            upgrade() function or None
+        """
+        return get_upgrade_info(ast_tree)[0]
+
+    @staticmethod
+    def _find_keyword(call: ast.Call, name: str) -> Optional[ast.keyword]:
+        """
+        Returns keyword argument of the call by name.
+
+        Args:
+            call: Function call
+            name: Keyword argument name
+
+        Returns:
+            Keyword or None if the call has no such argument
+        """
+        return next((kw for kw in call.keywords if kw.arg == name), None)
+
+    def _find_operation(
+        self,
+        upgrade_func: ast.FunctionDef,
+        issue: Issue,
+        is_target: Callable[[ast.Call, dict[str, str]], bool],
+    ) -> tuple[Optional[ast.Call], Optional[int]]:
+        """
+        Finds operation call of the issue in upgrade() function.
+
+        Uses the issue source location when it is known, otherwise
+        (or if it has no matching call or several of them) searches by operation index.
+
+        Args:
+            upgrade_func: upgrade() function
+            issue: Issue to fix
+            is_target: Checks if the call is the target operation
+
+        Returns:
+            Tuple (call, stmt_index), (None, None) if not found
+        """
+        if issue.lineno is not None:
+            call, stmt_index = find_operation_at_line(upgrade_func, issue.lineno, is_target, issue.col_offset)
+            if call is not None:
+                return call, stmt_index
+        return find_operation(upgrade_func, issue.operation_index, is_target)
+
+    def _find_operation_call(self, upgrade_func: ast.FunctionDef, issue: Issue, operation_name: str) -> Optional[ast.Call]:
+        """
+        Finds op.<operation_name>(...) call of the issue in upgrade() function.
+
+        Like _find_operation(), but searches by operation index in calls
+        cached per upgrade() function. For fixes that don't need the statement index.
+
+        Args:
+            upgrade_func: upgrade() function
+            issue: Issue to fix
+            operation_name: Operation name (e.g., "create_index")
+
+        Returns:
+            Found call or None
+        """
+        if issue.lineno is not None:
+            call = find_operation_at_line(
+                upgrade_func,
+                issue.lineno,
+                lambda call, batch_context: is_operation_call(call, operation_name, batch_context),
+                issue.col_offset,
+            )[0]
+            if call is not None:
+                return call
+
+        calls = get_operation_calls(upgrade_func, operation_name)
+        return calls[issue.operation_index] if 0 <= issue.operation_index < len(calls) else None
@@ -1,14 +1,260 @@
-"""Base class for finding migration operations in AST."""
+"""Search for migration operations in AST."""
 
 import ast
+import sys
+import weakref
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Optional
+
+from .ast_utils import _BLOCK_FIELDS
+
+# op.* and batch_op.* calls of upgrade() function by operation name, in execution order
+_OPERATION_CALLS: "weakref.WeakKeyDictionary[ast.FunctionDef, dict[str, list[ast.Call]]]" = weakref.WeakKeyDictionary()
+
+
+def find_operation(
+    upgrade_func: ast.FunctionDef,
+    target_index: int,
+    is_target: Callable[[ast.Call, dict[str, str]], bool],
+) -> tuple[Optional[ast.Call], Optional[int]]:
+    """
+    Finds migration operation call by index in upgrade() function.
+
+    Only statement-level nodes are visited: operation calls (op.add_column(...)),
+    with-blocks (batch_alter_table) and bodies of compound statements.
+
+    Args:
+        upgrade_func: upgrade() function
+        target_index: Index of the operation among operations matched by is_target
+        is_target: Checks if the call is the target operation,
+            receives the call and batch context (batch_var -> table_name)
+
+    Returns:
+        Tuple (call, stmt_index) with the found call and index of the top-level
+        upgrade() statement containing it, (None, None) if not found
+    """
+    remaining = target_index
+    for stmt_index, stmt in enumerate(upgrade_func.body):
+        found, remaining = _find_in_stmts([stmt], remaining, is_target, {})
+        if found is not None:
+            return found, stmt_index
+    return None, None
+
+
+def find_all_operations(
+    upgrade_func: ast.FunctionDef,
+    is_target: Callable[[ast.Call, dict[str, str]], bool],
+) -> list[ast.Call]:
+    """
+    Finds all migration operation calls in upgrade() function in one pass.
+
+    Args:
+        upgrade_func: upgrade() function
+        is_target: Checks if the call is the target operation (see find_operation())
+
+    Returns:
+        Matching calls in execution order, the call at position i is
+        the one find_operation() returns for target_index=i
+    """
+    calls: list[ast.Call] = []
+
+    def collect(call: ast.Call, batch_context: dict[str, str]) -> bool:
+        if is_target(call, batch_context):
+            calls.append(call)
+        # Never report a match, so the whole function is searched
+        return False
+
+    _find_in_stmts(upgrade_func.body, 0, collect, {})
+    return calls
+
+
+def get_operation_calls(upgrade_func: ast.FunctionDef, operation_name: str) -> list[ast.Call]:
+    """
+    Returns op.<operation_name>(...) and batch_op.<operation_name>(...) calls of upgrade() function.
+
+    Calls of all operations are collected in one pass on first use and cached
+    per function, so fixes of several issues don't search upgrade() again.
+    The lists are a snapshot: calls added later by fixes are not included,
+    so positions keep matching the analyzed migration.
+
+    Args:
+        upgrade_func: upgrade() function
+        operation_name: Operation name (e.g., "create_index")
+
+    Returns:
+        Calls in execution order, the call at position i is the one
+        find_operation() returns for target_index=i
+    """
+    calls_by_name = _OPERATION_CALLS.get(upgrade_func)
+    if calls_by_name is None:
+        calls_by_name = {}
+
+        def collect(call: ast.Call, batch_context: dict[str, str]) -> bool:
+            func = call.func
+            if (
+                isinstance(func, ast.Attribute)
+                and isinstance(func.value, ast.Name)
+                and (func.value.id == "op" or func.value.id in batch_context)
+            ):
+                calls_by_name.setdefault(func.attr, []).append(call)
+            # Never report a match, so the whole function is searched
+            return False
+
+        _find_in_stmts(upgrade_func.body, 0, collect, {})
+        _OPERATION_CALLS[upgrade_func] = calls_by_name
+    return calls_by_name.get(operation_name, [])
+
+
+def find_operation_at_line(
+    upgrade_func: ast.FunctionDef,
+    lineno: int,
+    is_target: Callable[[ast.Call, dict[str, str]], bool],
+    col_offset: Optional[int] = None,
+) -> tuple[Optional[ast.Call], Optional[int]]:
+    """
+    Finds migration operation call starting at the source location.
+
+    Only the top-level upgrade() statements spanning the line are searched.
+    Statements without location (added by fixes) are skipped.
+
+    Args:
+        upgrade_func: upgrade() function
+        lineno: Line of the operation call in migration source
+        is_target: Checks if the call is the target operation (see find_operation())
+        col_offset: Column of the operation call in the line (optional),
+            identifies the call when the line has several operations
+
+    Returns:
+        Tuple (call, stmt_index), (None, None) if there is no matching call at the location
+        or there are several of them (e.g., `op.create_index(...); op.create_index(...)`
+        without col_offset), so the location doesn't identify the operation
+    """
+
+    def is_target_at_line(call: ast.Call, batch_context: dict[str, str]) -> bool:
+        return call.lineno == lineno and (col_offset is None or call.col_offset == col_offset) and is_target(call, batch_context)
+
+    found: Optional[ast.Call] = None
+    found_stmt_index: Optional[int] = None
+    for stmt_index, stmt in enumerate(upgrade_func.body):
+        end_lineno = getattr(stmt, "end_lineno", None)
+        if end_lineno is None or end_lineno < lineno:
+            continue
+        if stmt.lineno > lineno:
+            break
+        # Up to two matches are looked for, the second one makes the line ambiguous
+        for skip in (0, 1):
+            call = _find_in_stmts([stmt], skip, is_target_at_line, {})[0]
+            if call is None:
+                break
+            if found is not None:
+                return None, None
+            found, found_stmt_index = call, stmt_index
+    return found, found_stmt_index
+
+
+def _find_in_stmts(
+    stmts: list[ast.stmt],
+    remaining: int,
+    is_target: Callable[[ast.Call, dict[str, str]], bool],
+    batch_context: dict[str, str],
+) -> tuple[Optional[ast.Call], int]:
+    """
+    Looks for the target operation in statements.
+
+    Args:
+        stmts: Statements to search
+        remaining: Number of matching operations to skip before the target one
+        is_target: Checks if the call is the target operation
+        batch_context: Batch variables of enclosing batch_alter_table blocks
+
+    Returns:
+        Tuple (found_call, remaining), remaining is decreased by the number of skipped operations
+    """
+    for stmt in stmts:
+        found: Optional[ast.Call] = None
+        if isinstance(stmt, ast.Expr):
+            call = stmt.value
+            if isinstance(call, ast.Call) and is_target(call, batch_context):
+                if remaining == 0:
+                    return call, remaining
+                remaining -= 1
+        elif isinstance(stmt, ast.With):
+            batch = _get_batch_alter_table(stmt)
+            if batch is not None:
+                batch_var, table_name = batch
+                batch_context[batch_var] = table_name
+            found, remaining = _find_in_stmts(stmt.body, remaining, is_target, batch_context)
+            if batch is not None:
+                batch_context.pop(batch_var, None)
+        else:
+            # Compound statements (if/for/try/...): walk nested statement lists
+            for field in ("body", "handlers", "orelse", "finalbody"):
+                nested = getattr(stmt, field, None)
+                if not nested:
+                    continue
+                if field == "handlers":
+                    for handler in nested:
+                        found, remaining = _find_in_stmts(handler.body, remaining, is_target, batch_context)
+                        if found is not None:
+                            break
+                else:
+                    found, remaining = _find_in_stmts(nested, remaining, is_target, batch_context)
+                if found is not None:
+                    break
+        if found is not None:
+            return found, remaining
+    return None, remaining
+
+
+def is_operation_call(call: ast.Call, operation_name: str, batch_context: dict[str, str]) -> bool:
+    """
+    Checks if the call is op.<operation_name>(...) or batch_op.<operation_name>(...).
+
+    Args:
+        call: Function call
+        operation_name: Operation name (e.g., "add_column", "create_index")
+        batch_context: Batch variables of enclosing batch_alter_table blocks
+
+    Returns:
+        True if the call is the operation
+    """
+    func = call.func
+    if not isinstance(func, ast.Attribute) or func.attr != operation_name:
+        return False
+    value = func.value
+    return isinstance(value, ast.Name) and (value.id == "op" or value.id in batch_context)
+
+
+def _get_batch_alter_table(node: ast.With) -> Optional[tuple[str, str]]:
+    """Returns (batch_var, table_name) of `with op.batch_alter_table(...) as batch_var` block."""
+    for item in node.items:
+        context_expr = item.context_expr
+        if (
+            isinstance(context_expr, ast.Call)
+            and isinstance(context_expr.func, ast.Attribute)
+            and isinstance(context_expr.func.value, ast.Name)
+            and context_expr.func.value.id == "op"
+            and context_expr.func.attr == "batch_alter_table"
+        ):
+            # Extract table name from first argument
+            table_name = _extract_table_name(context_expr.args[0] if context_expr.args else None)
+            if table_name and isinstance(item.optional_vars, ast.Name):
+                # Interned, so batch_context lookups of parsed names compare by identity
+                return sys.intern(item.optional_vars.id), table_name
+    return None
+
+
+def _extract_table_name(table_arg: Optional[ast.AST]) -> Optional[str]:
+    """Extracts table name from AST argument."""
+    if isinstance(table_arg, ast.Constant) and isinstance(table_arg.value, str):
+        return table_arg.value
+    return None
 
 
 class BaseOperationFinder(ast.NodeVisitor, ABC):
     """Base class for finding migration operations by index.
 
-    Eliminates duplication of operation search logic in various Finder classes.
+    Kept for compatibility, fixes use find_operation() directly.
     """
 
     def __init__(self, target_index: int, operation_name: str):
@@ -20,69 +266,41 @@ class BaseOperationFinder(ast.NodeVisitor, ABC):
             operation_name: Operation name to search for (e.g., "add_column", "create_index")
         """
         self.target_index = target_index
-        self.current_index = 0
         self.found_call: Optional[ast.Call] = None
         self.found_stmt_index: Optional[int] = None
         self.batch_context: dict[str, str] = {}  # batch_var -> table_name
         self.operation_name = operation_name
-        self._current_stmt_index: Optional[int] = None
-
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        """Processes the body of upgrade() function."""
-        for i, stmt in enumerate(node.body):
-            self._current_stmt_index = i
-            self.visit(stmt)
-        self._current_stmt_index = None
-
-    def visit_With(self, node: ast.With):
-        """Processes with-blocks (batch_alter_table)."""
-        for item in node.items:
-            if (
-                isinstance(item.context_expr, ast.Call)
-                and isinstance(item.context_expr.func, ast.Attribute)
-                and (
-                    isinstance(item.context_expr.func.value, ast.Name)
-                    and item.context_expr.func.value.id == "op"
-                    and item.context_expr.func.attr == "batch_alter_table"
-                )
-            ):
-                # Extract table name from first argument
-                table_name = self._extract_table_name(item.context_expr.args[0] if item.context_expr.args else None)
-
-                if table_name and item.optional_vars is not None and isinstance(item.optional_vars, ast.Name):
-                    # Save batch_var -> table mapping
-                    batch_var = item.optional_vars.id
-                    self.batch_context[batch_var] = table_name
 
-                    # Process with-block body
-                    for stmt in node.body:
-                        self.visit(stmt)
+    def visit(self, node: ast.AST):
+        """
+        Searches functions in the node without NodeVisitor method dispatch.
 
-                    # Remove from context after exiting the block
-                    if batch_var in self.batch_context:
-                        del self.batch_context[batch_var]
+        Functions are found with an explicit stack, nested functions are
+        not searched. Search stops at the first function containing the operation.
+        Only statement blocks are walked, expressions can't contain function definitions.
+        """
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, ast.FunctionDef):
+                self.visit_FunctionDef(current)
+                if self.found_call is not None:
                     return
+                continue
+            # Reversed to search functions in source order
+            for field in reversed(_BLOCK_FIELDS):
+                nested = getattr(current, field, None)
+                if nested:
+                    stack.extend(reversed(nested))
 
-        # Regular with-block, process as usual
-        self.generic_visit(node)
-
-    def visit_Expr(self, node: ast.Expr):
-        """Processes expressions (function calls)."""
-        if isinstance(node.value, ast.Call):
-            self.visit_Call(node.value)
-
-    def visit_Call(self, node: ast.Call):
-        """Processes function calls."""
-        # Check if this is the target operation
-        if self._is_target_operation(node):
-            if self.current_index == self.target_index:
-                self.found_call = node
-                self.found_stmt_index = self._current_stmt_index
-                return
-            self.current_index += 1
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        """Processes the body of upgrade() function."""
+        self.found_call, self.found_stmt_index = find_operation(node, self.target_index, self._is_target)
 
-        # Continue traversal
-        self.generic_visit(node)
+    def _is_target(self, node: ast.Call, batch_context: dict[str, str]) -> bool:
+        """Adapts _is_target_operation() to find_operation()."""
+        self.batch_context = batch_context
+        return self._is_target_operation(node)
 
     @abstractmethod
     def _is_target_operation(self, node: ast.Call) -> bool:
@@ -105,15 +323,4 @@ class BaseOperationFinder(ast.NodeVisitor, ABC):
         Returns:
             Table name or None
         """
-        if table_arg is None:
-            return None
-
-        if isinstance(table_arg, ast.Constant):
-            if isinstance(table_arg.value, str):
-                return table_arg.value
-        elif hasattr(ast, "Str") and isinstance(table_arg, ast.Str):  # Python < 3.8
-            if isinstance(table_arg.s, str):
-                return table_arg.s
-            return None
-
-        return None
+        return _extract_table_name(table_arg)
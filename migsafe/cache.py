@@ -0,0 +1,156 @@
+"""On-disk cache of migration analysis results."""
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from . import __version__
+from .base import AnalyzerResult
+
+if TYPE_CHECKING:
+    from .rules.rule_engine import RuleEngine
+
+logger = logging.getLogger(__name__)
+
+
+def _file_state(file_path: str) -> str:
+    """Returns path, modification time and size of the file, changing when the file is edited."""
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        return f"{file_path}:missing"
+    return f"{file_path}:{stat_result.st_mtime_ns}:{stat_result.st_size}"
+
+
+def _class_source_file(cls: type) -> Optional[str]:
+    """Returns absolute path of the file defining the class, None if it is unknown."""
+    try:
+        return os.path.abspath(inspect.getfile(cls))
+    except (TypeError, OSError):
+        return None
+
+
+def _rules_fingerprint(plugins_config: Optional[dict[str, Any]], rule_engine: Optional["RuleEngine"]) -> list[str]:
+    """
+    Describes the rules the results are produced with.
+
+    Includes the loaded plugins (name, version) and the state of source files of
+    the loaded rules and plugins and of all modules in plugin directories,
+    so editing a plugin invalidates the cache.
+    """
+    fingerprint = []
+    source_files = set()
+    if rule_engine is not None:
+        for plugin in rule_engine.get_plugins():
+            fingerprint.append(f"plugin:{plugin.name}:{plugin.version}")
+            source_files.add(_class_source_file(type(plugin)))
+        for rule in rule_engine.get_rules():
+            rule_class = type(rule)
+            fingerprint.append(f"rule:{rule_class.__module__}.{rule_class.__qualname__}")
+            source_files.add(_class_source_file(rule_class))
+    for directory in (plugins_config or {}).get("directories", []):
+        # Relative directories are resolved, the same name may point to other plugins in another project
+        directory_path = os.path.abspath(directory)
+        fingerprint.append(f"directory:{directory_path}")
+        try:
+            with os.scandir(directory_path) as entries:
+                source_files.update(entry.path for entry in entries if entry.name.endswith(".py"))
+        except OSError:
+            pass
+    fingerprint.extend(_file_state(file_path) for file_path in sorted(path for path in source_files if path))
+    return fingerprint
+
+
+class AnalysisCache:
+    """
+    Cache of analysis results keyed by file content.
+
+    Results are stored as JSON under <cache_dir>/<first 2 hex chars>/<rest>.json.
+    Keys include the migsafe version, plugin configuration and the loaded
+    rules and plugins with the state of their source files,
+    so results of other or edited rule sets are never returned.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        plugins_config: Optional[dict[str, Any]] = None,
+        rule_engine: Optional["RuleEngine"] = None,
+    ):
+        """
+        Initializes cache.
+
+        Args:
+            cache_dir: Cache directory, created on first write
+            plugins_config: Plugin configuration the results are produced with
+            rule_engine: Rule engine the results are produced with (optional)
+        """
+        self.cache_dir = Path(cache_dir)
+        rules = json.dumps([plugins_config or {}, _rules_fingerprint(plugins_config, rule_engine)], sort_keys=True, default=str)
+        self._rules_hash = hashlib.sha256(f"{__version__}\0{rules}".encode()).hexdigest()
+
+    def key(self, file_path: Path) -> Optional[str]:
+        """
+        Returns cache key of the file.
+
+        Args:
+            file_path: Path to migration file
+
+        Returns:
+            Key or None if the file can't be read
+        """
+        try:
+            content = file_path.read_bytes()
+        except OSError:
+            return None
+        digest = hashlib.sha256(self._rules_hash.encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key[2:]}.json"
+
+    def get(self, key: str) -> Optional[AnalyzerResult]:
+        """
+        Returns cached result.
+
+        Args:
+            key: Cache key (see key())
+
+        Returns:
+            Analysis result or None if not cached
+        """
+        try:
+            return AnalyzerResult.model_validate_json(self._entry_path(key).read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, result: AnalyzerResult) -> None:
+        """
+        Stores result in the cache.
+
+        Write errors are logged and ignored, the cache is an optimization only.
+
+        Args:
+            key: Cache key (see key())
+            result: Analysis result
+        """
+        entry_path = self._entry_path(key)
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            # Written to a temporary file first, so concurrent runs never read a partial entry
+            fd, tmp_name = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(result.model_dump_json())
+                os.replace(tmp_name, entry_path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError as e:
+            logger.debug(f"Failed to write analysis cache entry {entry_path}: {e}")
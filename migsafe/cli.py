@@ -1,27 +1,20 @@
 """CLI interface for migsafe."""
 
-import ast
-import difflib
 import fnmatch
 import io
+import itertools
 import logging
+import os
+import re
+import shutil
+import stat
 import sys
 import traceback
+from collections.abc import Iterable, Iterator
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, NamedTuple, Optional
-
-# UTF-8 setup for Windows (for correct output)
-if sys.platform == "win32":
-    try:
-        # Reinitialize stdout and stderr with UTF-8 encoding
-        if hasattr(sys.stdout, "buffer"):
-            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
-        if hasattr(sys.stderr, "buffer"):
-            sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
-    except (AttributeError, OSError):
-        # If reinitialization failed, ignore the error
-        pass
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional
 
 try:
     import click
@@ -31,34 +24,20 @@ except ImportError:
 import contextlib
 
 from . import __version__
-from .analyzers.alembic_analyzer import AlembicMigrationAnalyzer
-from .analyzers.django_analyzer import DjangoMigrationAnalyzer
-from .autofix import AutofixEngine
 from .base import AnalyzerResult
-from .config import apply_config_to_cli_params, load_config
-from .formatters import (
-    HtmlFormatter,
-    JsonFormatter,
-    JUnitFormatter,
-    SarifFormatter,
-    TextFormatter,
-)
-from .formatters.base import Formatter
-from .formatters.stats_csv_formatter import StatsCsvFormatter
-from .formatters.stats_json_formatter import StatsJsonFormatter
-from .formatters.stats_text_formatter import StatsTextFormatter
-from .history import (
-    FrequencyStats,
-    GitHistoryAnalyzer,
-    MigrationHistory,
-    MigrationTrendAnalyzer,
-    Pattern,
-    Statistics,
-)
+from .config import Config, apply_config_to_cli_params, load_config
 from .models import IssueSeverity
 from .sources import create_migration_source, detect_django_project, detect_migration_type, find_django_migration_directories
-from .stats import MigrationStats
-from .stats.recommendations import RecommendationsGenerator
+
+# Analyzers, autofix, formatters, Git history and statistics are imported
+# in the functions using them, so --help, --version and other commands don't load them
+if TYPE_CHECKING:
+    from .analyzers.alembic_analyzer import AlembicMigrationAnalyzer
+    from .analyzers.django_analyzer import DjangoMigrationAnalyzer
+    from .autofix import AutofixEngine
+    from .formatters.base import Formatter
+    from .history import FrequencyStats, MigrationHistory, Pattern, Statistics
+    from .rules.rule_engine import RuleEngine
 
 if click is None:
     raise ImportError("click is required for CLI. Install it with: pip install click")
@@ -86,9 +65,39 @@ class AutofixResult(NamedTuple):
     success: bool
     fixed_count: int
     unfixed_count: int
+    apply_to_all: bool = False  # User chose to apply fixes to all remaining files
+    quit: bool = False  # User chose to stop applying fixes
+
+
+def _require_path(path: str, is_dir: bool, not_found_message: str) -> Path:
+    """
+    Checks that a path given in options exists and has the expected type, exits with an error otherwise.
+
+    The path is checked with a single stat() call.
 
+    Args:
+        path: Path from command line options
+        is_dir: The path must be a directory, otherwise a regular file
+        not_found_message: Error shown if the path doesn't exist
 
-def _load_and_apply_config(config_path: Optional[str], cli_params: dict) -> dict:
+    Returns:
+        Path object of the path
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        click.echo(not_found_message, err=True)
+        sys.exit(1)
+    if is_dir and not stat.S_ISDIR(mode):
+        click.echo(f"❌ Path is not a directory: {path}", err=True)
+        sys.exit(1)
+    if not is_dir and not stat.S_ISREG(mode):
+        click.echo(f"❌ Path is not a file: {path}", err=True)
+        sys.exit(1)
+    return Path(path)
+
+
+def _load_and_apply_config(config_path: Optional[str], cli_params: dict) -> tuple[dict, Optional[Config]]:
     """
     Loads configuration and applies it to CLI parameters.
 
@@ -97,13 +106,13 @@ def _load_and_apply_config(config_path: Optional[str], cli_params: dict) -> dict
         cli_params: Dictionary of CLI parameters
 
     Returns:
-        Updated dictionary of parameters
+        Tuple (updated dictionary of parameters, loaded configuration or None)
 
     Raises:
         SystemExit: If configuration loading error occurred
     """
     if not config_path:
-        return cli_params
+        return cli_params, None
 
     try:
         config_obj = load_config(Path(config_path))
@@ -118,7 +127,7 @@ def _load_and_apply_config(config_path: Optional[str], cli_params: dict) -> dict
                 result[key] = updated_params[key]
 
         logger.info(f"Configuration loaded from {config_path}")
-        return result
+        return result, config_obj
     except Exception as e:
         error_msg = f"❌ Configuration loading error: {e}"
         click.echo(error_msg, err=True)
@@ -126,6 +135,77 @@ def _load_and_apply_config(config_path: Optional[str], cli_params: dict) -> dict
         sys.exit(1)
 
 
+# Directories of version control, virtual environments and tool caches, never searched for migrations
+_SKIPPED_DIRECTORIES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".venv",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".migsafe-cache",
+        "__pycache__",
+        "node_modules",
+    }
+)
+
+
+def _iter_py_files(directory: Path, recursive: bool = True, skip_private: bool = False) -> Iterator[Path]:
+    """
+    Yields Python files of a directory using os.scandir.
+
+    Directory entries cache their type, so no extra stat() calls are made.
+    Symlinked directories and subdirectories listed in _SKIPPED_DIRECTORIES are not searched.
+
+    Args:
+        directory: Directory to search
+        recursive: Also search subdirectories
+        skip_private: Skip files starting with "__" (e.g., __init__.py)
+
+    Yields:
+        Paths to Python files
+
+    Raises:
+        OSError: If the directory itself cannot be read. Unreadable
+            subdirectories are skipped with a warning.
+    """
+    root = str(directory)
+    pending = [root]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and entry.name not in _SKIPPED_DIRECTORIES:
+                            pending.append(entry.path)
+                    elif entry.name.endswith(PYTHON_FILE_EXTENSION) and entry.is_file():
+                        if skip_private and entry.name.startswith("__"):
+                            continue
+                        yield Path(entry.path)
+        except OSError as e:
+            if current is root:
+                raise
+            logger.warning(f"Error traversing directory {current}: {e}")
+
+
+def _sorted_unique_paths(paths: list[Path]) -> list[Path]:
+    """
+    Removes duplicate paths and sorts them the way Path objects compare.
+
+    Works on strings: hashing and comparing Path objects is several times slower.
+    The sort key is the one pathlib uses since Python 3.12 (parts of normcased path).
+    """
+    unique: dict[str, Path] = {}
+    for path in paths:
+        unique.setdefault(os.path.normcase(path), path)
+    return [unique[key] for key in sorted(unique, key=lambda key: key.split(os.sep))]
+
+
 def find_migration_files(paths: list[Path]) -> list[Path]:
     """
     Finds all migration files in the specified paths.
@@ -148,20 +228,15 @@ def find_migration_files(paths: list[Path]) -> list[Path]:
             django_dirs = find_django_migration_directories(current_dir)
             for dir_path in django_dirs:
                 try:
-                    # Search for migration files in the directory (usually start with digits)
-                    migration_files.extend(dir_path.glob("[0-9]*.py"))
-                    # Also add other .py files (e.g., __init__.py will be skipped later)
-                    migration_files.extend(dir_path.glob("*.py"))
+                    # Search for migration files in the directory, skip __init__.py and other service files
+                    migration_files.extend(_iter_py_files(dir_path, recursive=False, skip_private=True))
                 except PermissionError as e:
                     logger.warning(f"No access to directory {dir_path}: {e}")
                 except Exception as e:
                     logger.warning(f"Error traversing directory {dir_path}: {e}")
 
-            # Remove __init__.py and other service files
-            migration_files = [f for f in migration_files if f.name != "__init__.py" and not f.name.startswith("__")]
-
             if migration_files:
-                return sorted(set(migration_files))
+                return _sorted_unique_paths(migration_files)
         # If not a Django project, use the current directory as usual
         paths = [Path.cwd()]
 
@@ -178,13 +253,13 @@ def find_migration_files(paths: list[Path]) -> list[Path]:
         elif path_obj.is_dir():
             # Recursively search for all .py files
             try:
-                migration_files.extend(path_obj.rglob(f"*{PYTHON_FILE_EXTENSION}"))
+                migration_files.extend(_iter_py_files(path_obj))
             except PermissionError as e:
                 click.echo(f"⚠️  No access to directory {path_obj}: {e}", err=True)
             except Exception as e:
                 click.echo(f"⚠️  Error traversing directory {path_obj}: {e}", err=True)
 
-    return sorted(set(migration_files))  # Remove duplicates and sort
+    return _sorted_unique_paths(migration_files)  # Remove duplicates and sort
 
 
 def filter_django_migrations_by_app(migration_files: list[Path], app_name: str) -> list[Path]:
@@ -200,31 +275,63 @@ def filter_django_migrations_by_app(migration_files: list[Path], app_name: str)
     Returns:
         Filtered list of migration files
     """
+    return filter_django_migrations_by_apps(migration_files, {app_name})
+
+
+def filter_django_migrations_by_apps(migration_files: list[Path], app_names: set[str]) -> list[Path]:
+    """
+    Filters Django migrations by names of applications in one pass.
+
+    Django migrations are kept if they belong to any of the applications,
+    non-Django migrations are always kept.
+
+    Args:
+        migration_files: List of paths to migration files
+        app_names: Django application names for filtering
+
+    Returns:
+        Filtered list of migration files in original order
+    """
     filtered = []
     for file_path in migration_files:
-        # Check if this is a Django migration
-        migration_type = detect_migration_type(file_path)
-        if migration_type != "django":
-            # Non-Django migrations are always included
-            filtered.append(file_path)
-            continue
-
-        # For Django migrations, check the path
-        # Expected structure: <app_name>/migrations/*.py
+        # Expected structure of Django migrations: <app_name>/migrations/*.py
         parts = file_path.parts
-        try:
-            # Look for pattern: .../app_name/migrations/...
-            for i, part in enumerate(parts):
-                if part == app_name and i + 1 < len(parts) and parts[i + 1] == "migrations":
-                    filtered.append(file_path)
-                    break
-        except (IndexError, AttributeError):
-            # If unable to determine, include the file
+        if any(parts[i] in app_names and parts[i + 1] == "migrations" for i in range(len(parts) - 1)):
+            filtered.append(file_path)
+        # Content is parsed only for files outside of the applications
+        elif detect_migration_type(file_path) != "django":
+            # Non-Django migrations are always included
             filtered.append(file_path)
 
     return filtered
 
 
+class _ExcludeMatcher:
+    """Exclude patterns compiled once for checking many files."""
+
+    __slots__ = ("patterns", "regex")
+
+    def __init__(self, exclude_patterns: list[str]):
+        """
+        Compiles exclude patterns.
+
+        Args:
+            exclude_patterns: List of patterns for exclusion
+        """
+        self.patterns = tuple(exclude_patterns)
+        # Patterns with "*" are also matched as wildcards against the whole path
+        wildcards = [fnmatch.translate(os.path.normcase(pattern)) for pattern in self.patterns if "*" in pattern]
+        self.regex = re.compile("|".join(wildcards)) if wildcards else None
+
+    def excluded(self, file_path: Path) -> bool:
+        """Checks if the file matches any of the patterns."""
+        file_str = str(file_path)
+        # Simple check: if pattern is contained in the path
+        if any(pattern in file_str for pattern in self.patterns):
+            return True
+        return self.regex is not None and self.regex.match(os.path.normcase(file_str)) is not None
+
+
 def should_exclude_file(file_path: Path, exclude_patterns: list[str]) -> bool:
     """
     Checks if a file should be excluded by patterns.
@@ -238,17 +345,7 @@ def should_exclude_file(file_path: Path, exclude_patterns: list[str]) -> bool:
     """
     if not exclude_patterns:
         return False
-
-    file_str = str(file_path)
-    for pattern in exclude_patterns:
-        # Simple check: if pattern is contained in the path
-        if pattern in file_str:
-            return True
-        # Support for simple wildcards
-        if "*" in pattern and fnmatch.fnmatch(file_str, pattern):
-            return True
-
-    return False
+    return _ExcludeMatcher(exclude_patterns).excluded(file_path)
 
 
 def handle_analysis_error(file_path: Path, error: Exception, verbose: bool = False) -> None:
@@ -280,23 +377,181 @@ def handle_analysis_error(file_path: Path, error: Exception, verbose: bool = Fal
         # Handle analysis errors (parsing, validation, etc.)
         error_msg = f"❌ Error analyzing {file_path}: {error}"
         click.echo(error_msg, err=True)
-        logger.warning(error_msg, exc_info=verbose)
+        logger.warning(error_msg, exc_info=error if verbose else None)
         if verbose:
-            traceback.print_exc()
+            traceback.print_exception(type(error), error, error.__traceback__)
     elif isinstance(error, OSError):
         # Handle filesystem errors
         error_msg = f"❌ Filesystem error analyzing {file_path}: {error}"
         click.echo(error_msg, err=True)
-        logger.error(error_msg, exc_info=True)
+        logger.error(error_msg, exc_info=error)
     else:
         # Handle unexpected errors, but don't catch system exceptions
         if isinstance(error, (KeyboardInterrupt, SystemExit)):
             raise
         error_msg = f"❌ Unexpected error analyzing {file_path}: {error}"
         click.echo(error_msg, err=True)
-        logger.exception(error_msg)
+        logger.error(error_msg, exc_info=error)
         if verbose:
-            traceback.print_exc()
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+
+# Smaller file lists are analyzed serially, starting worker processes costs more than it saves
+_PARALLEL_MIN_FILES = 8
+
+# Alembic and Django analyzers
+_Analyzers = tuple["AlembicMigrationAnalyzer", "DjangoMigrationAnalyzer"]
+
+# Analyzers of a worker process, created by _init_analysis_worker()
+_WORKER_ANALYZERS: Optional[_Analyzers] = None
+
+
+def _create_rule_engine(plugins_config: Optional[dict[str, Any]]) -> "RuleEngine":
+    """Creates RuleEngine with default rules and plugin support."""
+    from .rules.rule_engine import RuleEngine
+
+    config = {"plugins": plugins_config} if plugins_config else None
+    return RuleEngine.with_default_rules(config)
+
+
+def _create_analyzers(plugins_config: Optional[dict[str, Any]], rule_engine: Optional["RuleEngine"] = None) -> _Analyzers:
+    """Creates Alembic and Django analyzers sharing a RuleEngine with plugin support."""
+    from .analyzers.alembic_analyzer import AlembicMigrationAnalyzer
+    from .analyzers.django_analyzer import DjangoMigrationAnalyzer
+
+    if rule_engine is None:
+        rule_engine = _create_rule_engine(plugins_config)
+    return AlembicMigrationAnalyzer(rule_engine=rule_engine), DjangoMigrationAnalyzer(rule_engine=rule_engine)
+
+
+def _analyze_file(file_path: Path, analyzers: _Analyzers) -> AnalyzerResult:
+    """Analyzes a migration file with the analyzer of its migration type."""
+    alembic_analyzer, django_analyzer = analyzers
+    source = create_migration_source(file_path)
+    analyzer = django_analyzer if source.get_type() == "django" else alembic_analyzer
+    return analyzer.analyze(source)
+
+
+def _init_analysis_worker(plugins_config: Optional[dict[str, Any]]) -> None:
+    """Creates analyzers once per worker process."""
+    global _WORKER_ANALYZERS
+    _WORKER_ANALYZERS = _create_analyzers(plugins_config)
+
+
+def _analyze_file_in_worker(file_path: Path) -> tuple[Optional[AnalyzerResult], Optional[Exception]]:
+    """
+    Analyzes a migration file in a worker process.
+
+    Returns:
+        Tuple (analysis_result, error), the error is replaced with RuntimeError
+        if it can't be sent back to the main process
+    """
+    import pickle
+
+    assert _WORKER_ANALYZERS is not None
+    try:
+        return _analyze_file(file_path, _WORKER_ANALYZERS), None
+    except Exception as e:
+        try:
+            pickle.dumps(e)
+        except Exception:
+            return None, RuntimeError(f"{type(e).__name__}: {e}")
+        return None, e
+
+
+def iter_analysis(
+    files: list[Path],
+    exclude_patterns: Optional[list[str]] = None,
+    verbose: bool = False,
+    plugins_config: Optional[dict[str, Any]] = None,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[tuple[Path, Optional[AnalyzerResult], Optional[Exception]]]:
+    """
+    Analyzes migration files, yielding results as files are analyzed.
+
+    Large file lists are analyzed in worker processes, one per CPU.
+    With verbose=True files are analyzed serially, so error tracebacks are available.
+
+    Args:
+        files: List of paths to migration files
+        exclude_patterns: Patterns for excluding files
+        verbose: Analyze files serially
+        plugins_config: Plugin configuration (optional)
+        cache_dir: Directory of the analysis cache, unchanged files are not analyzed again (optional)
+
+    Yields:
+        Tuples (file_path, analysis_result, error) in file order,
+        analysis_result is None if analysis raised the error
+    """
+    # Check exclusions
+    if exclude_patterns:
+        exclude_matcher = _ExcludeMatcher(exclude_patterns)
+        files = [file_path for file_path in files if not exclude_matcher.excluded(file_path)]
+
+    if cache_dir is None:
+        yield from _iter_uncached_analysis(files, verbose, plugins_config)
+        return
+
+    from .cache import AnalysisCache
+
+    # Rules are loaded before reading the cache, keys depend on the loaded rules and plugins
+    rule_engine = _create_rule_engine(plugins_config)
+    cache = AnalysisCache(cache_dir, plugins_config, rule_engine)
+    keys: dict[Path, str] = {}
+    cached: dict[Path, AnalyzerResult] = {}
+    for file_path in files:
+        key = cache.key(file_path)
+        if key is None:
+            continue
+        keys[file_path] = key
+        cached_result = cache.get(key)
+        if cached_result is not None:
+            cached[file_path] = cached_result
+
+    # Only changed files are analyzed, cached results are yielded in file order between them
+    analysis = _iter_uncached_analysis(
+        [file_path for file_path in files if file_path not in cached], verbose, plugins_config, rule_engine
+    )
+    for file_path in files:
+        if file_path in cached:
+            yield file_path, cached[file_path], None
+            continue
+        file_path, result, error = next(analysis)
+        if result is not None and file_path in keys:
+            cache.put(keys[file_path], result)
+        yield file_path, result, error
+
+
+def _iter_uncached_analysis(
+    files: list[Path], verbose: bool, plugins_config: Optional[dict[str, Any]], rule_engine: Optional["RuleEngine"] = None
+) -> Iterator[tuple[Path, Optional[AnalyzerResult], Optional[Exception]]]:
+    """Analyzes migration files in worker processes or serially, see iter_analysis()."""
+    done = 0
+    workers = min(os.cpu_count() or 1, len(files) // _PARALLEL_MIN_FILES)
+    if workers > 1 and not verbose:
+        # Imported only for large runs, multiprocessing takes a while to import
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_analysis_worker, initargs=(plugins_config,)
+            ) as executor:
+                chunksize = max(1, len(files) // (4 * workers))
+                for file_path, (result, error) in zip(files, executor.map(_analyze_file_in_worker, files, chunksize=chunksize)):
+                    done += 1
+                    yield file_path, result, error
+            return
+        except (OSError, NotImplementedError, BrokenProcessPool) as e:
+            # Process pools are unavailable on some platforms and sandboxes
+            logger.debug(f"Parallel analysis is unavailable, analyzing serially: {e}")
+
+    analyzers = _create_analyzers(plugins_config, rule_engine)
+    for file_path in files[done:]:
+        try:
+            yield file_path, _analyze_file(file_path, analyzers), None
+        except Exception as e:
+            yield file_path, None, e
 
 
 def analyze_files(
@@ -304,6 +559,7 @@ def analyze_files(
     exclude_patterns: Optional[list[str]] = None,
     verbose: bool = False,
     plugins_config: Optional[dict[str, Any]] = None,
+    cache_dir: Optional[Path] = None,
 ) -> tuple[list[tuple[Path, AnalyzerResult]], int]:
     """
     Analyzes a list of migration files.
@@ -313,6 +569,7 @@ def analyze_files(
         exclude_patterns: Patterns for excluding files
         verbose: Show detailed error information
         plugins_config: Plugin configuration (optional)
+        cache_dir: Directory of the analysis cache (optional)
 
     Returns:
         Tuple (list of tuples (file_path, analysis_result), error_count)
@@ -320,45 +577,20 @@ def analyze_files(
     results = []
     error_count = 0
 
-    # Create RuleEngine with plugin support
-    from .rules.rule_engine import RuleEngine
-
-    config = {"plugins": plugins_config} if plugins_config else None
-    rule_engine = RuleEngine.with_default_rules(config)
-
-    # Create analyzers for both migration types
-    alembic_analyzer = AlembicMigrationAnalyzer(rule_engine=rule_engine)
-    django_analyzer = DjangoMigrationAnalyzer(rule_engine=rule_engine)
-
-    for file_path in files:
-        # Check exclusions
-        if exclude_patterns and should_exclude_file(file_path, exclude_patterns):
-            continue
-
-        try:
-            # Create appropriate migration source
-            source = create_migration_source(file_path)
-            migration_type = source.get_type()
-
-            # Select appropriate analyzer
-            from typing import Union
-
-            analyzer: Union[AlembicMigrationAnalyzer, DjangoMigrationAnalyzer]
-            analyzer = django_analyzer if migration_type == "django" else alembic_analyzer
-
-            result = analyzer.analyze(source)
-            results.append((file_path, result))
-        except Exception as e:
+    for file_path, result, error in iter_analysis(files, exclude_patterns, verbose, plugins_config, cache_dir):
+        if error is not None:
             # Use unified error handling
-            handle_analysis_error(file_path, e, verbose)
+            handle_analysis_error(file_path, error, verbose)
             error_count += 1
+        elif result is not None:
+            results.append((file_path, result))
 
     return results, error_count
 
 
 def get_formatter(
     format_name: str, min_severity: Optional[IssueSeverity], no_color: bool, verbose: bool, quiet: bool
-) -> Formatter:
+) -> "Formatter":
     """
     Creates a formatter by name.
 
@@ -372,6 +604,8 @@ def get_formatter(
     Returns:
         Formatter instance
     """
+    from .formatters import HtmlFormatter, JsonFormatter, JUnitFormatter, SarifFormatter, TextFormatter
+
     formatter_classes: dict[str, type] = {
         FORMAT_TEXT: TextFormatter,
         FORMAT_JSON: JsonFormatter,
@@ -416,9 +650,11 @@ def create_backup(file_path: Path) -> Optional[Path]:
     """
     try:
         # Check that the file exists and is not empty
-        if not file_path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-        if file_path.stat().st_size == 0:
+        try:
+            file_stat = file_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+        if file_stat.st_size == 0:
             logger.warning(f"File is empty: {file_path}")
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -428,7 +664,8 @@ def create_backup(file_path: Path) -> Optional[Path]:
         if backup_path.exists():
             backup_path = file_path.with_suffix(f"{file_path.suffix}.{timestamp}_1{BACKUP_SUFFIX}")
 
-        backup_path.write_text(file_path.read_text(encoding=DEFAULT_ENCODING), encoding=DEFAULT_ENCODING)
+        # Byte copy: keeps encoding and line endings of the original
+        shutil.copy2(file_path, backup_path)
         logger.info(f"Backup created for {file_path} -> {backup_path}")
         return backup_path
     except Exception as e:
@@ -436,6 +673,34 @@ def create_backup(file_path: Path) -> Optional[Path]:
         return None
 
 
+def write_output_file(output_path: Path, chunks: Iterable[str]) -> None:
+    """
+    Writes output chunks to a file, creating its directory if it doesn't exist.
+
+    Args:
+        output_path: Path to the output file
+        chunks: Chunks of output text
+
+    Raises:
+        OSError: If the file can't be written
+    """
+    try:
+        output_file = output_path.open("w", encoding=DEFAULT_ENCODING)
+    except FileNotFoundError:
+        # Directory is created only when it is missing
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_file = output_path.open("w", encoding=DEFAULT_ENCODING)
+    with output_file:
+        output_file.writelines(chunks)
+
+
+def _echo_chunks(chunks: Iterable[str]) -> None:
+    """Writes output chunks to stdout as they are produced, followed by a newline."""
+    for chunk in chunks:
+        click.echo(chunk, nl=False)
+    click.echo()
+
+
 def show_diff(original: str, fixed: str, file_path: Path) -> None:
     """
     Shows diff between original and fixed code.
@@ -445,21 +710,27 @@ def show_diff(original: str, fixed: str, file_path: Path) -> None:
         fixed: Fixed code
         file_path: Path to the file
     """
+    import difflib
+
     original_lines = original.splitlines(keepends=True)
     fixed_lines = fixed.splitlines(keepends=True)
 
     diff = difflib.unified_diff(original_lines, fixed_lines, fromfile=str(file_path), tofile=str(file_path), lineterm="")
 
     click.echo("\n📝 Changes in file:")
+    # Lines are collected and written at once, click strips colors if stderr is not a terminal
+    lines = []
     for line in diff:
-        if line.startswith("---") or line.startswith("+++") or line.startswith("@@"):
-            click.echo(line, err=True)
+        if line.startswith(("---", "+++", "@@")):
+            lines.append(line)
         elif line.startswith("+"):
-            click.echo(click.style(line, fg="green"), err=True)
+            lines.append(click.style(line, fg="green"))
         elif line.startswith("-"):
-            click.echo(click.style(line, fg="red"), err=True)
+            lines.append(click.style(line, fg="red"))
         else:
-            click.echo(line, err=True)
+            lines.append(line)
+    if lines:
+        click.echo("\n".join(lines), err=True)
 
 
 def validate_python_code(code: str) -> bool:
@@ -473,13 +744,23 @@ def validate_python_code(code: str) -> bool:
         True if the code is valid
     """
     try:
-        ast.parse(code)
+        # Compiled without building Python AST objects, also finds errors
+        # reported by the compiler (e.g. 'return' outside function)
+        compile(code, "<fixed>", "exec", dont_inherit=True)
         return True
     except SyntaxError as e:
         click.echo(f"❌ Syntax error in fixed code: {e}", err=True)
         return False
 
 
+@lru_cache(maxsize=1)
+def _default_autofix_engine() -> "AutofixEngine":
+    """Returns AutofixEngine with default fixes shared by all files, fixes keep no state between calls."""
+    from .autofix import AutofixEngine
+
+    return AutofixEngine.with_default_fixes()
+
+
 def apply_autofix_to_file(
     file_path: Path,
     result: AnalyzerResult,
@@ -489,6 +770,7 @@ def apply_autofix_to_file(
     dry_run: bool = False,
     original_file_mtime: Optional[float] = None,
     verbose: bool = False,
+    skip_apply_prompt: bool = False,
 ) -> AutofixResult:
     """
     Applies automatic fixes to a migration file.
@@ -502,6 +784,8 @@ def apply_autofix_to_file(
         dry_run: Only show fixes without applying
         original_file_mtime: File modification time at analysis moment (for change checking)
         verbose: Show detailed error information
+        skip_apply_prompt: Apply without asking, fixes were confirmed for all remaining files.
+            Unlike yes, confirmation to continue without backup is still requested.
 
     Returns:
         AutofixResult with fix application results
@@ -521,7 +805,7 @@ def apply_autofix_to_file(
             pass
 
     # Filter only fixable issues
-    autofix_engine = AutofixEngine.with_default_fixes()
+    autofix_engine = _default_autofix_engine()
     fixable_issues = [issue for issue in result.issues if autofix_engine.get_applicable_fixes(issue)]
 
     if not fixable_issues:
@@ -529,15 +813,6 @@ def apply_autofix_to_file(
             click.echo(f"ℹ️  No fixable issues for file {file_path}.", err=True)
         return AutofixResult(success=True, fixed_count=0, unfixed_count=len(result.issues))
 
-    # Check that the file is not empty before reading
-    try:
-        if file_path.stat().st_size == 0:
-            click.echo(f"⚠️  File is empty: {file_path}", err=True)
-            return AutofixResult(success=False, fixed_count=0, unfixed_count=len(result.issues))
-    except OSError as e:
-        click.echo(f"❌ Error checking file {file_path}: {e}", err=True)
-        return AutofixResult(success=False, fixed_count=0, unfixed_count=len(result.issues))
-
     # Read source code
     try:
         original_code = file_path.read_text(encoding=DEFAULT_ENCODING)
@@ -545,6 +820,11 @@ def apply_autofix_to_file(
         click.echo(f"❌ Error reading file {file_path}: {e}", err=True)
         return AutofixResult(success=False, fixed_count=0, unfixed_count=len(fixable_issues))
 
+    # Check that the file is not empty, without another stat() call
+    if not original_code:
+        click.echo(f"⚠️  File is empty: {file_path}", err=True)
+        return AutofixResult(success=False, fixed_count=0, unfixed_count=len(result.issues))
+
     # Apply fixes
     try:
         fixed_code, fixed_issues, unfixed_issues = autofix_engine.apply_fixes(
@@ -572,10 +852,20 @@ def apply_autofix_to_file(
         click.echo(f"ℹ️  Fixes for {file_path} (dry-run, not applied)", err=True)
         return AutofixResult(success=True, fixed_count=len(fixed_issues), unfixed_count=len(unfixed_issues))
 
-    # Request confirmation
-    if not yes and not click.confirm(f"\n❓ Apply fixes to {file_path}?"):
-        click.echo(f"⏭️  Skipped: {file_path}", err=True)
-        return AutofixResult(success=True, fixed_count=0, unfixed_count=len(fixable_issues))
+    # Request confirmation: yes, no, all remaining files, quit
+    apply_to_all = False
+    if not yes and not skip_apply_prompt:
+        answer = click.prompt(
+            f"\n❓ Apply fixes to {file_path}? (y)es, (n)o, (a)ll remaining files, (q)uit",
+            default="y",
+            type=click.Choice(["y", "n", "a", "q"], case_sensitive=False),
+            show_choices=False,
+        ).lower()
+        if answer in ("n", "q"):
+            click.echo(f"⏭️  Skipped: {file_path}", err=True)
+            return AutofixResult(success=True, fixed_count=0, unfixed_count=len(fixable_issues), quit=answer == "q")
+        if answer == "a":
+            apply_to_all = True
 
     # Create backup
     backup_path = None
@@ -586,16 +876,18 @@ def apply_autofix_to_file(
         else:
             click.echo(f"⚠️  Failed to create backup for {file_path}", err=True)
             if not yes and not click.confirm("Continue without backup?"):
-                return AutofixResult(success=False, fixed_count=0, unfixed_count=len(fixable_issues))
+                return AutofixResult(success=False, fixed_count=0, unfixed_count=len(fixable_issues), apply_to_all=apply_to_all)
 
     # Apply fixes
     try:
         file_path.write_text(fixed_code, encoding=DEFAULT_ENCODING)
-        click.echo(f"✅ Fixes applied to {file_path}", err=True)
-        click.echo(f"   Fixed issues: {len(fixed_issues)}", err=True)
+        applied_lines = [f"✅ Fixes applied to {file_path}", f"   Fixed issues: {len(fixed_issues)}"]
         if unfixed_issues:
-            click.echo(f"   Unfixed issues: {len(unfixed_issues)}", err=True)
-        return AutofixResult(success=True, fixed_count=len(fixed_issues), unfixed_count=len(unfixed_issues))
+            applied_lines.append(f"   Unfixed issues: {len(unfixed_issues)}")
+        click.echo("\n".join(applied_lines), err=True)
+        return AutofixResult(
+            success=True, fixed_count=len(fixed_issues), unfixed_count=len(unfixed_issues), apply_to_all=apply_to_all
+        )
     except Exception as e:
         click.echo(f"❌ Error writing fixed code to {file_path}: {e}", err=True)
         return AutofixResult(success=False, fixed_count=0, unfixed_count=len(fixable_issues))
@@ -613,11 +905,13 @@ def _run_analysis(
     config: Optional[str],
     exclude: tuple,
     plugins_config: Optional[dict[str, Any]] = None,
+    plugins_dir: Optional[str] = None,
     autofix: bool = False,
     apply: bool = False,
     yes: bool = False,
     no_backup: bool = False,
     django_app: Optional[tuple] = None,
+    cache_dir: Optional[str] = None,
 ) -> int:
     """
     Common logic for analyze and lint commands.
@@ -633,6 +927,9 @@ def _run_analysis(
         no_color: Disable colored output
         config: Path to configuration file
         exclude: Patterns for excluding files
+        plugins_config: Plugin configuration, overrides the one from config
+        plugins_dir: Plugins directory added to plugin configuration
+        cache_dir: Directory of the analysis cache
 
     Returns:
         Exit code (0 or 1)
@@ -647,7 +944,7 @@ def _run_analysis(
         "no_color": no_color,
         "exit_code": exit_code,
     }
-    updated_params = _load_and_apply_config(config, cli_params)
+    updated_params, config_obj = _load_and_apply_config(config, cli_params)
 
     # Update local variables from updated parameters
     exclude = updated_params.get("exclude", exclude)
@@ -681,45 +978,66 @@ def _run_analysis(
     if django_app:
         # django_app can be a tuple if specified multiple times
         # Collect results from all applications as a union, not intersection
-        filtered_files = []
-        for app_name in django_app:
-            app_files = filter_django_migrations_by_app(migration_files, app_name)
-            filtered_files.extend(app_files)
-        # Remove duplicates and preserve order
-        migration_files = list(dict.fromkeys(filtered_files))
+        migration_files = filter_django_migrations_by_apps(migration_files, set(django_app))
 
     if not migration_files:
         click.echo("❌ Migration files not found.", err=True)
         return 1
 
-    # Use provided plugin configuration or load from config
+    # Use provided plugin configuration or the one from config, with --plugins-dir added
     final_plugins_config = plugins_config
-    if not final_plugins_config and config:
-        try:
-            config_obj = load_config(Path(config))
-            if config_obj.plugins:
-                final_plugins_config = config_obj.plugins
-        except Exception as e:
-            logger.warning(f"Failed to load plugin configuration: {e}")
-
-    # Analyze files
-    results, error_count = analyze_files(
+    if not final_plugins_config and config_obj is not None and config_obj.plugins:
+        final_plugins_config = config_obj.plugins
+    if plugins_dir:
+        final_plugins_config = dict(final_plugins_config or {})
+        directories = list(final_plugins_config.get("directories", []))
+        if plugins_dir not in directories:
+            directories.append(plugins_dir)
+        final_plugins_config["directories"] = directories
+
+    # Analyze files, results are formatted as files are analyzed
+    analysis = iter_analysis(
         migration_files,
         exclude_patterns=list(exclude) if exclude else None,
         verbose=verbose,
         plugins_config=final_plugins_config,
+        cache_dir=Path(cache_dir) if cache_dir else None,
     )
-
-    if not results:
+    # Results are kept only for autofix, exit code only needs to know about critical issues
+    results: list[tuple[Path, AnalyzerResult, Optional[float]]] = []  # (file_path, result, file_mtime)
+    error_count = 0
+    critical_found = False
+
+    def analyzed() -> Iterator[tuple[Path, AnalyzerResult]]:
+        nonlocal error_count, critical_found
+        for file_path, result, error in analysis:
+            if error is not None:
+                # Use unified error handling
+                handle_analysis_error(file_path, error, verbose)
+                error_count += 1
+                continue
+            if result is None:
+                continue
+            if not critical_found:
+                critical_found = has_critical_issues([(file_path, result)])
+            if autofix:
+                # Modification time right after analysis, to detect changes before applying fixes
+                file_mtime = None
+                if apply:
+                    with contextlib.suppress(OSError):
+                        file_mtime = file_path.stat().st_mtime
+                results.append((file_path, result, file_mtime))
+            yield file_path, result
+
+    analyzed_results = analyzed()
+    first_result = next(analyzed_results, None)
+    if first_result is None:
         if error_count > 0:
             click.echo(f"❌ Failed to analyze any files ({error_count} errors).", err=True)
         else:
             click.echo("❌ Failed to analyze any files.", err=True)
         return 1
 
-    if error_count > 0:
-        click.echo(f"⚠️  {error_count} errors occurred during analysis.", err=True)
-
     # Determine minimum severity level
     min_severity = None
     if severity:
@@ -729,15 +1047,13 @@ def _run_analysis(
     formatter = get_formatter(output_format, min_severity, no_color, verbose, quiet)
 
     # Format results
-    output_text = formatter.format(results)
+    output_chunks = formatter.format_stream(itertools.chain([first_result], analyzed_results))
 
     # Output or save result
     if output:
         output_path = Path(output)
         try:
-            # Create directory if it doesn't exist
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(output_text, encoding=DEFAULT_ENCODING)
+            write_output_file(output_path, output_chunks)
             click.echo(f"✅ Result saved to: {output_path}", err=True)
         except OSError as e:
             click.echo(f"❌ Error saving result to {output_path}: {e}", err=True)
@@ -746,20 +1062,19 @@ def _run_analysis(
             click.echo(f"❌ No permission to write to {output_path}: {e}", err=True)
             return 1
     else:
-        click.echo(output_text)
+        _echo_chunks(output_chunks)
+
+    if error_count > 0:
+        click.echo(f"⚠️  {error_count} errors occurred during analysis.", err=True)
 
     # Apply autofix if specified
     if autofix:
         total_fixed = 0
         total_unfixed = 0
         autofix_errors = 0
+        skip_apply_prompt = False
 
-        for file_path, result in results:
-            # Save file modification time for change checking
-            file_mtime = None
-            with contextlib.suppress(OSError):
-                file_mtime = file_path.stat().st_mtime
-
+        for file_path, result, file_mtime in results:
             autofix_result = apply_autofix_to_file(
                 file_path,
                 result,
@@ -769,6 +1084,7 @@ def _run_analysis(
                 dry_run=not apply,
                 original_file_mtime=file_mtime,
                 verbose=verbose,
+                skip_apply_prompt=skip_apply_prompt,
             )
 
             if autofix_result.success:
@@ -777,30 +1093,64 @@ def _run_analysis(
             else:
                 autofix_errors += 1
 
+            # Answers to the confirmation prompt apply to the remaining files,
+            # backup failures are still confirmed unless --yes is given
+            if autofix_result.apply_to_all:
+                skip_apply_prompt = True
+            if autofix_result.quit:
+                break
+
+        # Summary is written to stderr at once
         if apply:
-            click.echo(f"\n📊 Total fixed issues: {total_fixed}", err=True)
+            summary = [f"\n📊 Total fixed issues: {total_fixed}"]
             if total_unfixed > 0:
-                click.echo(f"⚠️  Unfixed issues: {total_unfixed}", err=True)
+                summary.append(f"⚠️  Unfixed issues: {total_unfixed}")
             if autofix_errors > 0:
-                click.echo(f"❌ Errors applying fixes: {autofix_errors}", err=True)
+                summary.append(f"❌ Errors applying fixes: {autofix_errors}")
         else:
-            click.echo(f"\n📊 Found fixable issues: {total_fixed + total_unfixed}", err=True)
-            click.echo(f"   Can be fixed: {total_fixed}", err=True)
-            click.echo(f"   Cannot be fixed: {total_unfixed}", err=True)
-            click.echo("\n💡 Use --autofix --apply to apply fixes", err=True)
+            summary = [
+                f"\n📊 Found fixable issues: {total_fixed + total_unfixed}",
+                f"   Can be fixed: {total_fixed}",
+                f"   Cannot be fixed: {total_unfixed}",
+                "\n💡 Use --autofix --apply to apply fixes",
+            ]
+        click.echo("\n".join(summary), err=True)
 
     # Determine exit code
-    if exit_code and has_critical_issues(results):
+    if exit_code and critical_found:
         return 1
     else:
         return 0
 
 
+def _ensure_utf8_stdio() -> None:
+    """
+    Switches stdout and stderr to UTF-8 on Windows (for correct output of emojis).
+
+    Called when a command runs rather than on import, so importing the module
+    doesn't replace streams captured by test harnesses or embedding applications.
+    """
+    if sys.platform != "win32":
+        return
+    for name in ("stdout", "stderr"):
+        stream = getattr(sys, name)
+        if (getattr(stream, "encoding", None) or "").lower().replace("-", "") == "utf8":
+            continue
+        try:
+            if hasattr(stream, "reconfigure"):
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            elif hasattr(stream, "buffer"):
+                setattr(sys, name, io.TextIOWrapper(stream.buffer, encoding="utf-8", errors="replace"))
+        except (AttributeError, OSError, ValueError):
+            # If reinitialization failed, ignore the error
+            pass
+
+
 @click.group()
 @click.version_option(version=__version__, prog_name="migsafe")
 def cli():
     """migsafe - safe analysis of Alembic migrations."""
-    pass
+    _ensure_utf8_stdio()
 
 
 @cli.command()
@@ -824,6 +1174,11 @@ def cli():
 @click.option("--no-color", is_flag=True, help="Disable colored output (useful for CI)")
 @click.option("--config", type=click.Path(exists=False), help="Path to configuration file (optional)")
 @click.option("--exclude", multiple=True, help="Exclude files/directories by pattern (can be specified multiple times)")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Cache analysis results in the directory, unchanged files are not analyzed again (e.g.: .migsafe-cache)",
+)
 @click.option("--plugins-dir", type=click.Path(exists=False), help="Plugins directory")
 @click.option("--autofix", is_flag=True, help="Show automatic fixes (dry-run by default)")
 @click.option("--apply", is_flag=True, help="Apply fixes (requires --autofix)")
@@ -848,6 +1203,7 @@ def analyze(
     no_color,
     config,
     exclude,
+    cache_dir,
     plugins_dir,
     autofix,
     apply,
@@ -873,43 +1229,9 @@ def analyze(
 
     # Validate paths if specified
     if config:
-        config_path = Path(config)
-        if not config_path.exists():
-            click.echo(f"❌ Configuration file not found: {config}", err=True)
-            sys.exit(1)
-        if not config_path.is_file():
-            click.echo(f"❌ Path is not a file: {config}", err=True)
-            sys.exit(1)
-
+        _require_path(config, False, f"❌ Configuration file not found: {config}")
     if plugins_dir:
-        plugins_dir_path = Path(plugins_dir)
-        if not plugins_dir_path.exists():
-            click.echo(f"❌ Plugins directory not found: {plugins_dir}", err=True)
-            sys.exit(1)
-        if not plugins_dir_path.is_dir():
-            click.echo(f"❌ Path is not a directory: {plugins_dir}", err=True)
-            sys.exit(1)
-
-    # Add plugins_dir to plugin configuration
-    plugins_config: Optional[dict[str, Any]] = None
-    if plugins_dir or config:
-        if config:
-            try:
-                config_obj = load_config(Path(config))
-                if config_obj.plugins:
-                    plugins_config = config_obj.plugins.copy() if isinstance(config_obj.plugins, dict) else {}
-                else:
-                    plugins_config = {}
-            except Exception:
-                plugins_config = {}
-        else:
-            plugins_config = {}
-
-        if plugins_dir and plugins_config is not None:
-            if "directories" not in plugins_config:
-                plugins_config["directories"] = []
-            if plugins_dir not in plugins_config["directories"]:
-                plugins_config["directories"].append(plugins_dir)
+        _require_path(plugins_dir, True, f"❌ Plugins directory not found: {plugins_dir}")
 
     exit_code_result = _run_analysis(
         paths=paths,
@@ -922,12 +1244,13 @@ def analyze(
         no_color=no_color,
         config=config,
         exclude=exclude,
-        plugins_config=plugins_config,
+        plugins_dir=plugins_dir,
         autofix=autofix,
         apply=apply,
         yes=yes,
         no_backup=no_backup,
         django_app=django_app,
+        cache_dir=cache_dir,
     )
     sys.exit(exit_code_result)
 
@@ -952,10 +1275,15 @@ def analyze(
 @click.option("--no-color", is_flag=True, help="Disable colored output (useful for CI)")
 @click.option("--config", type=click.Path(exists=False), help="Path to configuration file (optional)")
 @click.option("--exclude", multiple=True, help="Exclude files/directories by pattern (can be specified multiple times)")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Cache analysis results in the directory, unchanged files are not analyzed again (e.g.: .migsafe-cache)",
+)
 @click.option(
     "--django-app", multiple=True, help="Filter Django migrations by application name (can be specified multiple times)"
 )
-def lint(paths, output_format, output, severity, verbose, quiet, no_color, config, exclude, django_app):
+def lint(paths, output_format, output, severity, verbose, quiet, no_color, config, exclude, cache_dir, django_app):
     """
     Alternative command for CI/CD (synonym for analyze with --exit-code by default).
 
@@ -963,13 +1291,7 @@ def lint(paths, output_format, output, severity, verbose, quiet, no_color, confi
     """
     # Validate paths if specified
     if config:
-        config_path = Path(config)
-        if not config_path.exists():
-            click.echo(f"❌ Configuration file not found: {config}", err=True)
-            sys.exit(1)
-        if not config_path.is_file():
-            click.echo(f"❌ Path is not a file: {config}", err=True)
-            sys.exit(1)
+        _require_path(config, False, f"❌ Configuration file not found: {config}")
 
     # lint always with exit_code enabled
     exit_code_result = _run_analysis(
@@ -984,6 +1306,7 @@ def lint(paths, output_format, output, severity, verbose, quiet, no_color, confi
         config=config,
         exclude=exclude,
         django_app=django_app,
+        cache_dir=cache_dir,
     )
     sys.exit(exit_code_result)
 
@@ -1010,7 +1333,12 @@ def lint(paths, output_format, output, severity, verbose, quiet, no_color, confi
 @click.option("--no-color", is_flag=True, help="Disable colored output (useful for CI)")
 @click.option("--config", type=click.Path(exists=True), help="Path to configuration file (optional)")
 @click.option("--exclude", multiple=True, help="Exclude files/directories by pattern (can be specified multiple times)")
-def stats(paths, output_format, output, migration, severity, rule, since, no_color, config, exclude):
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Cache analysis results in the directory, unchanged files are not analyzed again (e.g.: .migsafe-cache)",
+)
+def stats(paths, output_format, output, migration, severity, rule, since, no_color, config, exclude, cache_dir):
     """
     Show statistics for migrations.
 
@@ -1019,13 +1347,18 @@ def stats(paths, output_format, output, migration, severity, rule, since, no_col
     - Statistics by issue types and rules
     - Improvement recommendations
     """
+    from .formatters.stats_csv_formatter import StatsCsvFormatter
+    from .formatters.stats_json_formatter import StatsJsonFormatter
+    from .formatters.stats_text_formatter import StatsTextFormatter
+    from .stats import MigrationStats, RecommendationsGenerator
+
     # Load configuration if specified
     cli_params = {
         "exclude": exclude,
         "output_format": output_format,
         "no_color": no_color,
     }
-    updated_params = _load_and_apply_config(config, cli_params)
+    updated_params, _ = _load_and_apply_config(config, cli_params)
 
     # Update local variables from updated parameters
     exclude = updated_params.get("exclude", exclude)
@@ -1042,10 +1375,22 @@ def stats(paths, output_format, output, migration, severity, rule, since, no_col
         click.echo("❌ Migration files not found.", err=True)
         sys.exit(1)
 
-    # Analyze files
-    results, error_count = analyze_files(migration_files, exclude_patterns=list(exclude) if exclude else None, verbose=False)
+    # Analyze files and collect statistics as files are analyzed, results are not kept
+    stats_obj = MigrationStats()
+    error_count = 0
+    for file_path, result, error in iter_analysis(
+        migration_files,
+        exclude_patterns=list(exclude) if exclude else None,
+        verbose=False,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+    ):
+        if error is not None:
+            handle_analysis_error(file_path, error, verbose=False)
+            error_count += 1
+        elif result is not None:
+            stats_obj.add_migration(file_path, result)
 
-    if not results:
+    if stats_obj.total_migrations == 0:
         if error_count > 0:
             click.echo(f"❌ Failed to analyze any files ({error_count} errors).", err=True)
         else:
@@ -1055,11 +1400,6 @@ def stats(paths, output_format, output, migration, severity, rule, since, no_col
     if error_count > 0:
         click.echo(f"⚠️  {error_count} errors occurred during analysis.", err=True)
 
-    # Collect statistics
-    stats_obj = MigrationStats()
-    for file_path, result in results:
-        stats_obj.add_migration(file_path, result)
-
     # Process --since option (if specified)
     if since:
         click.echo(
@@ -1098,16 +1438,17 @@ def stats(paths, output_format, output, migration, severity, rule, since, no_col
     recommendations_generator = RecommendationsGenerator()
     recommendations = recommendations_generator.generate(stats_obj)
 
-    # Format result
+    # Format result, large reports are written in chunks as they are formatted
+    output_chunks: Iterable[str]
     if output_format == FORMAT_TEXT:
         text_formatter = StatsTextFormatter(no_color=no_color)
-        output_text = text_formatter.format(stats_obj, recommendations)
+        output_chunks = text_formatter.format_stream(stats_obj, recommendations)
     elif output_format == FORMAT_JSON:
         json_formatter = StatsJsonFormatter()
-        output_text = json_formatter.format(stats_obj, recommendations)
+        output_chunks = json_formatter.format_stream(stats_obj, recommendations)
     elif output_format == FORMAT_CSV:
         csv_formatter = StatsCsvFormatter()
-        output_text = csv_formatter.format(stats_obj, recommendations)
+        output_chunks = csv_formatter.format_stream(stats_obj, recommendations)
     else:
         click.echo(f"❌ Unknown format: {output_format}", err=True)
         sys.exit(1)
@@ -1116,9 +1457,7 @@ def stats(paths, output_format, output, migration, severity, rule, since, no_col
     if output:
         output_path = Path(output)
         try:
-            # Create directory if it doesn't exist
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(output_text, encoding=DEFAULT_ENCODING)
+            write_output_file(output_path, output_chunks)
             click.echo(f"✅ Result saved to: {output_path}", err=True)
         except OSError as e:
             click.echo(f"❌ Error saving result to {output_path}: {e}", err=True)
@@ -1127,27 +1466,29 @@ def stats(paths, output_format, output, migration, severity, rule, since, no_col
             click.echo(f"❌ No permission to write to {output_path}: {e}", err=True)
             sys.exit(1)
     else:
-        click.echo(output_text)
+        _echo_chunks(output_chunks)
 
     sys.exit(0)
 
 
 def _format_history_text(
-    history: MigrationHistory,
-    stats: Statistics,
-    frequency: FrequencyStats,
-    patterns: list[Pattern],
+    history: "MigrationHistory",
+    stats: "Statistics",
+    frequency: "FrequencyStats",
+    patterns: list["Pattern"],
     hotspots: list[str],
     recommendations: list[str],
     no_color: bool = False,
 ) -> str:
     """Formats migration history in text format."""
+    from .formatters.colors import COLOR_CYAN, COLOR_GREEN, COLOR_RESET, COLOR_YELLOW
+
     lines = []
 
-    color_reset = "" if no_color else "\033[0m"
-    color_yellow = "" if no_color else "\033[93m"
-    color_green = "" if no_color else "\033[92m"
-    color_cyan = "" if no_color else "\033[96m"
+    # Colors are chosen once for the whole report
+    color_reset, color_yellow, color_green, color_cyan = (
+        ("", "", "", "") if no_color else (COLOR_RESET, COLOR_YELLOW, COLOR_GREEN, COLOR_CYAN)
+    )
 
     lines.append("=" * 80)
     lines.append("MIGRATION HISTORY")
@@ -1211,15 +1552,27 @@ def _format_history_text(
 
 
 def _format_history_json(
-    history: MigrationHistory,
-    stats: Statistics,
-    frequency: FrequencyStats,
-    patterns: list[Pattern],
+    history: "MigrationHistory",
+    stats: "Statistics",
+    frequency: "FrequencyStats",
+    patterns: list["Pattern"],
     hotspots: list[str],
     recommendations: list[str],
 ) -> str:
     """Formats migration history in JSON format."""
-    import json
+    return "".join(_iter_history_json(history, stats, frequency, patterns, hotspots, recommendations))
+
+
+def _iter_history_json(
+    history: "MigrationHistory",
+    stats: "Statistics",
+    frequency: "FrequencyStats",
+    patterns: list["Pattern"],
+    hotspots: list[str],
+    recommendations: list[str],
+) -> Iterator[str]:
+    """Formats migration history in JSON format, yielding the text in chunks."""
+    from .formatters.json_utils import iter_json
 
     data = {
         "statistics": {
@@ -1255,7 +1608,7 @@ def _format_history_json(
         "recommendations": recommendations,
     }
 
-    return json.dumps(data, ensure_ascii=False, indent=2)
+    yield from iter_json(data)
 
 
 @cli.command()
@@ -1283,15 +1636,10 @@ def history(migration, output_format, since, until, author, output, no_color, re
     Allows tracking migration changes over time, finding problematic
     patterns and generating reports on migration evolution.
     """
-    # Validate repo_path
-    repo_path_obj = Path(repo_path)
-    if not repo_path_obj.exists():
-        click.echo(f"❌ Path does not exist: {repo_path}", err=True)
-        sys.exit(1)
+    from .history import GitHistoryAnalyzer, MigrationHistory, MigrationTrendAnalyzer
 
-    if not repo_path_obj.is_dir():
-        click.echo(f"❌ Path is not a directory: {repo_path}", err=True)
-        sys.exit(1)
+    # Validate repo_path
+    _require_path(repo_path, True, f"❌ Path does not exist: {repo_path}")
 
     try:
         # Initialize Git analyzer
@@ -1320,15 +1668,15 @@ def history(migration, output_format, since, until, author, output, no_color, re
         until_date = None
         if since:
             try:
-                # Support YYYY-MM-DD and YYYY-MM-DDTHH:MM:SS formats
-                since_date = datetime.strptime(since, "%Y-%m-%d") if len(since) == 10 else datetime.fromisoformat(since)
+                # fromisoformat() accepts both YYYY-MM-DD and YYYY-MM-DDTHH:MM:SS
+                since_date = datetime.fromisoformat(since)
             except ValueError:
                 click.echo(f"❌ Invalid date format --since: {since}. Use format YYYY-MM-DD", err=True)
                 sys.exit(1)
         if until:
             try:
-                # Support YYYY-MM-DD and YYYY-MM-DDTHH:MM:SS formats
-                until_date = datetime.strptime(until, "%Y-%m-%d") if len(until) == 10 else datetime.fromisoformat(until)
+                # fromisoformat() accepts both YYYY-MM-DD and YYYY-MM-DDTHH:MM:SS
+                until_date = datetime.fromisoformat(until)
             except ValueError:
                 click.echo(f"❌ Invalid date format --until: {until}. Use format YYYY-MM-DD", err=True)
                 sys.exit(1)
@@ -1352,13 +1700,20 @@ def history(migration, output_format, since, until, author, output, no_color, re
                 filter_info.append(f"max commits: {max_commits}")
             click.echo(f"🔍 Filters: {', '.join(filter_info)}", err=True)
 
-        for migration_file in migration_files:
-            try:
-                history_tracker.track_changes(
-                    migration_file, since=since_date, until=until_date, author=author, max_commits=max_commits
-                )
-            except Exception as e:
-                logger.warning(f"Error analyzing {migration_file}: {e}")
+        try:
+            # History of all migrations is read with one git log call
+            history_tracker.track_changes_batch(
+                migration_files, since=since_date, until=until_date, author=author, max_commits=max_commits
+            )
+        except Exception as e:
+            logger.warning(f"Error analyzing migrations together, analyzing one by one: {e}")
+            for migration_file in migration_files:
+                try:
+                    history_tracker.track_changes(
+                        migration_file, since=since_date, until=until_date, author=author, max_commits=max_commits
+                    )
+                except Exception as e:
+                    logger.warning(f"Error analyzing {migration_file}: {e}")
 
         # Calculate statistics
         stats = history_tracker.calculate_statistics()
@@ -1371,16 +1726,17 @@ def history(migration, output_format, since, until, author, output, no_color, re
         recommendations = trend_analyzer.generate_recommendations(history_tracker)
 
         # Format result
+        output_chunks: Iterable[str]
         if output_format == "text":
-            output_text = _format_history_text(
-                history_tracker, stats, frequency, patterns, hotspots, recommendations, no_color=no_color
-            )
+            output_chunks = [
+                _format_history_text(history_tracker, stats, frequency, patterns, hotspots, recommendations, no_color=no_color)
+            ]
         elif output_format == "json":
-            output_text = _format_history_json(history_tracker, stats, frequency, patterns, hotspots, recommendations)
+            output_chunks = _iter_history_json(history_tracker, stats, frequency, patterns, hotspots, recommendations)
         elif output_format == "html":
             # HTML format not yet implemented, use JSON
             click.echo("⚠️  HTML format not yet supported, using JSON", err=True)
-            output_text = _format_history_json(history_tracker, stats, frequency, patterns, hotspots, recommendations)
+            output_chunks = _iter_history_json(history_tracker, stats, frequency, patterns, hotspots, recommendations)
         else:
             click.echo(f"❌ Unknown format: {output_format}", err=True)
             sys.exit(1)
@@ -1389,14 +1745,13 @@ def history(migration, output_format, since, until, author, output, no_color, re
         if output:
             output_path = Path(output)
             try:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.write_text(output_text, encoding=DEFAULT_ENCODING)
+                write_output_file(output_path, output_chunks)
                 click.echo(f"✅ Result saved to: {output_path}", err=True)
             except Exception as e:
                 click.echo(f"❌ Error saving result: {e}", err=True)
                 sys.exit(1)
         else:
-            click.echo(output_text)
+            _echo_chunks(output_chunks)
 
         sys.exit(0)
 
@@ -1458,24 +1813,8 @@ def execute(
         sys.exit(1)
 
     # Validate paths
-    migration_path = Path(migration)
-    if not migration_path.exists():
-        click.echo(f"❌ Migration file not found: {migration}", err=True)
-        sys.exit(1)
-    if not migration_path.is_file():
-        click.echo(f"❌ Path is not a file: {migration}", err=True)
-        sys.exit(1)
-
-    if alembic_cfg:
-        alembic_cfg_path = Path(alembic_cfg)
-        if not alembic_cfg_path.exists():
-            click.echo(f"❌ alembic.ini file not found: {alembic_cfg}", err=True)
-            sys.exit(1)
-        if not alembic_cfg_path.is_file():
-            click.echo(f"❌ Path is not a file: {alembic_cfg}", err=True)
-            sys.exit(1)
-    else:
-        alembic_cfg_path = None
+    _require_path(migration, False, f"❌ Migration file not found: {migration}")
+    alembic_cfg_path = _require_path(alembic_cfg, False, f"❌ alembic.ini file not found: {alembic_cfg}") if alembic_cfg else None
 
     try:
         # Create executor
@@ -1502,8 +1841,7 @@ def execute(
         if output:
             output_path = Path(output)
             try:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.write_text(output_text, encoding=DEFAULT_ENCODING)
+                write_output_file(output_path, [output_text])
                 click.echo(f"✅ Result saved to: {output_path}", err=True)
             except Exception as e:
                 click.echo(f"❌ Error saving result: {e}", err=True)
@@ -1790,6 +2128,8 @@ def plugins_info(plugin_name, config, verbose):
 
 def main():
     """CLI entry point."""
+    # Before click runs, so --help output is covered too
+    _ensure_utf8_stdio()
     cli()
 
 
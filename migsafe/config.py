@@ -1,11 +1,22 @@
 """Module for working with configuration files."""
 
+import contextlib
 import json
+import os
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class Config(BaseModel):
     """Configuration for migsafe."""
@@ -39,7 +50,7 @@ def load_config(config_path: Path) -> Config:
 
     Supports formats:
     - JSON (.json)
-    - TOML (.toml) - if tomli is installed
+    - TOML (.toml) - built in on Python 3.11+, requires tomli on older versions
 
     Args:
         config_path: Path to the configuration file
@@ -47,28 +58,47 @@ def load_config(config_path: Path) -> Config:
     Returns:
         Config object with settings
 
+    Parsed files are cached by path, modification time and size,
+    so loading an unchanged file again doesn't read it.
+
     Raises:
         FileNotFoundError: If the file is not found
         ValueError: If the file format is not supported or the file is invalid
     """
-    if not config_path.exists():
-        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    try:
+        stat_result = os.stat(config_path)
+    except OSError as e:
+        raise FileNotFoundError(f"Configuration file not found: {config_path}") from e
 
     suffix = config_path.suffix.lower()
+    if suffix not in (".json", ".toml"):
+        raise ValueError(f"Unsupported configuration file format: {suffix}. Supported: .json, .toml")
+
+    config = _load_cached_config(config_path, os.path.realpath(config_path), stat_result.st_mtime_ns, stat_result.st_size)
+    # Copied, so changes made by the caller don't leak into the cache
+    return config.model_copy(deep=True)
 
-    if suffix == ".json":
+
+@lru_cache(maxsize=32)
+def _load_cached_config(config_path: Path, real_path: str, mtime_ns: int, size: int) -> Config:
+    """Loads configuration, real_path, mtime_ns and size only key the cache."""
+    if config_path.suffix.lower() == ".json":
         return _load_json_config(config_path)
-    elif suffix == ".toml":
-        return _load_toml_config(config_path)
-    else:
-        raise ValueError(f"Unsupported configuration file format: {suffix}. Supported: .json, .toml")
+    return _load_toml_config(config_path)
 
 
 def _load_json_config(config_path: Path) -> Config:
     """Loads configuration from a JSON file."""
     try:
-        with open(config_path, encoding="utf-8") as f:
-            data = json.load(f)
+        content = config_path.read_bytes()
+        data = None
+        if ORJSON_AVAILABLE:
+            with contextlib.suppress(orjson.JSONDecodeError):
+                data = orjson.loads(content)
+        if data is None:
+            # Without orjson, or if it rejects the file (NaN, integers over 64 bits, BOM),
+            # json parses it and reports errors as before
+            data = json.loads(content.decode("utf-8"))
         return Config(**data)
     except json.JSONDecodeError as e:
         raise ValueError(f"JSON parsing error in {config_path}: {e}") from e
@@ -78,14 +108,19 @@ def _load_json_config(config_path: Path) -> Config:
 
 def _load_toml_config(config_path: Path) -> Config:
     """Loads configuration from a TOML file."""
-    try:
-        import tomli
-    except ImportError as e:
-        raise ValueError("tomli library is required for TOML file support. Install it: pip install tomli") from e
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib
+        except ImportError as e:
+            raise ValueError(
+                "tomli library is required for TOML file support on Python < 3.11. Install it: pip install tomli"
+            ) from e
 
     try:
         with open(config_path, "rb") as f:
-            data = tomli.load(f)
+            data = tomllib.load(f)
 
         # Extract [migsafe] section if it exists, otherwise use root level
         config_data = data.get("migsafe", data)
@@ -116,12 +116,9 @@ class MigrationRunner:
                 for node in ast.walk(tree):
                     if isinstance(node, ast.Assign):
                         for target in node.targets:
-                            if isinstance(target, ast.Name) and target.id == "revision":
-                                if isinstance(node.value, ast.Constant):
-                                    value = node.value.value
-                                    return str(value) if isinstance(value, str) else None
-                                elif isinstance(node.value, ast.Str):  # Python < 3.8
-                                    return str(node.value.s)
+                            if isinstance(target, ast.Name) and target.id == "revision" and isinstance(node.value, ast.Constant):
+                                value = node.value.value
+                                return str(value) if isinstance(value, str) else None
             except SyntaxError:
                 pass
 
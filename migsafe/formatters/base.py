@@ -1,6 +1,7 @@
 """Base interface for output formatters."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -91,6 +92,21 @@ class Formatter(ABC):
         """
         pass
 
+    def format_stream(self, results: Iterable[tuple[Path, AnalyzerResult]]) -> Iterator[str]:
+        """
+        Format analysis results as they arrive.
+
+        Formats with a document root or a summary need all results, so by default
+        the output is produced as one chunk after the last result.
+
+        Args:
+            results: Iterable of tuples (file_path, analysis_result)
+
+        Yields:
+            Chunks of the string format() returns
+        """
+        yield self.format(list(results))
+
     @abstractmethod
     def format_single(self, file_path: Path, result: AnalyzerResult) -> str:
         """
@@ -131,3 +147,18 @@ class StatsFormatter(ABC):
             Formatted string
         """
         pass
+
+    def format_stream(self, stats: "MigrationStats", recommendations: list[dict[str, Any]]) -> Iterator[str]:  # noqa: F821
+        """
+        Format migration statistics in chunks, so large reports are written without building one string.
+
+        By default the output is produced as one chunk.
+
+        Args:
+            stats: Migration statistics object
+            recommendations: List of recommendations
+
+        Yields:
+            Chunks of the string format() returns
+        """
+        yield self.format(stats, recommendations)
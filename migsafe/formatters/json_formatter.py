@@ -1,12 +1,12 @@
 """JSON formatter for analysis results output."""
 
-import json
 from pathlib import Path
 from typing import Any
 
 from .. import __version__
 from ..base import AnalyzerResult
 from .base import Formatter
+from .json_utils import dumps_json
 
 
 class JsonFormatter(Formatter):
@@ -50,7 +50,7 @@ class JsonFormatter(Formatter):
                 }
                 output["migrations"].append(migration_data)
 
-            return json.dumps(output, ensure_ascii=False, indent=2)
+            return dumps_json(output)
         except (TypeError, ValueError) as e:
             raise ValueError(f"Data validation error when formatting JSON: {e}") from e
         except Exception as e:
@@ -80,7 +80,7 @@ class JsonFormatter(Formatter):
                 "issues": [self._issue_to_dict(issue) for issue in filtered_issues],
             }
 
-            return json.dumps(output, ensure_ascii=False, indent=2)
+            return dumps_json(output)
         except (TypeError, ValueError) as e:
             raise ValueError(f"Data validation error when formatting JSON: {e}") from e
         except Exception as e:
@@ -0,0 +1,69 @@
+"""JSON serialization for formatters."""
+
+import json
+from collections.abc import Iterator
+from typing import Any
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Approximate size of chunks yielded by iter_json()
+_CHUNK_SIZE = 1 << 16
+
+
+def dumps_json(data: Any) -> str:
+    """
+    Serializes data to indented JSON without escaping non-ASCII characters.
+
+    Uses orjson when it is installed (several times faster on large reports),
+    otherwise the standard json module. Both produce the same text for
+    dicts with str keys, lists, strings, ints, bools and None.
+
+    Args:
+        data: Data to serialize
+
+    Returns:
+        JSON string
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            # Not supported by orjson (e.g., int over 64 bits), json reports or handles it
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def iter_json(data: Any) -> Iterator[str]:
+    """
+    Serializes data like dumps_json(), yielding the JSON text in chunks.
+
+    Without orjson only one chunk of the text is kept in memory at a time.
+    With orjson the text is produced as one chunk, orjson serializes the whole
+    document faster than the standard json module produces the first chunks.
+
+    Args:
+        data: Data to serialize
+
+    Yields:
+        Chunks of the JSON string
+    """
+    if ORJSON_AVAILABLE:
+        yield dumps_json(data)
+        return
+
+    buffer: list[str] = []
+    size = 0
+    for piece in json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(data):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= _CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
@@ -1,6 +1,5 @@
 """SARIF formatter for integration with GitHub Security and other tools."""
 
-import json
 import logging
 from pathlib import Path
 from typing import Any
@@ -9,6 +8,7 @@ from .. import __version__
 from ..base import AnalyzerResult
 from ..models import Issue, IssueSeverity, IssueType
 from .base import Formatter
+from .json_utils import dumps_json
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +72,7 @@ class SarifFormatter(Formatter):
                 "runs": [self._create_run(results)],
             }
 
-            return json.dumps(sarif, ensure_ascii=False, indent=2)
+            return dumps_json(sarif)
         except (TypeError, ValueError) as e:
             raise ValueError(f"Data validation error when formatting SARIF: {e}") from e
         except Exception as e:
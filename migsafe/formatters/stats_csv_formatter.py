@@ -1,12 +1,16 @@
 """CSV formatter for migration statistics."""
 
 import csv
+from collections.abc import Iterator
 from io import StringIO
 from typing import Any
 
 from ..stats import MigrationStats
 from .base import StatsFormatter
 
+# Approximate size of chunks yielded by format_stream()
+_CHUNK_SIZE = 1 << 16
+
 
 class StatsCsvFormatter(StatsFormatter):
     """CSV formatter for statistics."""
@@ -22,6 +26,19 @@ class StatsCsvFormatter(StatsFormatter):
         Returns:
             CSV string
         """
+        return "".join(self.format_stream(stats, recommendations))
+
+    def format_stream(self, stats: MigrationStats, recommendations: list[dict[str, Any]]) -> Iterator[str]:
+        """
+        Format statistics as CSV in chunks.
+
+        Args:
+            stats: Statistics object
+            recommendations: List of recommendations (not used in CSV)
+
+        Yields:
+            Chunks of the CSV string
+        """
         output = StringIO()
         writer = csv.writer(output)
 
@@ -44,5 +61,9 @@ class StatsCsvFormatter(StatsFormatter):
                     issues_by_severity.get("ok", 0),
                 ]
             )
+            if output.tell() >= _CHUNK_SIZE:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate()
 
-        return output.getvalue()
+        yield output.getvalue()
@@ -1,12 +1,13 @@
 """JSON formatter for migration statistics."""
 
-import json
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
 from .. import __version__
 from ..stats import MigrationStats
 from .base import StatsFormatter
+from .json_utils import iter_json
 
 
 class StatsJsonFormatter(StatsFormatter):
@@ -23,6 +24,19 @@ class StatsJsonFormatter(StatsFormatter):
         Returns:
             JSON string
         """
+        return "".join(self.format_stream(stats, recommendations))
+
+    def format_stream(self, stats: MigrationStats, recommendations: list[dict[str, Any]]) -> Iterator[str]:
+        """
+        Format statistics as JSON in chunks.
+
+        Args:
+            stats: Statistics object
+            recommendations: List of recommendations
+
+        Yields:
+            Chunks of the JSON string
+        """
         data = {
             "version": __version__,
             "generated_at": datetime.now().isoformat(),
@@ -33,4 +47,4 @@ class StatsJsonFormatter(StatsFormatter):
             "recommendations": recommendations,
         }
 
-        return json.dumps(data, ensure_ascii=False, indent=2)
+        yield from iter_json(data)
@@ -1,5 +1,6 @@
 """Text formatter for analysis results output."""
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 
 from ..base import AnalyzerResult
@@ -40,6 +41,13 @@ class TextFormatter(Formatter):
 
         return "\n".join(output_lines)
 
+    def format_stream(self, results: Iterable[tuple[Path, AnalyzerResult]]) -> Iterator[str]:
+        """Format analysis results file by file."""
+        separator = ""
+        for file_path, result in results:
+            yield f"{separator}{self.format_single(file_path, result)}\n"
+            separator = "\n"  # Empty line between files
+
     def format_single(self, file_path: Path, result: AnalyzerResult) -> str:
         """Format analysis result for a single file."""
         # Data validation
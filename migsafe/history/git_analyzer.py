@@ -2,6 +2,8 @@
 
 import fnmatch
 import logging
+import os
+import posixpath
 from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
@@ -379,14 +381,7 @@ class GitHistoryAnalyzer:
                         pass  # Skip date check if parsing failed
 
                     # Get list of changed files in commit (with caching)
-                    commit_obj = self._get_commit_cached(commit_hash)
-                    if commit_obj and hasattr(commit_obj, "stats") and hasattr(commit_obj.stats, "files"):
-                        try:
-                            files = list(commit_obj.stats.files.keys())
-                        except AttributeError:
-                            files = [file_path]
-                    else:
-                        files = [file_path]
+                    files = self._get_commit_files(commit_hash, file_path)
 
                     commits.append(CommitInfo(hash=commit_hash, author=commit_author, date=date, message=message, files=files))
 
@@ -398,6 +393,158 @@ class GitHistoryAnalyzer:
 
         return commits
 
+    def get_files_history(
+        self,
+        file_paths: list[str],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        author: Optional[str] = None,
+        max_commits: Optional[int] = None,
+    ) -> dict[str, list[MigrationChange]]:
+        """Get change history of several files with one git log call.
+
+        The log of the files' directories is read once and its entries are
+        attributed to files by path. Renames inside these directories are followed
+        like get_file_history() does, and change types are the ones
+        MigrationHistory determines for each commit.
+
+        Args:
+            file_paths: Paths to files, absolute or relative to repository root
+            since: Start date for filtering (optional)
+            until: End date for filtering (optional)
+            author: Filter by commit author (optional)
+            max_commits: Maximum number of commits to return per file (optional)
+
+        Returns:
+            Changes of each file keyed by the path as passed, newest first (diff is not filled)
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        if not GIT_AVAILABLE:
+            raise ValueError("Git is unavailable")
+
+        if since and until and since > until:
+            raise ValueError("since cannot be later than until")
+
+        if max_commits is not None and max_commits < 0:
+            raise ValueError("max_commits cannot be negative")
+
+        history: dict[str, list[MigrationChange]] = {file_path: [] for file_path in file_paths}
+        if not file_paths:
+            return history
+
+        # Records are separated by RS, header fields by NUL, status lines follow the header
+        log_args = ["-M", "--name-status", "--pretty=format:%x1e%H%x00%P%x00%an%x00%ad%x00%s", "--date=iso"]
+        if since:
+            log_args.extend(["--since", since.isoformat()])
+        if until:
+            log_args.extend(["--until", until.isoformat()])
+        if author:
+            log_args.extend(["--author", author])
+        # git log prints paths relative to repository root, ./ prefixes and absolute paths are normalized to match
+        repo_paths = {file_path: self._to_repo_path(file_path) for file_path in file_paths}
+        log_args.append("--")
+        log_args.extend(sorted({posixpath.dirname(repo_path) or "." for repo_path in repo_paths.values()}))
+
+        try:
+            log_output = self.repo.git.log(*log_args)
+        except GitCommandError as e:
+            logger.warning(f"Error getting history of {len(file_paths)} files: {e}")
+            return history
+
+        # Files by their name at the point of history being read (changes with renames),
+        # several input paths can name the same file
+        current_names: dict[str, list[str]] = {}
+        for file_path, repo_path in repo_paths.items():
+            current_names.setdefault(repo_path, []).append(file_path)
+        for record in log_output.split("\x1e"):
+            header, _, status_block = record.partition("\n")
+            fields = header.split("\0")
+            if len(fields) != 5:
+                continue
+            commit_hash, parents, commit_author, date, message = fields
+
+            # Additional filtering (in case git log didn't work), renames are still followed
+            matches_filters = not author or author.lower() in commit_author.lower()
+            if matches_filters and (since or until):
+                try:
+                    commit_date = parse_git_date(date)
+                    if (since and commit_date < since) or (until and commit_date > until):
+                        matches_filters = False
+                except (ValueError, AttributeError):
+                    pass  # Skip date check if parsing failed
+
+            commit_info: Optional[CommitInfo] = None
+            for status_line in status_block.splitlines():
+                status_fields = status_line.split("\t")
+                if len(status_fields) < 2:
+                    continue
+                status, path = status_fields[0], status_fields[-1]
+                path_files = current_names.get(path)
+                if path_files is None:
+                    continue
+                if status.startswith("R") and len(status_fields) == 3:
+                    # Older commits changed the file under its previous name
+                    del current_names[path]
+                    current_names[status_fields[1]] = path_files
+
+                for file_path in path_files:
+                    changes = history[file_path]
+                    if not matches_filters or (max_commits is not None and len(changes) >= max_commits):
+                        continue
+
+                    change_type = self._batch_change_type(status, path, repo_paths[file_path], bool(parents))
+                    if commit_info is None:
+                        commit_info = CommitInfo(
+                            hash=commit_hash,
+                            author=commit_author,
+                            date=date,
+                            message=message,
+                            files=self._get_commit_files(commit_hash, file_path),
+                        )
+                    changes.append(MigrationChange(file_path=file_path, commit=commit_info, change_type=change_type))
+
+        return history
+
+    def _to_repo_path(self, file_path: str) -> str:
+        """Returns POSIX path of the file relative to repository root.
+
+        Relative paths are resolved against repository root, as git commands run there.
+        """
+        root = self.repo.working_tree_dir or str(self.repo_path)
+        full_path = os.path.join(root, file_path)
+        repo_path = os.path.relpath(os.path.abspath(full_path), os.path.abspath(root))
+        if repo_path.startswith(os.pardir):
+            # Root or path may contain symlinks (e.g., /tmp on macOS)
+            repo_path = os.path.relpath(os.path.realpath(full_path), os.path.realpath(root))
+        return repo_path.replace(os.sep, "/")
+
+    @staticmethod
+    def _batch_change_type(status: str, path: str, repo_path: str, has_parents: bool) -> str:
+        """Returns change type of a git log --name-status entry of the file at repo_path."""
+        if not has_parents:
+            return "added"
+        if path != repo_path:
+            # Changes under a previous name are not visible at the current path
+            return "modified"
+        if status.startswith(("A", "R")):
+            # A renamed file appears at the current path
+            return "added"
+        if status.startswith("D"):
+            return "deleted"
+        return "modified"
+
+    def _get_commit_files(self, commit_hash: str, file_path: str) -> list[str]:
+        """Returns files changed in commit, [file_path] if they can't be determined."""
+        commit_obj = self._get_commit_cached(commit_hash)
+        if commit_obj and hasattr(commit_obj, "stats") and hasattr(commit_obj.stats, "files"):
+            try:
+                return list(commit_obj.stats.files.keys())
+            except AttributeError:
+                pass
+        return [file_path]
+
     def analyze_commits(self, commits: list[str]) -> list[MigrationChange]:
         """Analyze commits to detect changes in migrations.
 
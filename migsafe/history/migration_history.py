@@ -1,8 +1,10 @@
 """Class for tracking migration history."""
 
+import heapq
 import logging
 from collections import OrderedDict
 from datetime import datetime
+from operator import attrgetter
 from typing import TYPE_CHECKING, Literal, Optional
 
 from pydantic import BaseModel
@@ -123,6 +125,59 @@ class MigrationHistory:
 
             changes.append(MigrationChange(file_path=migration_path, commit=commit, change_type=change_type, diff=diff))
 
+        return self._create_record(migration_path, changes)
+
+    def track_changes_batch(
+        self,
+        migration_paths: list[str],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        author: Optional[str] = None,
+        max_commits: Optional[int] = None,
+    ) -> list[HistoryRecord]:
+        """Track changes of several migrations.
+
+        History of all migrations is read with one git log call
+        (see GitHistoryAnalyzer.get_files_history()) instead of one per migration.
+
+        Args:
+            migration_paths: Paths to migration files
+            since: Start date for filtering (optional)
+            until: End date for filtering (optional)
+            author: Filter by commit author (optional)
+            max_commits: Maximum number of commits to analyze per migration (optional)
+
+        Returns:
+            History records in order of migration_paths
+
+        Raises:
+            ValueError: If a migration path is empty or parameters are invalid
+        """
+        # Input validation
+        if any(not migration_path or not migration_path.strip() for migration_path in migration_paths):
+            raise ValueError("migration_path cannot be empty")
+
+        files_history = self.analyzer.get_files_history(
+            migration_paths, since=since, until=until, author=author, max_commits=max_commits
+        )
+
+        records = []
+        for migration_path in migration_paths:
+            changes = files_history.get(migration_path, [])
+            if not changes:
+                logger.debug(f"No commits found for {migration_path}")
+            for change in changes:
+                # Get diff with error handling
+                try:
+                    change.diff = self.analyzer.get_diff(change.commit.hash, migration_path)
+                except Exception as e:
+                    logger.warning(f"Error getting diff for {migration_path} in commit {change.commit.hash}: {e}")
+                    change.diff = ""
+            records.append(self._create_record(migration_path, changes))
+        return records
+
+    def _create_record(self, migration_path: str, changes: list[MigrationChange]) -> HistoryRecord:
+        """Creates history record of migration from its changes and stores it in records."""
         # Determine dates
         if changes:
             dates = []
@@ -266,8 +321,8 @@ class MigrationHistory:
 
         average_changes = total_changes / total_migrations if total_migrations > 0 else 0.0
 
-        # Find most frequently changed migrations
-        most_changed = sorted(self.records.values(), key=lambda r: r.change_count, reverse=True)[:10]
+        # Find most frequently changed migrations, without sorting all records
+        most_changed = heapq.nlargest(10, self.records.values(), key=attrgetter("change_count"))
 
         # Find problematic patterns
         problematic_patterns = self.find_problematic_patterns()
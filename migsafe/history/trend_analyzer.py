@@ -1,9 +1,11 @@
 """Class for analyzing migration trends."""
 
+import heapq
 import logging
 import re
 from collections import defaultdict
 from datetime import timedelta
+from operator import itemgetter
 
 from pydantic import BaseModel
 
@@ -140,8 +142,8 @@ class MigrationTrendAnalyzer:
             week_key = week_start.strftime("%Y-%m-%d")
             weekly_counts[week_key] += 1
 
-        # Sort and take top 3
-        peak_periods = sorted(weekly_counts.items(), key=lambda x: x[1], reverse=True)[:3]
+        # Take top 3 without sorting all weeks (same order as a stable sort by count)
+        peak_periods = heapq.nlargest(3, weekly_counts.items(), key=itemgetter(1))
 
         peak_periods_str = [f"{week} ({count} migrations)" for week, count in peak_periods]
 
@@ -219,7 +221,7 @@ class MigrationTrendAnalyzer:
                     table_files[table_name].add(record.file_path)
 
         # Create patterns for frequently changed tables
-        for table_name, count in sorted(table_changes.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for table_name, count in heapq.nlargest(10, table_changes.items(), key=itemgetter(1)):
             if count > self.MIN_TABLE_CHANGES_FOR_PATTERN:
                 patterns.append(
                     Pattern(
@@ -292,8 +294,8 @@ class MigrationTrendAnalyzer:
                 for table_name in found_tables:
                     table_counts[table_name] += 1
 
-        # Sort by frequency and return top 10
-        hotspots = sorted(table_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Take top 10 by frequency without sorting all tables
+        hotspots = heapq.nlargest(10, table_counts.items(), key=itemgetter(1))
 
         return [table_name for table_name, count in hotspots if count > self.MIN_HOTSPOT_CHANGES]
 
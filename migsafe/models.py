@@ -16,6 +16,8 @@ class MigrationOp(BaseModel):
     concurrently: Optional[bool] = None
     raw_sql: Optional[str] = None
     column_type: Optional[str] = None  # Column type for alter_column (e.g., "Integer", "String")
+    lineno: Optional[int] = None  # Line of the operation call in migration source
+    col_offset: Optional[int] = None  # Column of the operation call in its line
 
 
 class IssueSeverity(str, Enum):
@@ -73,6 +75,8 @@ class Issue(BaseModel):
         table: Table name associated with the issue (optional).
         column: Column name associated with the issue (optional).
         index: Index name associated with the issue (optional).
+        lineno: Line of the operation in migration source (optional).
+        col_offset: Column of the operation in its source line (optional).
     """
 
     severity: IssueSeverity
@@ -83,3 +87,5 @@ class Issue(BaseModel):
     table: Optional[str] = Field(default=None, description="Table name associated with the issue")
     column: Optional[str] = Field(default=None, description="Column name associated with the issue")
     index: Optional[str] = Field(default=None, description="Index name associated with the issue")
+    lineno: Optional[int] = Field(default=None, description="Line of the operation in migration source")
+    col_offset: Optional[int] = Field(default=None, description="Column of the operation in its source line")
@@ -58,6 +58,8 @@ class AddColumnNotNullRule(Rule):
                     recommendation=recommendation,
                     table=operation.table,
                     column=operation.column,
+                    lineno=operation.lineno,
+                    col_offset=operation.col_offset,
                 )
             )
 
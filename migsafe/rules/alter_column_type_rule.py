@@ -64,6 +64,8 @@ class AlterColumnTypeRule(Rule):
                 recommendation=recommendation,
                 table=operation.table,
                 column=operation.column,
+                lineno=operation.lineno,
+                col_offset=operation.col_offset,
             )
         )
 
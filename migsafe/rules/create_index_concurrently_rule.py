@@ -59,6 +59,8 @@ class CreateIndexConcurrentlyRule(Rule):
                     recommendation=recommendation,
                     table=operation.table,
                     index=operation.index,
+                    lineno=operation.lineno,
+                    col_offset=operation.col_offset,
                 )
             )
 
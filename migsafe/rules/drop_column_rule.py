@@ -61,6 +61,8 @@ class DropColumnRule(Rule):
                 recommendation=recommendation,
                 table=operation.table,
                 column=operation.column,
+                lineno=operation.lineno,
+                col_offset=operation.col_offset,
             )
         )
 
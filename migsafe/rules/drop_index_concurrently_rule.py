@@ -54,6 +54,8 @@ class DropIndexWithoutConcurrentlyRule(Rule):
                     recommendation=recommendation,
                     table=operation.table,
                     index=operation.index,
+                    lineno=operation.lineno,
+                    col_offset=operation.col_offset,
                 )
             )
 
@@ -52,6 +52,8 @@ class ExecuteRawSqlRule(Rule):
                 message=message,
                 operation_index=index,
                 recommendation=recommendation,
+                lineno=operation.lineno,
+                col_offset=operation.col_offset,
             )
         )
 
@@ -6,6 +6,7 @@ from ..models import Issue, MigrationOp
 from .base import Rule
 
 if TYPE_CHECKING:
+    from ..plugins.base import Plugin
     from ..plugins.manager import PluginManager
 
 
@@ -91,6 +92,17 @@ class RuleEngine:
         """
         return list(self._rules)  # Return copy to protect from changes
 
+    def get_plugins(self) -> list["Plugin"]:
+        """
+        Returns list of loaded plugins.
+
+        Returns:
+            Plugins whose rules are registered, empty if no plugins were loaded
+        """
+        if self._plugin_manager is None:
+            return []
+        return self._plugin_manager.list_plugins()
+
     def add_rule(self, rule: Rule) -> None:
         """
         Adds rule to engine.
@@ -1,6 +1,7 @@
 """Migration sources module."""
 
 import ast
+from functools import lru_cache
 from pathlib import Path
 from typing import Union
 
@@ -57,10 +58,21 @@ def detect_migration_type(file_path: Union[str, Path]) -> str:
         Use `create_migration_source()` to check file existence.
     """
     path = Path(file_path)
-    if not path.exists():
-        # Default to Alembic
+    try:
+        stat = path.stat()
+    except OSError:
+        # Default to Alembic for non-existent files
         return "alembic"
 
+    # A file is analyzed several times per run (filtering by Django app, creating source),
+    # so detection is cached until the file changes
+    return _detect_migration_type_cached(str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _detect_migration_type_cached(path_str: str, inode: int, mtime_ns: int, size: int) -> str:
+    """Detects migration type of file content, see detect_migration_type()."""
+    path = Path(path_str)
     try:
         content = path.read_text(encoding="utf-8")
     except (OSError, UnicodeDecodeError):
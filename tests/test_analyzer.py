@@ -183,6 +183,7 @@ def upgrade():
     assert ops[0].type == "add_column"
     assert ops[1].type == "create_index"
     assert ops[2].type == "execute"
+    assert [op.lineno for op in ops] == [3, 4, 5]
 
 
 def test_variable_context():
@@ -0,0 +1,63 @@
+"""Tests for safe evaluation of AST values."""
+
+import ast
+
+from migsafe.ast_utils import extract_keyword_arg, safe_eval_bool, safe_eval_string
+
+
+def _expr(source: str) -> ast.AST:
+    """Parses a single expression."""
+    return ast.parse(source, mode="eval").body
+
+
+def test_safe_eval_string_constant():
+    """Check extraction of a string constant."""
+    assert safe_eval_string(_expr("'users'")) == "users"
+    assert safe_eval_string(_expr("42")) is None
+
+
+def test_safe_eval_string_concatenation():
+    """Check concatenation of constants, variables and lists."""
+    context = {"table": "users"}
+    assert safe_eval_string(_expr("'UPDATE ' + table + ' SET a = 1'"), context) == "UPDATE users SET a = 1"
+    assert safe_eval_string(_expr("'a' + ('b' + 'c')")) == "abc"
+    assert safe_eval_string(_expr("'x' + ['a', 'b']")) == "xa b"
+    assert safe_eval_string(_expr("'a' + unknown")) is None
+    assert safe_eval_string(_expr("'a' + 1")) is None
+
+
+def test_safe_eval_string_list():
+    """Check list of strings is joined with spaces."""
+    assert safe_eval_string(_expr("['a', 'b']")) == "a b"
+    assert safe_eval_string(_expr("[]")) is None
+    assert safe_eval_string(_expr("['a', 1]")) is None
+
+
+def test_safe_eval_string_long_concatenation():
+    """Check that long concatenation chains don't hit recursion limit."""
+    node: ast.expr = ast.Constant(value="a")
+    for _ in range(5000):
+        node = ast.BinOp(left=node, op=ast.Add(), right=ast.Constant(value="b"))
+
+    assert safe_eval_string(node) == "a" + "b" * 5000
+
+
+def test_safe_eval_bool():
+    """Check extraction of boolean constants and variables."""
+    assert safe_eval_bool(_expr("True")) is True
+    assert safe_eval_bool(_expr("flag"), {"flag": False}) is False
+    assert safe_eval_bool(_expr("1")) is None
+    assert safe_eval_bool(_expr("'true'")) is None
+
+
+def test_extract_keyword_arg():
+    """Check extraction of string and boolean keyword arguments."""
+    call = _expr("f(name='a' + 'b', nullable=False, unique=flag, schema=tbl, size=10)")
+    context = {"flag": True, "tbl": "public"}
+
+    assert extract_keyword_arg(call, "name") == "ab"
+    assert extract_keyword_arg(call, "nullable") is False
+    assert extract_keyword_arg(call, "unique", context) is True
+    assert extract_keyword_arg(call, "schema", context) == "public"
+    assert extract_keyword_arg(call, "size") is None
+    assert extract_keyword_arg(call, "missing") is None
@@ -104,6 +104,38 @@ def upgrade():
     assert success is False or fixed_code == source_code
 
 
+@pytest.mark.parametrize(
+    ("operation", "issue_type"),
+    [
+        ("create_index('ix_email', 'users', ['email']", IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY),
+        ("drop_index('ix_email'", IssueType.DROP_INDEX_WITHOUT_CONCURRENTLY),
+    ],
+)
+def test_concurrently_fix_after_compiling_fixed_tree(autofix_engine, operation, issue_type):
+    """Check that compiling a fixed tree doesn't break later fixes of other migrations."""
+    source_code = f"from alembic import op\n\ndef upgrade():\n    op.{operation}, postgresql_concurrently=False)\n"
+    issue = Issue(
+        severity=IssueSeverity.CRITICAL,
+        type=issue_type,
+        message="Index operation without CONCURRENTLY",
+        operation_index=0,
+        recommendation="Use CONCURRENTLY",
+        table="users",
+        index="ix_email",
+    )
+    fix = CreateIndexFix() if issue_type == IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY else DropIndexFix()
+    tree = ast.parse(source_code)
+    call = tree.body[1].body[0].value
+    assert fix._apply_concurrently_fix(call) is True
+    compile(ast.fix_missing_locations(tree), "<migration>", "exec")
+
+    fixed_code, fixed_issues, unfixed_issues = autofix_engine.apply_fixes(source_code, [issue])
+
+    assert len(fixed_issues) == 1
+    assert not unfixed_issues
+    assert "postgresql_concurrently=True" in fixed_code
+
+
 # ==================== Tests for DropIndexFix ====================
 
 
@@ -357,6 +389,98 @@ def upgrade():
     assert "postgresql_concurrently=True" in fixed_code or "postgresql_concurrently = True" in fixed_code
 
 
+def test_autofix_engine_generates_code_once(autofix_engine, monkeypatch):
+    """Check that fixes share one AST tree and code is generated once."""
+    from migsafe.autofix import autofix_engine as engine_module
+
+    calls = []
+    original_unparse = engine_module.unparse_with_source
+
+    def counting_unparse(tree, source_code):
+        calls.append(tree)
+        return original_unparse(tree, source_code)
+
+    monkeypatch.setattr(engine_module, "unparse_with_source", counting_unparse)
+
+    source_code = """
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_email', 'users', ['email'])
+    op.drop_index('ix_old', 'users')
+"""
+    issues = [
+        Issue(
+            severity=IssueSeverity.CRITICAL,
+            type=IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY,
+            message="Creating index without CONCURRENTLY",
+            operation_index=0,
+            recommendation="Use CONCURRENTLY",
+            table="users",
+        ),
+        Issue(
+            severity=IssueSeverity.WARNING,
+            type=IssueType.DROP_INDEX_WITHOUT_CONCURRENTLY,
+            message="Dropping index without CONCURRENTLY",
+            operation_index=0,
+            recommendation="Use CONCURRENTLY",
+            table="users",
+        ),
+    ]
+
+    fixed_code, fixed_issues, unfixed_issues = autofix_engine.apply_fixes(source_code, issues)
+
+    assert len(fixed_issues) == 2
+    assert unfixed_issues == []
+    assert fixed_code.count("postgresql_concurrently=True") == 2
+    assert len(calls) == 1
+
+
+def test_autofix_engine_supports_source_code_fixes():
+    """Check that fixes implementing only apply_fix() work together with AST fixes."""
+    from migsafe.autofix import Autofix
+
+    class RenameTableFix(Autofix):
+        def can_fix(self, issue):
+            return issue.type == IssueType.DROP_INDEX_WITHOUT_CONCURRENTLY
+
+        def apply_fix(self, source_code, issue, ast_tree=None):
+            return source_code.replace("'users'", "'accounts'"), True
+
+    engine = AutofixEngine(fixes=[CreateIndexFix(), RenameTableFix()])
+    source_code = """
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_email', 'users', ['email'])
+    op.drop_index('ix_old', 'users')
+"""
+    issues = [
+        Issue(
+            severity=IssueSeverity.CRITICAL,
+            type=IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY,
+            message="Creating index without CONCURRENTLY",
+            operation_index=0,
+            recommendation="Use CONCURRENTLY",
+            table="users",
+        ),
+        Issue(
+            severity=IssueSeverity.WARNING,
+            type=IssueType.DROP_INDEX_WITHOUT_CONCURRENTLY,
+            message="Dropping index without CONCURRENTLY",
+            operation_index=1,
+            recommendation="Use CONCURRENTLY",
+            table="users",
+        ),
+    ]
+
+    fixed_code, fixed_issues, unfixed_issues = engine.apply_fixes(source_code, issues)
+
+    assert len(fixed_issues) == 2
+    assert "postgresql_concurrently=True" in fixed_code
+    assert "'users'" not in fixed_code
+
+
 def test_autofix_engine_handles_syntax_error(autofix_engine):
     """Check handling syntax errors."""
     source_code = """
@@ -639,3 +763,265 @@ def downgrade():
     op.drop_index('ix_email', 'users')
 """)
     assert fix._has_upgrade_function(ast_without_upgrade) is False
+
+
+def test_upgrade_info_is_cached_per_tree():
+    """Check that upgrade() lookup is cached per tree and can be invalidated."""
+    from migsafe.autofix.ast_utils import get_upgrade_info, invalidate_upgrade_info
+
+    tree = ast.parse("""
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_email', 'users', ['email'])
+""")
+    upgrade_func, count = get_upgrade_info(tree)
+    assert upgrade_func is tree.body[1]
+    assert count == 1
+
+    upgrade_func.body.append(ast.parse("op.drop_index('ix_old', 'users')").body[0])
+    assert get_upgrade_info(tree)[1] == 1
+
+    invalidate_upgrade_info(tree)
+    assert get_upgrade_info(tree) == (upgrade_func, 2)
+
+    assert get_upgrade_info(ast.parse("x = 1")) == (None, 0)
+
+
+def test_create_index_fix_targets_operation_by_index():
+    """Check that the fix changes the operation with the given index only."""
+    fix = CreateIndexFix()
+    source_code = """
+from alembic import op
+
+def upgrade():
+    op.create_index('ix_email', 'users', ['email'])
+    if True:
+        op.create_index('ix_name', 'users', ['name'])
+"""
+    issue = Issue(
+        severity=IssueSeverity.CRITICAL,
+        type=IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY,
+        message="Creating index without CONCURRENTLY",
+        operation_index=0,
+        recommendation="Use CONCURRENTLY",
+        table="users",
+        index="ix_email",
+    )
+
+    fixed_code, success = fix.apply_fix(source_code, issue)
+    assert success is True
+    assert "op.create_index('ix_email', 'users', ['email'], postgresql_concurrently=True)" in fixed_code
+    assert "op.create_index('ix_name', 'users', ['name'])" in fixed_code
+
+    fixed_code, success = fix.apply_fix(fixed_code, issue.model_copy(update={"operation_index": 1}))
+    assert success is True
+    assert "op.create_index('ix_name', 'users', ['name'], postgresql_concurrently=True)" in fixed_code
+
+    # Several issues fixed on one tree: create_index calls are collected once
+    tree = ast.parse(source_code)
+    assert fix.fix_ast(tree, issue.model_copy(update={"operation_index": 1})) is True
+    assert fix.fix_ast(tree, issue) is True
+    assert fix.fix_ast(tree, issue.model_copy(update={"operation_index": 2})) is False
+    assert ast.unparse(tree).count("postgresql_concurrently=True") == 2
+
+
+def test_find_operation_in_batch_alter_table():
+    """Check finding operations inside batch_alter_table and the finder compatibility class."""
+    from migsafe.autofix import find_all_operations, find_operation
+    from migsafe.autofix.base_finder import get_operation_calls
+    from migsafe.autofix.create_index_fix import CreateIndexFinder
+
+    tree = ast.parse("""
+def upgrade():
+    op.create_index('ix_email', 'users', ['email'])
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.create_index('ix_name', ['name'])
+    other.create_index('ix_other', ['other'])
+""")
+    upgrade_func = tree.body[0]
+
+    def is_create_index(call, batch_context):
+        return call.func.attr == "create_index" and (call.func.value.id == "op" or call.func.value.id in batch_context)
+
+    call, stmt_index = find_operation(upgrade_func, 1, is_create_index)
+    assert call is upgrade_func.body[1].body[0].value
+    assert stmt_index == 1
+    assert find_operation(upgrade_func, 2, is_create_index) == (None, None)
+
+    finder = CreateIndexFinder(1)
+    finder.visit(upgrade_func)
+    assert finder.found_call is call
+    assert finder.found_stmt_index == 1
+
+    calls = find_all_operations(upgrade_func, is_create_index)
+    assert calls == [upgrade_func.body[0].value, call]
+
+    # Calls of all operations are collected once, added calls don't shift positions
+    assert get_operation_calls(upgrade_func, "create_index") == calls
+    upgrade_func.body.insert(0, ast.parse("op.create_index('ix_new', 'users', ['new'])").body[0])
+    assert get_operation_calls(upgrade_func, "create_index") == calls
+    assert get_operation_calls(upgrade_func, "drop_index") == []
+    del upgrade_func.body[0]
+
+    # Visiting the whole module stops at the function containing the operation
+    tree.body.append(ast.parse("def downgrade():\n    op.drop_index('ix_email')").body[0])
+    finder = CreateIndexFinder(1)
+    finder.visit(tree)
+    assert finder.found_call is call
+
+
+def test_add_column_not_null_fix_uses_issue_lineno():
+    """Check that the fix locates the operation by issue line when it is known."""
+    fix = AddColumnNotNullFix()
+    source_code = """
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table('accounts', sa.Column('id', sa.Integer()))
+    op.add_column('users', sa.Column('email', sa.String(), nullable=False))
+"""
+    # operation_index counts all operations, so it doesn't match the add_column index
+    issue = Issue(
+        severity=IssueSeverity.CRITICAL,
+        type=IssueType.ADD_COLUMN_NOT_NULL,
+        message="Adding NOT NULL column",
+        operation_index=1,
+        recommendation="Use safe pattern",
+        table="users",
+        column="email",
+        lineno=7,
+    )
+
+    fixed_code, success = fix.apply_fix(source_code, issue)
+    assert success is True
+    assert "nullable=True" in fixed_code
+    assert "op.alter_column('users', 'email', nullable=False)" in fixed_code
+
+    # Without line hint the index lookup doesn't find the second add_column
+    _, success = fix.apply_fix(source_code, issue.model_copy(update={"lineno": None}))
+    assert success is False
+
+
+def test_autofix_fixes_several_operations_on_one_line(autofix_engine, tmp_path):
+    """Check that issues of operations sharing a line are fixed in their own calls."""
+    from migsafe.analyzers.alembic_analyzer import AlembicMigrationAnalyzer
+    from migsafe.sources import create_migration_source
+
+    source_code = (
+        "from alembic import op\n\n"
+        "def upgrade():\n"
+        "    op.add_column('users', sa.Column('name', sa.String()))\n"
+        "    op.create_index('ix_a', 'users', ['a']); op.create_index('ix_b', 'users', ['b'])\n"
+    )
+    migration_path = tmp_path / "001_indexes.py"
+    migration_path.write_text(source_code)
+    issues = AlembicMigrationAnalyzer().analyze(create_migration_source(migration_path)).issues
+    index_issues = [issue for issue in issues if issue.type == IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY]
+    assert [issue.lineno for issue in index_issues] == [5, 5]
+
+    fixed_code, fixed_issues, unfixed_issues = autofix_engine.apply_fixes(source_code, index_issues)
+
+    assert len(fixed_issues) == 2
+    assert not unfixed_issues
+    assert fixed_code.count("postgresql_concurrently=True") == 2
+
+    # Without columns the line is ambiguous and the fix falls back to operation index,
+    # which matches index among create_index calls when there are no other operations
+    source_code = source_code.replace("    op.add_column('users', sa.Column('name', sa.String()))\n", "")
+    without_columns = [
+        issue.model_copy(update={"col_offset": None, "operation_index": i, "lineno": 4}) for i, issue in enumerate(index_issues)
+    ]
+    fixed_code, fixed_issues, unfixed_issues = autofix_engine.apply_fixes(source_code, without_columns)
+    assert len(fixed_issues) == 2
+    assert not unfixed_issues
+    assert fixed_code.count("postgresql_concurrently=True") == 2
+
+
+def test_autofix_keeps_unchanged_source():
+    """Check that only changed statements are regenerated and comments are kept."""
+    fix = AddColumnNotNullFix()
+    source_code = '''"""Add email."""
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    # Add column
+    op.add_column("users", sa.Column("email", sa.String(), nullable=False))  # new column
+    op.create_table("logs", sa.Column("id", sa.Integer()))
+
+
+def downgrade():
+    op.drop_column("users", "email")  # rollback
+'''
+    issue = Issue(
+        severity=IssueSeverity.CRITICAL,
+        type=IssueType.ADD_COLUMN_NOT_NULL,
+        message="Adding NOT NULL column",
+        operation_index=0,
+        recommendation="Use safe pattern",
+        table="users",
+        column="email",
+    )
+
+    fixed_code, success = fix.apply_fix(source_code, issue)
+
+    assert success is True
+    lines = fixed_code.splitlines()
+    assert lines[6] == "    # Add column"
+    assert lines[7] == "    op.add_column('users', sa.Column('email', sa.String(), nullable=True))  # new column"
+    assert lines[8].startswith("    op.execute(")
+    assert lines[9] == "    op.alter_column('users', 'email', nullable=False)"
+    assert lines[10] == '    op.create_table("logs", sa.Column("id", sa.Integer()))'
+    assert fixed_code.endswith('    op.drop_column("users", "email")  # rollback\n')
+
+
+def test_autofix_falls_back_to_full_unparse():
+    """Check that changes that can't be spliced into the source are generated with ast.unparse."""
+    fix = AddColumnNotNullFix()
+    source_code = """
+from alembic import op
+
+def upgrade():
+    op.add_column('users', sa.Column('email', sa.String(), nullable=False)); op.create_table('logs')
+"""
+    issue = Issue(
+        severity=IssueSeverity.CRITICAL,
+        type=IssueType.ADD_COLUMN_NOT_NULL,
+        message="Adding NOT NULL column",
+        operation_index=0,
+        recommendation="Use safe pattern",
+        table="users",
+        column="email",
+    )
+
+    fixed_code, success = fix.apply_fix(source_code, issue)
+
+    assert success is True
+    lines = [line.strip() for line in fixed_code.splitlines()]
+    add_column_index = lines.index("op.add_column('users', sa.Column('email', sa.String(), nullable=True))")
+    assert lines[add_column_index + 1].startswith("op.execute(")
+    assert lines[add_column_index + 2] == "op.alter_column('users', 'email', nullable=False)"
+    assert lines[add_column_index + 3] == "op.create_table('logs')"
+
+
+def test_autofix_skips_source_without_marker(monkeypatch):
+    """Check that apply_fix doesn't parse source code without the operation name."""
+    import migsafe.autofix.base as base_module
+
+    def failing_parse(source_code):
+        raise AssertionError("source code should not be parsed")
+
+    monkeypatch.setattr(base_module.ast, "parse", failing_parse)
+    issue = Issue(
+        severity=IssueSeverity.CRITICAL,
+        type=IssueType.CREATE_INDEX_WITHOUT_CONCURRENTLY,
+        message="Creating index without CONCURRENTLY",
+        operation_index=0,
+        recommendation="Use CONCURRENTLY",
+    )
+
+    source_code = "def upgrade():\n    op.drop_column('users', 'email')\n"
+    assert CreateIndexFix().apply_fix(source_code, issue) == (source_code, False)
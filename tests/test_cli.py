@@ -1,13 +1,24 @@
 """Tests for CLI interface."""
 
 import os
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
 import pytest
 from click.testing import CliRunner
 
-from migsafe.cli import analyze_files, cli, find_migration_files, get_formatter, has_critical_issues
+from migsafe.cli import (
+    analyze_files,
+    cli,
+    create_backup,
+    find_migration_files,
+    get_formatter,
+    has_critical_issues,
+    should_exclude_file,
+    write_output_file,
+)
 from migsafe.models import IssueSeverity
 
 
@@ -31,6 +42,42 @@ def test_cli_version():
     assert "0.4.0" in result.output
 
 
+def test_module_entry_point_version_skips_cli_import():
+    """Test that `python -m migsafe --version` matches the CLI output without importing the CLI or pydantic."""
+    code = (
+        "import runpy, sys; sys.argv = ['migsafe', '--version']; "
+        "runpy.run_module('migsafe', run_name='__main__'); print([m for m in ('migsafe.cli', 'pydantic') if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    version_output = CliRunner().invoke(cli, ["--version"]).output
+    assert result.stdout == version_output + "[]\n"
+
+
+def test_package_exports_are_importable():
+    """Test that lazily exported names of the package resolve to their modules."""
+    import migsafe
+    from migsafe.analyzer import analyze_migration
+    from migsafe.models import IssueType
+
+    assert migsafe.analyze_migration is analyze_migration
+    assert migsafe.IssueType is IssueType
+    with pytest.raises(AttributeError):
+        migsafe.missing_name  # noqa: B018
+
+
+def test_cli_import_is_lazy():
+    """Test that importing CLI doesn't load modules used only by some commands."""
+    code = (
+        "import sys, migsafe.cli; "
+        "print([m for m in ('migsafe.analyzers', 'migsafe.autofix', 'migsafe.formatters', 'migsafe.history', 'migsafe.stats', "
+        "'migsafe.executors', 'migsafe.plugins', 'concurrent.futures.process') if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
 def test_analyze_command_help():
     """Test analyze command help."""
     runner = CliRunner()
@@ -475,6 +522,48 @@ def test_find_migration_files():
         assert len(files) == 0
 
 
+def test_find_migration_files_removes_duplicates():
+    """Test that files found through several paths are returned once, sorted."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "a-b").mkdir()
+        (root / "a").mkdir()
+        files = [root / "a-b" / "001.py", root / "a" / "002.py", root / "a" / "001.py"]
+        for file_path in files:
+            file_path.write_text("# migration")
+
+        found = find_migration_files([root / "a", root, files[0]])
+
+        assert found == sorted(files)
+
+
+def test_find_migration_files_skips_tool_directories():
+    """Test that virtual environments and tool directories are not searched unless passed explicitly."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        migration = root / "migrations" / "001_initial.py"
+        skipped = [root / ".venv" / "lib" / "module.py", root / "node_modules" / "pkg" / "setup.py", root / ".git" / "hook.py"]
+        for file_path in [migration, *skipped]:
+            file_path.parent.mkdir(parents=True)
+            file_path.write_text("# migration")
+
+        assert find_migration_files([root]) == [migration]
+        assert find_migration_files([root / ".venv"]) == [skipped[0]]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Symlinks require privileges on Windows")
+def test_find_migration_files_skips_symlinked_directories():
+    """Test that symlinked directories are not followed, so symlink loops are safe."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        subdir = Path(tmpdir) / "subdir"
+        subdir.mkdir()
+        (subdir / "migration.py").write_text("# migration")
+        (subdir / "loop").symlink_to(tmpdir, target_is_directory=True)
+
+        files = find_migration_files([Path(tmpdir)])
+        assert files == [subdir / "migration.py"]
+
+
 def test_analyze_files_function():
     """Test analyze_files function."""
     migration_content = """
@@ -499,6 +588,198 @@ def upgrade():
         os.unlink(temp_path)
 
 
+def test_analyze_files_in_worker_processes(monkeypatch):
+    """Test that parallel analysis keeps file order and counts errors."""
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = []
+        for i in range(16):
+            file_path = Path(tmpdir) / f"{i:03d}_migration.py"
+            file_path.write_text('def upgrade():\n    op.add_column("users", sa.Column("email", sa.String(), nullable=False))\n')
+            files.append(file_path)
+        files.append(Path(tmpdir) / "missing.py")
+
+        results, error_count = analyze_files(files)
+
+        assert [file_path for file_path, _ in results] == files[:-1]
+        assert all(len(result.issues) > 0 for _, result in results)
+        assert error_count == 1
+
+
+def test_analyze_files_uses_cache(monkeypatch):
+    """Test that unchanged files are taken from the analysis cache."""
+    import migsafe.cli as cli_module
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = Path(tmpdir) / ".migsafe-cache"
+        unchanged = Path(tmpdir) / "001_migration.py"
+        unchanged.write_text('def upgrade():\n    op.add_column("users", sa.Column("email", sa.String(), nullable=False))\n')
+        changed = Path(tmpdir) / "002_migration.py"
+        changed.write_text("def upgrade():\n    pass\n")
+
+        first_results, _ = analyze_files([unchanged, changed], cache_dir=cache_dir)
+        changed.write_text('def upgrade():\n    op.drop_index("ix_users_email")\n')
+
+        analyzed = []
+        analyze_file = cli_module._analyze_file
+
+        def record_analysis(file_path, analyzers):
+            analyzed.append(file_path)
+            return analyze_file(file_path, analyzers)
+
+        monkeypatch.setattr(cli_module, "_analyze_file", record_analysis)
+        results, error_count = analyze_files([unchanged, changed], cache_dir=cache_dir)
+
+        assert analyzed == [changed]
+        assert error_count == 0
+        assert [file_path for file_path, _ in results] == [unchanged, changed]
+        assert results[0][1] == first_results[0][1]
+        assert results[1][1] != first_results[1][1]
+
+
+def test_analyze_files_cache_invalidated_by_plugin_edit(monkeypatch):
+    """Test that editing a plugin between runs invalidates cached results."""
+    plugin_source = """
+from migsafe.models import Issue, IssueSeverity, IssueType
+from migsafe.plugins import Plugin
+from migsafe.rules.base import Rule
+
+
+class MessageRule(Rule):
+    name = "message_rule"
+
+    def check(self, operation, index, operations):
+        return [
+            Issue(
+                severity=IssueSeverity.WARNING,
+                type=IssueType.ADD_COLUMN_NOT_NULL,
+                message="{message}",
+                operation_index=index,
+                recommendation="",
+                table=operation.table,
+            )
+        ]
+
+
+class MessagePlugin(Plugin):
+    @property
+    def name(self):
+        return "message-plugin"
+
+    @property
+    def version(self):
+        return "1.0.0"
+
+    def get_rules(self):
+        return [MessageRule()]
+"""
+
+    def messages(results):
+        return {issue.message for _, result in results for issue in result.issues}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = Path(tmpdir) / ".migsafe-cache"
+        plugin_dir = Path(tmpdir) / "plugins"
+        plugin_dir.mkdir()
+        plugin_file = plugin_dir / "message_plugin.py"
+        plugin_file.write_text(plugin_source.format(message="first message"))
+        migration = Path(tmpdir) / "001_migration.py"
+        migration.write_text('def upgrade():\n    op.drop_index("ix_users_email")\n')
+        # Plugin directory is given relative to the working directory
+        monkeypatch.chdir(tmpdir)
+        plugins_config = {"directories": ["plugins"]}
+
+        first_results, _ = analyze_files([migration], plugins_config=plugins_config, cache_dir=cache_dir)
+        assert "first message" in messages(first_results)
+
+        plugin_file.write_text(plugin_source.format(message="second message"))
+        stat_result = plugin_file.stat()
+        os.utime(plugin_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+        # Each CLI run is a new process, forget the plugin module imported by the first run
+        for module_name in [name for name in sys.modules if name.startswith("migsafe_plugin_message_plugin_")]:
+            monkeypatch.delitem(sys.modules, module_name)
+
+        results, error_count = analyze_files([migration], plugins_config=plugins_config, cache_dir=cache_dir)
+
+        assert error_count == 0
+        assert "second message" in messages(results)
+        assert "first message" not in messages(results)
+
+
+def test_analyze_validates_option_paths():
+    """Test that missing paths and paths of a wrong type in options are reported."""
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config_file = Path(tmpdir) / "migsafe.json"
+        config_file.write_text("{}")
+
+        result = runner.invoke(cli, ["analyze", tmpdir, "--config", str(Path(tmpdir) / "missing.json")])
+        assert result.exit_code == 1
+        assert "Configuration file not found" in result.output
+
+        result = runner.invoke(cli, ["analyze", tmpdir, "--config", tmpdir])
+        assert result.exit_code == 1
+        assert f"Path is not a file: {tmpdir}" in result.output
+
+        result = runner.invoke(cli, ["analyze", tmpdir, "--config", str(config_file), "--plugins-dir", str(config_file)])
+        assert result.exit_code == 1
+        assert f"Path is not a directory: {config_file}" in result.output
+
+
+def test_analyze_adds_plugins_dir_to_config_plugins(monkeypatch):
+    """Test that --plugins-dir is added to plugin directories from the configuration file."""
+    import migsafe.cli as cli_module
+
+    captured = []
+    iter_analysis = cli_module.iter_analysis
+
+    def record_iter_analysis(files, exclude_patterns=None, verbose=False, plugins_config=None, cache_dir=None):
+        captured.append(plugins_config)
+        return iter_analysis(files, exclude_patterns, verbose, None, cache_dir)
+
+    monkeypatch.setattr(cli_module, "iter_analysis", record_iter_analysis)
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "001_migration.py").write_text("def upgrade():\n    pass\n")
+        plugins_dir = Path(tmpdir) / "plugins"
+        plugins_dir.mkdir()
+        config_file = Path(tmpdir) / "migsafe.json"
+        config_file.write_text('{"plugins": {"directories": ["config_plugins"], "enabled": ["demo"]}}')
+
+        migration_file = str(Path(tmpdir) / "001_migration.py")
+        result = runner.invoke(cli, ["analyze", migration_file, "--config", str(config_file), "--plugins-dir", str(plugins_dir)])
+
+        assert result.exit_code == 0, result.output
+        assert captured == [{"directories": ["config_plugins", str(plugins_dir)], "enabled": ["demo"]}]
+
+
+def test_write_output_file_creates_directory():
+    """Test that output file is written into a missing directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = Path(tmpdir) / "reports" / "nested" / "report.txt"
+
+        write_output_file(output_path, ["first\n", "second\n"])
+        assert output_path.read_text(encoding="utf-8") == "first\nsecond\n"
+
+        write_output_file(output_path, ["third\n"])
+        assert output_path.read_text(encoding="utf-8") == "third\n"
+
+
+def test_create_backup_copies_bytes():
+    """Test that backup keeps encoding and line endings of the file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = Path(tmpdir) / "001_migration.py"
+        content = "# caf\xe9\r\ndef upgrade():\r\n    pass\r\n".encode("latin-1")
+        file_path.write_bytes(content)
+
+        backup_path = create_backup(file_path)
+
+        assert backup_path is not None
+        assert backup_path != file_path
+        assert backup_path.read_bytes() == content
+        assert create_backup(Path(tmpdir) / "missing.py") is None
+
+
 def test_get_formatter():
     """Test get_formatter function."""
     from migsafe.formatters import HtmlFormatter, JsonFormatter, JUnitFormatter, TextFormatter
@@ -590,6 +871,17 @@ def upgrade():
         assert "002_excluded" not in result.output
 
 
+def test_should_exclude_file():
+    """Test substring and wildcard exclude patterns."""
+    patterns = ["legacy", "*/tmp/*.py", "*_old.py"]
+
+    assert should_exclude_file(Path("migrations/legacy/001.py"), patterns) is True
+    assert should_exclude_file(Path("/project/tmp/001.py"), patterns) is True
+    assert should_exclude_file(Path("migrations/001_old.py"), patterns) is True
+    assert should_exclude_file(Path("migrations/001_new.py"), patterns) is False
+    assert should_exclude_file(Path("migrations/001.py"), []) is False
+
+
 def test_analyze_with_config():
     """Test analysis with config file."""
     migration_content = """
@@ -622,3 +914,126 @@ def upgrade():
     finally:
         os.unlink(temp_path)
         os.unlink(config_path)
+
+
+def test_load_config_reuses_parsed_file_until_it_changes(tmp_path, monkeypatch):
+    """Test that an unchanged config file is parsed once and a changed one is reloaded."""
+    import json
+
+    from migsafe import config as config_module
+
+    config_path = tmp_path / "migsafe.json"
+    config_path.write_text(json.dumps({"format": "json", "plugins": {"directories": ["a"]}}))
+    parse_count = 0
+    original_load = config_module._load_json_config
+
+    def counting_load(path):
+        nonlocal parse_count
+        parse_count += 1
+        return original_load(path)
+
+    monkeypatch.setattr(config_module, "_load_json_config", counting_load)
+    config_module._load_cached_config.cache_clear()
+
+    first = config_module.load_config(config_path)
+    first.plugins["directories"].append("b")
+    second = config_module.load_config(config_path)
+
+    assert parse_count == 1
+    assert second.plugins == {"directories": ["a"]}
+
+    config_path.write_text(json.dumps({"format": "text"}))
+    os.utime(config_path, ns=(0, 0))
+
+    assert config_module.load_config(config_path).format == "text"
+    assert parse_count == 2
+
+
+def test_load_config_accepts_json_rejected_by_orjson(tmp_path):
+    """Test that JSON accepted by the json module but not by orjson still loads."""
+    import math
+
+    from migsafe.config import load_config
+
+    config_path = tmp_path / "migsafe.json"
+    config_path.write_text('{"format": "json", "plugins": {"threshold": NaN}}')
+
+    config = load_config(config_path)
+
+    assert config.format == "json"
+    assert math.isnan(config.plugins["threshold"])
+
+
+@pytest.mark.skipif(sys.version_info < (3, 11), reason="tomllib is available on Python 3.11+")
+def test_load_toml_config_section(tmp_path):
+    """Test loading the [migsafe] section of a TOML configuration file."""
+    from migsafe.config import load_config
+
+    config_path = tmp_path / "pyproject.toml"
+    config_path.write_text('[migsafe]\nformat = "json"\nexclude = ["tests/*"]\n')
+
+    config = load_config(config_path)
+
+    assert config.format == "json"
+    assert config.exclude == ["tests/*"]
+
+
+def test_autofix_apply_to_all_remaining_files():
+    """Test that answering "all" applies fixes to remaining files without asking again."""
+    migration_content = """
+def upgrade():
+    op.create_index("ix_users_email", "users", ["email"])
+"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = [Path(tmpdir) / f"00{i}_migration.py" for i in range(1, 4)]
+        for file_path in files:
+            file_path.write_text(migration_content)
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["analyze", tmpdir, "--autofix", "--apply", "--no-backup"], input="n\na\n")
+
+        assert result.exit_code == 0
+        assert result.output.count("Apply fixes to") == 2
+        assert "postgresql_concurrently" not in files[0].read_text()
+        assert all("postgresql_concurrently=True" in file_path.read_text() for file_path in files[1:])
+
+
+def test_autofix_apply_to_all_still_confirms_missing_backup(monkeypatch):
+    """Test that answering "all" doesn't skip confirmation to continue without backup."""
+    migration_content = """
+def upgrade():
+    op.create_index("ix_users_email", "users", ["email"])
+"""
+    monkeypatch.setattr("migsafe.cli.create_backup", lambda file_path: None)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        files = [Path(tmpdir) / f"00{i}_migration.py" for i in range(1, 3)]
+        for file_path in files:
+            file_path.write_text(migration_content)
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["analyze", tmpdir, "--autofix", "--apply"], input="a\ny\nn\n")
+
+        assert result.exit_code == 0
+        assert result.output.count("Apply fixes to") == 1
+        assert result.output.count("Continue without backup?") == 2
+        assert "postgresql_concurrently=True" in files[0].read_text()
+        assert "postgresql_concurrently" not in files[1].read_text()
+
+
+def test_ensure_utf8_stdio_on_windows(monkeypatch):
+    """Test that stdout and stderr are switched to UTF-8 on Windows only when a command runs."""
+    import io
+
+    from migsafe.cli import _ensure_utf8_stdio
+
+    stdout = io.TextIOWrapper(io.BytesIO(), encoding="cp1252")
+    stderr = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(sys, "stderr", stderr)
+    monkeypatch.setattr(sys, "platform", "win32")
+
+    _ensure_utf8_stdio()
+
+    assert sys.stdout is stdout
+    assert stdout.encoding == "utf-8"
+    assert stderr.encoding == "utf-8"
@@ -73,3 +73,30 @@ def test_cli_supports_mixed_migrations():
 
         assert detect_migration_type(alembic_migration) == "alembic"
         assert detect_migration_type(django_migration) == "django"
+
+
+def test_filter_django_migrations_by_apps():
+    """Filtering by several Django applications keeps Alembic migrations."""
+    from migsafe.cli import filter_django_migrations_by_apps
+
+    django_code = "from django.db import migrations\n\nclass Migration(migrations.Migration):\n    operations = []\n"
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+
+        alembic_dir = temp_path / "alembic" / "versions"
+        alembic_dir.mkdir(parents=True)
+        alembic_migration = alembic_dir / "001_add_user.py"
+        alembic_migration.write_text("from alembic import op\n\ndef upgrade():\n    pass\n", encoding="utf-8")
+
+        django_migrations = []
+        for app_name in ("users", "orders", "billing"):
+            app_dir = temp_path / app_name / "migrations"
+            app_dir.mkdir(parents=True)
+            migration = app_dir / "0001_initial.py"
+            migration.write_text(django_code, encoding="utf-8")
+            django_migrations.append(migration)
+
+        files = [alembic_migration, *django_migrations]
+        filtered = filter_django_migrations_by_apps(files, {"users", "billing"})
+
+        assert filtered == [alembic_migration, django_migrations[0], django_migrations[2]]
@@ -149,6 +149,21 @@ def upgrade():
         os.unlink(temp_path)
 
 
+def test_detect_migration_type_after_file_change():
+    """Check that cached migration type is detected again when the file changes."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+        f.write("from alembic import op\n\ndef upgrade():\n    pass\n")
+        temp_path = f.name
+
+    try:
+        assert detect_migration_type(temp_path) == "alembic"
+        django_content = "from django.db import migrations\n\nclass Migration(migrations.Migration):\n    operations = []\n"
+        Path(temp_path).write_text(django_content)
+        assert detect_migration_type(temp_path) == "django"
+    finally:
+        os.unlink(temp_path)
+
+
 def test_create_migration_source_django():
     """Check creating Django source."""
     content = """
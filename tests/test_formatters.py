@@ -656,6 +656,36 @@ class TestFormattersCommon:
             assert isinstance(output, str)
             assert len(output) >= 0  # May be empty for some formats
 
+    def test_all_formatters_stream_same_output(self):
+        """Test that format_stream() produces the same output as format()."""
+        formatters = [
+            TextFormatter(),
+            JsonFormatter(),
+            HtmlFormatter(),
+            JUnitFormatter(),
+            SarifFormatter(),
+        ]
+
+        for count in range(3):
+            results = [(Path(f"{i}_migration.py"), create_test_result(issues=[create_test_issue()])) for i in range(count)]
+            for formatter in formatters:
+                assert "".join(formatter.format_stream(iter(results))) == formatter.format(results)
+
+    def test_json_output_without_orjson(self, monkeypatch):
+        """Test that JSON and SARIF output doesn't depend on orjson availability."""
+        pytest.importorskip("orjson")
+        from migsafe.formatters import json_utils
+
+        issue = create_test_issue()
+        issue.message = 'Сообщение "quoted" </tag>'
+        results = [(Path("миграция.py"), create_test_result(issues=[issue]))]
+
+        for formatter in (JsonFormatter(), SarifFormatter()):
+            with_orjson = formatter.format(results)
+            monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", False)
+            assert formatter.format(results) == with_orjson
+            monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", True)
+
     def test_all_formatters_handle_no_issues(self):
         """Test handling migrations without issues by all formatters."""
         formatters = [
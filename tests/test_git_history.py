@@ -509,6 +509,54 @@ def test_full_history_analysis_flow(temp_repo):
     assert isinstance(recommendations, list)
 
 
+@pytest.mark.skipif(not GIT_AVAILABLE, reason="GitPython is not installed")
+def test_track_changes_batch_matches_track_changes(temp_repo):
+    """Test that batched history is the same as history tracked file by file, including renames."""
+    repo = Repo(str(temp_repo))
+    versions = temp_repo / "alembic" / "versions"
+    (versions / "002_orders.py").write_text('def upgrade():\n    op.create_table("orders")\n')
+    (temp_repo / "README.md").write_text("readme")
+    repo.index.add([str(versions / "002_orders.py"), str(temp_repo / "README.md")])
+    repo.index.commit("Add orders migration")
+    repo.git.mv("alembic/versions/001_test.py", "alembic/versions/001_renamed.py")
+    repo.index.commit("Rename test migration")
+    (versions / "002_orders.py").write_text('def upgrade():\n    op.create_table("orders")\n    op.drop_table("old")\n')
+    repo.index.add([str(versions / "002_orders.py")])
+    repo.index.commit("Revert orders migration changes")
+    repo.close()
+
+    analyzer = GitHistoryAnalyzer(str(temp_repo))
+    migration_files = analyzer.find_migration_files()
+    assert migration_files == ["alembic/versions/001_renamed.py", "alembic/versions/002_orders.py"]
+
+    batch_records = MigrationHistory(analyzer).track_changes_batch(migration_files)
+    single_records = [MigrationHistory(analyzer).track_changes(migration_file) for migration_file in migration_files]
+
+    assert [record.change_count for record in batch_records] == [2, 2]
+    for batch_record, single_record in zip(batch_records, single_records):
+        assert batch_record.model_dump() == single_record.model_dump()
+
+    limited = MigrationHistory(analyzer).track_changes_batch(migration_files, max_commits=1)
+    assert [record.change_count for record in limited] == [1, 1]
+
+
+@pytest.mark.skipif(not GIT_AVAILABLE, reason="GitPython is not installed")
+def test_track_changes_batch_accepts_dot_and_absolute_paths(temp_repo):
+    """Test that ./ prefixed and absolute paths get the same history as repository-relative ones."""
+    analyzer = GitHistoryAnalyzer(str(temp_repo))
+    repo_path = "alembic/versions/001_test.py"
+    dot_path = "./alembic/versions/001_test.py"
+    absolute_path = str(temp_repo / "alembic" / "versions" / "001_test.py")
+
+    expected = MigrationHistory(analyzer).track_changes(repo_path)
+    records = MigrationHistory(analyzer).track_changes_batch([dot_path, absolute_path])
+
+    assert expected.change_count > 0
+    assert [record.file_path for record in records] == [dot_path, absolute_path]
+    assert [record.change_count for record in records] == [expected.change_count] * 2
+    assert [change.commit.hash for change in records[1].changes] == [change.commit.hash for change in expected.changes]
+
+
 @pytest.mark.skipif(not GIT_AVAILABLE, reason="GitPython is not installed")
 def test_history_analysis_filters_by_date(temp_repo):
     """Test filtering by date."""
@@ -165,3 +165,21 @@ def test_analyzer_detects_multiple_joins(analyzer):
     assert len(issues) >= 1
     issue_types = {issue.type for issue in issues}
     assert IssueType.SQL_UPDATE_WITH_JOIN in issue_types
+
+
+def test_analyzer_does_not_match_across_statements(analyzer):
+    """Test that a match does not span several statements separated by ';'."""
+    sql = "UPDATE users u SET status = 'active'; SELECT * FROM orders o"
+    issues = analyzer.analyze(sql, operation_index=0)
+
+    assert len(issues) == 0
+
+
+def test_analyzers_share_read_only_patterns():
+    """Test that analyzer instances share read-only pattern mapping."""
+    first = SqlJoinAnalyzer()
+    second = SqlJoinAnalyzer()
+
+    assert first._patterns is second._patterns
+    with pytest.raises(TypeError):
+        first._patterns["update_from"] = None
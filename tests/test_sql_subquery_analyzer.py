@@ -182,3 +182,59 @@ def test_analyzer_detects_case_insensitive(analyzer):
     issues = analyzer.analyze(sql, operation_index=0)
 
     assert len(issues) >= 1
+
+
+def test_analyzer_ignores_reference_with_same_suffix(analyzer):
+    """Test that reference to another table ending with outer table name is not correlated."""
+    sql = "UPDATE users SET total = (SELECT COUNT(*) FROM old_users WHERE old_users.active = true)"
+    issues = analyzer.analyze(sql, operation_index=0)
+
+    issue_types = {issue.type for issue in issues}
+    assert IssueType.SQL_CORRELATED_SUBQUERY not in issue_types
+
+
+def test_analyzer_detects_correlated_subquery_by_table_name_case_insensitive(analyzer):
+    """Test detection of correlated subquery referencing outer table name in other case."""
+    sql = "UPDATE users SET total = (SELECT COUNT(*) FROM orders WHERE orders.user_id = USERS.id)"
+    issues = analyzer.analyze(sql, operation_index=0)
+
+    issue_types = {issue.type for issue in issues}
+    assert IssueType.SQL_CORRELATED_SUBQUERY in issue_types
+
+
+def test_analyzer_detects_correlated_subquery_in_second_assignment(analyzer):
+    """Test detection of correlated subquery that is not the first subquery in SET (requires sqlparse)."""
+    pytest.importorskip("sqlparse")
+    sql = (
+        "UPDATE users u SET flag = (SELECT 1 FROM settings s WHERE s.id = 1), "
+        "last_order_date = (SELECT MAX(created_at) FROM orders o WHERE o.user_id = u.id)"
+    )
+    issues = analyzer.analyze(sql, operation_index=0)
+
+    correlated = [issue for issue in issues if issue.type == IssueType.SQL_CORRELATED_SUBQUERY]
+    assert len(correlated) == 1
+    assert correlated[0].table == "users"
+
+
+def test_analyzer_handles_very_long_query(analyzer):
+    """Test that very long query (beyond sqlparse token limit) is still analyzed."""
+    sql = (
+        "UPDATE users u SET last_order_date = (SELECT MAX(created_at) FROM orders o WHERE o.user_id = u.id) WHERE "
+        + " AND ".join(f"c{i} = {i}" for i in range(3000))
+    )
+    issues = analyzer.analyze(sql, operation_index=0)
+
+    issue_types = {issue.type for issue in issues}
+    assert IssueType.SQL_CORRELATED_SUBQUERY in issue_types
+
+
+def test_analyzer_detects_subquery_in_update_where_after_set_subquery(analyzer):
+    """Test detection of subquery in UPDATE WHERE when SET also contains subquery with WHERE."""
+    sql = (
+        "UPDATE products SET price = (SELECT base FROM prices WHERE prices.id = 1) "
+        "WHERE category_id IN (SELECT id FROM categories WHERE name = 'electronics')"
+    )
+    issues = analyzer.analyze(sql, operation_index=0)
+
+    issue_types = {issue.type for issue in issues}
+    assert IssueType.SQL_SUBQUERY_IN_UPDATE in issue_types or IssueType.SQL_SUBQUERY_WITHOUT_LIMIT in issue_types
@@ -5,6 +5,8 @@ import json
 from io import StringIO
 from pathlib import Path
 
+import pytest
+
 from migsafe.base import AnalyzerResult
 from migsafe.formatters.stats_csv_formatter import StatsCsvFormatter
 from migsafe.formatters.stats_json_formatter import StatsJsonFormatter
@@ -154,3 +156,44 @@ def test_stats_csv_formatter_multiple_migrations():
     assert rows[1][0] == "migration_0.py"
     assert rows[2][0] == "migration_1.py"
     assert rows[3][0] == "migration_2.py"
+
+
+def test_stats_formatters_stream_large_report(monkeypatch):
+    """Test that large reports are streamed in several chunks with the same output."""
+    from migsafe.formatters import json_utils
+
+    monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", False)
+    stats = MigrationStats()
+    for i in range(2000):
+        operations = [MigrationOp(type="add_column", table="users", column=f"col{i}", nullable=False)]
+        stats.add_migration(Path(f"migrations/{i:04d}_add_col{i}.py"), AnalyzerResult(operations=operations, issues=[]))
+
+    csv_chunks = list(StatsCsvFormatter().format_stream(stats, []))
+    assert len(csv_chunks) > 1
+    assert "".join(csv_chunks) == StatsCsvFormatter().format(stats, [])
+
+    json_chunks = list(StatsJsonFormatter().format_stream(stats, []))
+    assert len(json_chunks) > 1
+    output = "".join(json_chunks)
+    data = json.loads(output)
+    assert len(data["migrations"]) == 2000
+    assert output == json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def test_stats_json_output_without_orjson(monkeypatch):
+    """Test that statistics JSON doesn't depend on orjson availability."""
+    pytest.importorskip("orjson")
+    from migsafe.formatters import json_utils
+
+    stats = create_test_stats()
+    stats.add_migration(Path("миграция.py"), AnalyzerResult(operations=[], issues=[]))
+    recommendations = RecommendationsGenerator().generate(stats)
+    formatter = StatsJsonFormatter()
+
+    with_orjson = json.loads(formatter.format(stats, recommendations))
+    monkeypatch.setattr(json_utils, "ORJSON_AVAILABLE", False)
+    without_orjson = json.loads(formatter.format(stats, recommendations))
+
+    with_orjson.pop("generated_at")
+    without_orjson.pop("generated_at")
+    assert with_orjson == without_orjson